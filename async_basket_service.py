@@ -0,0 +1,314 @@
+import asyncio
+import contextlib
+import random
+from typing import AsyncIterator, Callable, Hashable, Iterable, NamedTuple
+
+from product_basket import Basket, Product
+
+
+class ProductRecord(NamedTuple):
+    """Запись о товаре из бэкенда цен и остатков."""
+
+    name: str  # Название товара
+    price: int  # Цена товара
+    weight: int  # Вес товара
+    stock: int  # Остаток на складе
+
+
+class FakeBackend:
+    """
+    Локальная замена бэкенда цен и остатков с настраиваемой задержкой.
+
+    Каждый запрос ``fetch`` возвращает записи сразу для пачки товаров и
+    занимает ``latency`` (плюс случайная добавка до ``jitter``) секунд.
+    Считает запросы и максимальное число одновременных запросов.
+    """
+
+    def __init__(
+        self,
+        records: dict[int, ProductRecord],
+        latency: float = 0.002,
+        jitter: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Инициализация бэкенда.
+
+        :param records: Записи о товарах по идентификатору товара
+        :param latency: Базовая задержка одного запроса, с
+        :param jitter: Максимальная случайная добавка к задержке, с
+        :param seed: Начальное значение генератора случайной добавки
+        """
+        self._records = records
+        self._latency = latency
+        self._jitter = jitter
+        self._rng = random.Random(seed)
+        self.requests = 0  # Количество выполненных запросов
+        self.active = 0  # Количество запросов, выполняемых сейчас
+        self.max_active = 0  # Максимальное количество одновременных запросов
+
+    @classmethod
+    def from_products(
+        cls, products: Iterable[Product], stock: int = 1000, **kwargs
+    ) -> "FakeBackend":
+        """
+        Создаёт бэкенд из товаров с одинаковым остатком.
+
+        :param products: Товары
+        :param stock: Остаток каждого товара на складе
+        :param kwargs: Параметры задержки, передаваемые в конструктор
+        """
+        records = {
+            product.id: ProductRecord(
+                product.name, product.price, product.weight, stock
+            )
+            for product in products
+        }
+        return cls(records, **kwargs)
+
+    def connect(self) -> "FakeConnection":
+        """Открывает соединение с бэкендом."""
+        return FakeConnection(self)
+
+    async def _fetch(self, product_ids: list[int]) -> dict[int, ProductRecord]:
+        """
+        Выполняет один запрос за записями пачки товаров.
+
+        :param product_ids: Идентификаторы товаров
+        :return: Найденные записи (отсутствующие товары пропускаются)
+        """
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self._latency + self._rng.uniform(0, self._jitter))
+        finally:
+            self.active -= 1
+        records = self._records
+        return {i: records[i] for i in product_ids if i in records}
+
+
+class FakeConnection:
+    """Соединение с FakeBackend."""
+
+    def __init__(self, backend: FakeBackend) -> None:
+        """
+        Инициализация соединения.
+
+        :param backend: Бэкенд
+        """
+        self._backend = backend
+
+    async def fetch(self, product_ids: list[int]) -> dict[int, ProductRecord]:
+        """
+        Запрашивает записи пачки товаров.
+
+        :param product_ids: Идентификаторы товаров
+        :return: Найденные записи (отсутствующие товары пропускаются)
+        """
+        return await self._backend._fetch(product_ids)
+
+
+class ConnectionPool:
+    """Пул соединений с бэкендом: не больше ``size`` одновременных запросов."""
+
+    def __init__(self, backend: FakeBackend, size: int = 10) -> None:
+        """
+        Инициализация пула.
+
+        :param backend: Бэкенд, с которым открываются соединения
+        :param size: Количество соединений в пуле
+        :raises ValueError: если размер пула меньше 1
+        """
+        if size < 1:
+            raise ValueError("Размер пула соединений должен быть не меньше 1")
+
+        self._idle: asyncio.Queue[FakeConnection] = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(backend.connect())
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> AsyncIterator[FakeConnection]:
+        """Берёт свободное соединение из пула и возвращает его по завершении."""
+        connection = await self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put_nowait(connection)
+
+
+class ProductLoader:
+    """
+    Загрузчик записей о товарах с пакетированием запросов (шаблон DataLoader).
+
+    Все вызовы ``load`` за один проход цикла событий собираются в пачки до
+    ``max_batch_size`` товаров и отправляются одним запросом на пачку.
+    Одновременные запросы одного товара (в том числе уже отправленного
+    в бэкенд) объединяются в один.
+    """
+
+    def __init__(self, pool: ConnectionPool, max_batch_size: int = 100) -> None:
+        """
+        Инициализация загрузчика.
+
+        :param pool: Пул соединений с бэкендом
+        :param max_batch_size: Максимальное количество товаров в одном запросе
+        :raises ValueError: если размер пачки меньше 1
+        """
+        if max_batch_size < 1:
+            raise ValueError("Размер пачки запроса должен быть не меньше 1")
+
+        self._pool = pool
+        self._max_batch_size = max_batch_size
+        # Ожидающие и выполняющиеся загрузки по идентификатору товара
+        self._futures: dict[int, asyncio.Future[ProductRecord]] = {}
+        self._queue: list[int] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, product_id: int) -> ProductRecord:
+        """
+        Загружает запись о товаре.
+
+        :param product_id: Идентификатор товара
+        :return: Запись о товаре
+        :raises KeyError: если товара нет в бэкенде
+        """
+        future = self._futures.get(product_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[product_id] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(product_id)
+        # shield: отмена одного ожидающего не отменяет загрузку для остальных
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Разбивает накопленные запросы на пачки и отправляет их в бэкенд."""
+        queue, self._queue = self._queue, []
+        size = self._max_batch_size
+        for start in range(0, len(queue), size):
+            task = asyncio.ensure_future(self._fetch(queue[start : start + size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, product_ids: list[int]) -> None:
+        """
+        Выполняет запрос одной пачки и передаёт результаты ожидающим.
+
+        :param product_ids: Идентификаторы товаров пачки
+        """
+        try:
+            async with self._pool.connection() as connection:
+                records = await connection.fetch(product_ids)
+        except Exception as error:
+            for product_id in product_ids:
+                self._futures.pop(product_id).set_exception(error)
+            return
+
+        for product_id in product_ids:
+            future = self._futures.pop(product_id)
+            record = records.get(product_id)
+            if record is None:
+                future.set_exception(
+                    KeyError(f"Товар с идентификатором {product_id} не найден")
+                )
+            else:
+                future.set_result(record)
+
+
+def _record_product(product_id: int, record: ProductRecord) -> Product:
+    """
+    Создаёт товар из записи бэкенда, проверяя её как конструктор Product.
+
+    :param product_id: Идентификатор товара
+    :param record: Запись о товаре из бэкенда
+    :return: Товар с идентификатором из бэкенда
+    :raises ValueError: если название не строка, а цена или вес не целые
+        числа не меньше 1
+    """
+    if not isinstance(record.name, str):
+        raise ValueError(
+            f"Название товара {product_id} в бэкенде должно быть строкой, "
+            f"но получено {record.name!r}"
+        )
+    if not isinstance(record.price, int) or record.price < 1:
+        raise ValueError(
+            f"Цена товара {product_id} в бэкенде должна быть целым числом "
+            f"не меньше 1 у.е., но получено {record.price!r}"
+        )
+    if not isinstance(record.weight, int) or record.weight < 1:
+        raise ValueError(
+            f"Вес товара {product_id} в бэкенде должен быть целым числом "
+            f"не меньше 1 у.е., но получено {record.weight!r}"
+        )
+    return Product._from_trusted(product_id, record.name, record.price, record.weight)
+
+
+class AsyncBasketService:
+    """
+    Асинхронный сервис корзин.
+
+    Перед добавлением товара запрашивает его цену и остаток через
+    ProductLoader и применяет добавление через обычную проверку Basket.
+    """
+
+    def __init__(
+        self, loader: ProductLoader, basket_factory: Callable[[], Basket] = Basket
+    ) -> None:
+        """
+        Инициализация сервиса.
+
+        :param loader: Загрузчик записей о товарах
+        :param basket_factory: Фабрика новых корзин
+        """
+        self._loader = loader
+        self._basket_factory = basket_factory
+        self._baskets: dict[Hashable, Basket] = {}
+
+    def basket(self, cart_id: Hashable) -> Basket:
+        """
+        Возвращает корзину, создавая её при первом обращении.
+
+        :param cart_id: Идентификатор корзины
+        """
+        basket = self._baskets.get(cart_id)
+        if basket is None:
+            basket = self._baskets[cart_id] = self._basket_factory()
+        return basket
+
+    async def add_product(
+        self, cart_id: Hashable, product_id: int, quantity: int = 1
+    ) -> Basket:
+        """
+        Добавляет товар в корзину по его идентификатору.
+
+        Если цена или вес товара в бэкенде изменились с прошлого добавления,
+        все единицы товара в корзине пересчитываются по новой цене и весу.
+
+        :param cart_id: Идентификатор корзины
+        :param product_id: Идентификатор товара
+        :param quantity: Количество товара (по умолчанию 1)
+        :return: Корзина после добавления
+        :raises KeyError: если товара нет в бэкенде
+        :raises TypeError: если переданы данные некорректного типа
+        :raises ValueError: если запись бэкенда некорректна, не хватает остатка
+            или превышены лимиты корзины
+        """
+        record = await self._loader.load(product_id)
+        product = _record_product(product_id, record)
+        # После await корзина изменяется синхронно, без переключения задач
+        basket = self.basket(cart_id)
+        current = basket.quantity_of(product_id)
+        if isinstance(quantity, int) and current + quantity > record.stock:
+            raise ValueError(
+                f"Недостаточно товара на складе: доступно {record.stock} ед."
+            )
+
+        if current and isinstance(quantity, int) and quantity > 0:
+            # Строка пересчитывается на своём месте по цене и весу из бэкенда:
+            # если они изменились с прошлого добавления, меняются все единицы
+            basket.replace_product(product, current + quantity)
+        else:
+            basket.add_product(product, quantity)
+        return basket
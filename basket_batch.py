@@ -0,0 +1,186 @@
+import operator
+from array import array
+from functools import partial
+from itertools import accumulate, chain, repeat
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Sequence
+
+from product_basket import Basket, ShippingPolicy
+from product_catalog import ProductCatalog
+
+if TYPE_CHECKING:
+    from promotions import PromotionPlan
+
+# Битовые флаги нарушений в BatchResult.violations
+VIOLATION_MAX_ITEMS = 1  # Превышено Basket.MAX_ITEMS
+VIOLATION_MAX_WEIGHT = 2  # Превышен Basket.MAX_WEIGHT
+VIOLATION_QUANTITY = 4  # Есть строка с количеством меньше 1
+
+
+class BatchResult(NamedTuple):
+    """Результаты расчёта пакета корзин: по одному значению на корзину в колонке."""
+
+    items: list[int]  # Количество единиц товара
+    total_price: list[int]  # Общая стоимость товаров
+    total_weight: list[int]  # Общий вес товаров
+    shipping_cost: list[int]  # Стоимость доставки
+    price: list[int]  # Итоговая стоимость со скидками и доставкой
+    violations: list[int]  # Битовая маска флагов VIOLATION_*, 0 — нарушений нет
+    discount: list[int]  # Сумма скидок по акциям (0 без акций)
+
+
+class BasketBatch:
+    """
+    Пакет корзин в колоночном (CSR) представлении.
+
+    Строки корзины ``i`` занимают позиции ``offsets[i]:offsets[i + 1]`` массивов
+    ``product_ids`` и ``quantities``; цены и веса берутся из ProductCatalog.
+    Итоги всех корзин считаются по колонкам через префиксные суммы, без
+    создания объектов Basket и Product.
+    """
+
+    def __init__(
+        self,
+        offsets: Sequence[int],
+        product_ids: Sequence[int],
+        quantities: Sequence[int],
+        catalog: ProductCatalog,
+    ) -> None:
+        """
+        Инициализация пакета.
+
+        :param offsets: Границы корзин (длина — количество корзин + 1, первая равна 0)
+        :param product_ids: Идентификаторы товаров всех строк подряд
+        :param quantities: Количества товаров всех строк подряд
+        :param catalog: Каталог с ценами и весами товаров
+        :raises ValueError: если границы корзин не согласованы с массивами строк
+        """
+        if len(product_ids) != len(quantities):
+            raise ValueError(
+                "Массивы идентификаторов и количеств товаров должны быть одной длины"
+            )
+        if not offsets or offsets[0] != 0 or offsets[-1] != len(product_ids):
+            raise ValueError(
+                "Границы корзин должны начинаться с 0 и заканчиваться числом строк"
+            )
+        if any(map(operator.gt, offsets, offsets[1:])):
+            raise ValueError("Границы корзин должны быть неубывающими")
+
+        self._offsets = array("q", offsets)
+        self._product_ids = array("q", product_ids)
+        self._quantities = array("q", quantities)
+        self._catalog = catalog
+
+    @classmethod
+    def from_baskets(
+        cls, baskets: Iterable[Basket], catalog: ProductCatalog | None = None
+    ) -> "BasketBatch":
+        """
+        Собирает пакет из существующих корзин.
+
+        :param baskets: Корзины
+        :param catalog: Каталог товаров; если не задан, строится из товаров корзин
+        :return: Пакет корзин
+        """
+        offsets = array("q", [0])
+        product_ids = array("q")
+        quantities = array("q")
+        products = {}
+        for basket in baskets:
+            for product, quantity in basket.lines():
+                product_ids.append(product.id)
+                quantities.append(quantity)
+                products[product.id] = product
+            offsets.append(len(product_ids))
+
+        if catalog is None:
+            catalog = ProductCatalog.from_products(products.values())
+        return cls(offsets, product_ids, quantities, catalog)
+
+    def __len__(self) -> int:
+        """Возвращает количество корзин в пакете."""
+        return len(self._offsets) - 1
+
+    def evaluate(
+        self,
+        basket_cls: type[Basket] = Basket,
+        shipping_policy: ShippingPolicy | None = None,
+        promotions: "PromotionPlan | None" = None,
+    ) -> BatchResult:
+        """
+        Считает итоги всех корзин пакета.
+
+        Результаты совпадают со свойствами total_items, total_price, total_weight,
+        get_shipping_cost и get_price корзины ``basket_cls`` с теми же строками,
+        а с акциями — с PromotionPlan.evaluate для каждой корзины.
+
+        :param basket_cls: Класс корзины, задающий лимиты и тарифы доставки
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY
+            класса ``basket_cls``
+        :param promotions: Скомпилированный набор акций; скидки применяются
+            до расчёта доставки
+        :return: Колонки результатов
+        :raises KeyError: если какого-либо товара нет в каталоге
+        """
+        quantities = self._quantities
+        prices = self._catalog.prices_for(self._product_ids)
+        weights = self._catalog.weights_for(self._product_ids)
+
+        items = self._segment_sums(quantities)
+        total_price = self._segment_sums(map(operator.mul, prices, quantities))
+        total_weight = self._segment_sums(map(operator.mul, weights, quantities))
+        bad_lines = self._segment_sums(map(partial(operator.gt, 1), quantities))
+
+        if promotions is None:
+            discount = [0] * len(total_price)
+            subtotal = total_price
+        else:
+            discount = self._segment_sums(
+                promotions.line_discounts(self._product_ids, prices, quantities)
+            )
+            subtotal = list(map(operator.sub, total_price, discount))
+            thresholds = list(map(promotions.threshold_discount, subtotal))
+            discount = list(map(operator.add, discount, thresholds))
+            subtotal = list(map(operator.sub, subtotal, thresholds))
+
+        policy = shipping_policy or basket_cls.SHIPPING_POLICY
+        if promotions is None:
+            shipping_cost = policy.costs(subtotal)
+        else:
+            # Тариф непустой корзины не ниже тарифа для 1 у.е., как в PromotionPlan
+            basis = map(max, subtotal, map(partial(min, 1), total_price))
+            shipping_cost = policy.costs(basis)
+        price = list(map(operator.add, subtotal, shipping_cost))
+
+        over_items = map(partial(operator.lt, basket_cls.MAX_ITEMS), items)
+        over_weight = map(partial(operator.lt, basket_cls.MAX_WEIGHT), total_weight)
+        violations = list(
+            map(
+                operator.or_,
+                map(operator.mul, over_items, repeat(VIOLATION_MAX_ITEMS)),
+                map(
+                    operator.or_,
+                    map(operator.mul, over_weight, repeat(VIOLATION_MAX_WEIGHT)),
+                    map(operator.mul, map(bool, bad_lines), repeat(VIOLATION_QUANTITY)),
+                ),
+            )
+        )
+        return BatchResult(
+            items, total_price, total_weight, shipping_cost, price, violations, discount
+        )
+
+    def _segment_sums(self, values: Iterable[int]) -> list[int]:
+        """
+        Суммирует значения строк по корзинам через префиксные суммы.
+
+        :param values: Значения всех строк подряд
+        :return: Сумма значений для каждой корзины
+        """
+        prefix = list(chain((0,), accumulate(values)))
+        offsets = self._offsets
+        return list(
+            map(
+                operator.sub,
+                map(prefix.__getitem__, offsets[1:]),
+                map(prefix.__getitem__, offsets[:-1]),
+            )
+        )
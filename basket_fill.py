@@ -0,0 +1,314 @@
+import time
+from typing import NamedTuple
+
+from product_basket import Basket, Product
+from product_catalog import ProductCatalog
+
+OBJECTIVE_NEXT_TIER = "next_tier"  # Дотянуть до ближайшего более дешёвого тарифа
+OBJECTIVE_MAX_PRICE = "max_price"  # Заполнить остаток лимитов самыми дорогими товарами
+OBJECTIVES = (OBJECTIVE_NEXT_TIER, OBJECTIVE_MAX_PRICE)
+
+# Через сколько узлов перебора проверяется бюджет времени
+_BUDGET_CHECK_INTERVAL = 1024
+
+
+class FillSuggestion(NamedTuple):
+    """Подобранный набор дополнительных товаров для корзины."""
+
+    lines: list[tuple[Product, int]]  # Строки (товар, количество) для добавления
+    added_price: int  # Стоимость добавляемых товаров
+    added_weight: int  # Вес добавляемых товаров
+    price: int  # Итоговая стоимость корзины после добавления (с доставкой)
+    optimal: bool  # Доказана ли оптимальность (False — исчерпан бюджет времени)
+
+
+class _StopSearch(Exception):
+    """Досрочное завершение перебора: найден набор ровно на need или исчерпан бюджет."""
+
+
+def suggest_fill(
+    basket: Basket,
+    catalog: ProductCatalog,
+    objective: str = OBJECTIVE_NEXT_TIER,
+    time_budget: float | None = None,
+) -> FillSuggestion:
+    """
+    Подбирает товары каталога, помещающиеся в остаток лимитов корзины.
+
+    Решает ограниченную задачу о рюкзаке с двумя ограничениями: остатком
+    MAX_ITEMS и остатком MAX_WEIGHT. Каждый товар можно взять несколько раз.
+
+    - ``next_tier``: минимальная по стоимости добавка, после которой общая
+      стоимость достигает ближайшего порога с более дешёвой доставкой.
+      Перебор с отсечениями (ветви и границы); с ``time_budget`` возвращает
+      лучший найденный к исходу бюджета набор (``optimal=False``).
+    - ``max_price``: добавка максимальной стоимости. Точное решение
+      динамическим программированием по (количеству, весу).
+
+    :param basket: Корзина
+    :param catalog: Каталог товаров
+    :param objective: Цель подбора: ``next_tier`` или ``max_price``
+    :param time_budget: Бюджет времени перебора в секундах (None — без ограничения)
+    :return: Подобранный набор; пустой, если подходящей добавки нет
+    :raises ValueError: если цель подбора неизвестна
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Неизвестная цель подбора: {objective!r}")
+
+    items_left = basket.MAX_ITEMS - basket.total_items
+    weight_left = basket.MAX_WEIGHT - basket.total_weight
+    if objective == OBJECTIVE_MAX_PRICE:
+        rows, optimal = _max_price(catalog, items_left, weight_left)
+    else:
+        threshold = basket.shipping_policy.next_cheaper_threshold(basket.total_price)
+        if threshold is None:
+            rows, optimal = {}, True
+        else:
+            deadline = (
+                None if time_budget is None else time.perf_counter() + time_budget
+            )
+            rows, optimal = _next_tier(
+                catalog,
+                items_left,
+                weight_left,
+                threshold - basket.total_price,
+                deadline,
+            )
+
+    ids, prices, weights = catalog.columns()
+    lines = [(catalog.product(ids[row]), count) for row, count in rows.items()]
+    added_price = sum(prices[row] * count for row, count in rows.items())
+    added_weight = sum(weights[row] * count for row, count in rows.items())
+    total_price = basket.total_price + added_price
+    return FillSuggestion(
+        lines,
+        added_price,
+        added_weight,
+        total_price + basket.shipping_policy.cost(total_price),
+        optimal,
+    )
+
+
+def _max_price(
+    catalog: ProductCatalog, items_left: int, weight_left: int
+) -> tuple[dict[int, int], bool]:
+    """
+    Находит добавку максимальной стоимости в пределах остатка лимитов.
+
+    Для каждого веса достаточно самого дорогого товара, а из них — только
+    Парето-оптимальных (дороже всех более лёгких), поэтому динамическое
+    программирование идёт по O(weight_left) кандидатам.
+
+    :return: Количество по номеру строки каталога и признак оптимальности
+    """
+    if items_left < 1 or weight_left < 1:
+        return {}, True
+
+    best: dict[int, tuple[int, int]] = {}  # Вес -> (цена, номер строки)
+    _, prices, weights = catalog.columns()
+    for row, (price, weight) in enumerate(zip(prices, weights)):
+        if weight <= weight_left:
+            current = best.get(weight)
+            if current is None or price > current[0]:
+                best[weight] = (price, row)
+
+    candidates = []  # (цена, вес, номер строки) по возрастанию веса
+    max_seen = 0
+    for weight in sorted(best):
+        price, row = best[weight]
+        if price > max_seen:
+            candidates.append((price, weight, row))
+            max_seen = price
+
+    # value[w] — максимальная стоимость не более чем i единиц общим весом не
+    # более w после шага i; choice[i][w] — кандидат, добавленный на шаге i
+    value = [0] * (weight_left + 1)
+    choice: list[list[int]] = []
+    for _ in range(items_left):
+        previous = value
+        value = previous[:]
+        step = [-1] * (weight_left + 1)
+        for index, (price, weight, _) in enumerate(candidates):
+            for w in range(weight, weight_left + 1):
+                total = previous[w - weight] + price
+                if total > value[w]:
+                    value[w] = total
+                    step[w] = index
+        choice.append(step)
+        if value == previous:
+            break
+
+    rows: dict[int, int] = {}
+    w = weight_left
+    for step in reversed(choice):
+        index = step[w]
+        if index >= 0:
+            _, weight, row = candidates[index]
+            rows[row] = rows.get(row, 0) + 1
+            w -= weight
+    return rows, True
+
+
+def _next_tier(
+    catalog: ProductCatalog,
+    items_left: int,
+    weight_left: int,
+    need: int,
+    deadline: float | None,
+) -> tuple[dict[int, int], bool]:
+    """
+    Находит минимальную по стоимости добавку стоимостью не меньше need.
+
+    В оптимальном наборе из нескольких товаров каждый товар дешевле need
+    (иначе его одного достаточно), а из товаров одной цены нужен только
+    самый лёгкий. Поэтому перебор идёт по не более чем need кандидатам,
+    а лучший одиночный товар дороже need служит начальным решением.
+
+    :return: Количество по номеру строки каталога и признак оптимальности
+    """
+    if items_left < 1 or weight_left < 1:
+        return {}, True
+
+    lightest: dict[int, tuple[int, int]] = {}  # Цена < need -> (вес, номер строки)
+    single: tuple[int, int] | None = None  # Самый дешёвый товар дороже need
+    _, prices, weights = catalog.columns()
+    for row, (price, weight) in enumerate(zip(prices, weights)):
+        if weight > weight_left:
+            continue
+        if price >= need:
+            if single is None or price < single[0]:
+                single = (price, row)
+        else:
+            current = lightest.get(price)
+            if current is None or weight < current[0]:
+                lightest[price] = (weight, row)
+
+    best_price = single[0] if single else None
+    best_rows = {single[1]: 1} if single else {}
+    candidates = sorted(
+        ((price, weight, row) for price, (weight, row) in lightest.items()),
+        reverse=True,
+    )
+    lower = _lower_bound(candidates, need, best_price)
+    if best_price == lower:
+        return best_rows, True
+
+    # Наибольшая цена единицы веса среди кандидатов начиная с i
+    ratio = [0.0] * (len(candidates) + 1)
+    for i in range(len(candidates) - 1, -1, -1):
+        price, weight, _ = candidates[i]
+        ratio[i] = max(ratio[i + 1], price / weight)
+
+    chosen: list[int] = []  # Кандидаты текущего набора, по одному на уровень
+    seen: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    nodes = 0
+
+    def visit(start: int, price: int, units: int, weight: int) -> bool:
+        """Учитывает узел перебора; False — состояние уже перебрано."""
+        nonlocal nodes
+        nodes += 1
+        if deadline is not None and not nodes % _BUDGET_CHECK_INTERVAL:
+            if time.perf_counter() > deadline:
+                raise _StopSearch
+
+        # Состояние с тем же набором кандидатов и суммой, но с большим запасом
+        # уже перебрано
+        states = seen.setdefault((start, price), [])
+        for seen_units, seen_weight in states:
+            if seen_units <= units and seen_weight <= weight:
+                return False
+        states.append((units, weight))
+        return True
+
+    # Перебор в глубину с явным стеком: глубина равна числу единиц в наборе
+    # и в оптовых корзинах превышает предел рекурсии. Кадр — стоимость,
+    # количество и вес набора и номер следующего кандидата
+    stack = [[0, 0, 0, 0]] if visit(0, 0, 0, 0) else []
+    try:
+        while stack:
+            frame = stack[-1]
+            price, units, weight, i = frame
+            units_left = items_left - units
+            weight_room = weight_left - weight
+            child = None
+            while i < len(candidates):
+                item_price, item_weight, _ = candidates[i]
+                # Верхняя граница добавки кандидатами не дороже i-го; у следующих
+                # кандидатов она не больше, поэтому перебор можно прекратить
+                if price + min(units_left * item_price, weight_room * ratio[i]) < need:
+                    break
+                total_weight = weight + item_weight
+                total = price + item_price
+                i += 1
+                if total_weight > weight_left:
+                    continue
+                if total >= need:
+                    if best_price is None or total < best_price:
+                        best_price = total
+                        best_rows = _count_rows(candidates, chosen + [i - 1])
+                        if total == lower:
+                            raise _StopSearch
+                    continue
+                if units_left > 1 and visit(i - 1, total, units + 1, total_weight):
+                    child = [total, units + 1, total_weight, i - 1]
+                    break
+
+            if child is None:
+                stack.pop()
+                if stack:
+                    chosen.pop()
+            else:
+                frame[3] = i
+                chosen.append(child[3])
+                stack.append(child)
+    except _StopSearch:
+        return best_rows, best_price == lower
+    return best_rows, True
+
+
+def _lower_bound(
+    candidates: list[tuple[int, int, int]], need: int, best_price: int | None
+) -> int | None:
+    """
+    Возвращает нижнюю границу стоимости добавки без учёта лимитов корзины.
+
+    Суммы цен кандидатов (каждый можно взять сколько угодно раз) строятся
+    битовой маской: бит v установлен, если сумма v достижима. Наименьшая
+    достижимая сумма не меньше need — нижняя граница оптимума; если до неё
+    доходит найденное решение, перебор можно завершить.
+
+    :param candidates: Кандидаты (цена, вес, номер строки), все дешевле need
+    :param need: Минимальная стоимость добавки
+    :param best_price: Стоимость лучшего известного решения (None — нет решения)
+    :return: Нижняя граница или None, если добавка недостижима
+    """
+    # Решения из нескольких кандидатов дороже need менее чем на цену кандидата
+    limit = 2 * need if best_price is None else best_price + 1
+    mask = (1 << limit) - 1
+    reach = 1
+    for price, _, _ in candidates:
+        shift = price
+        while shift < limit:
+            reach = (reach | (reach << shift)) & mask
+            shift <<= 1
+
+    above = reach >> need
+    if not above:
+        return best_price
+    return need + (above & -above).bit_length() - 1
+
+
+def _count_rows(
+    candidates: list[tuple[int, int, int]], indexes: list[int]
+) -> dict[int, int]:
+    """
+    Преобразует выбранных кандидатов в количество по номеру строки каталога.
+
+    :param candidates: Кандидаты (цена, вес, номер строки)
+    :param indexes: Номера выбранных кандидатов (могут повторяться)
+    """
+    rows: dict[int, int] = {}
+    for index in indexes:
+        row = candidates[index][2]
+        rows[row] = rows.get(row, 0) + 1
+    return rows
@@ -0,0 +1,417 @@
+import random
+from typing import Callable, Iterable, NamedTuple
+
+from product_basket import DEFAULT_SHIPPING_POLICY, Basket, Product, ShippingPolicy
+
+# Товары для случайных последовательностей: веса и цены у границ лимитов
+# корзины и порогов тарифов доставки
+POOL_SPECS = (
+    ("Флешка", 1, 1),
+    ("Кабель", 249, 3),
+    ("Чайник", 499, 7),
+    ("Тостер", 500, 25),
+    ("Телевизор", 999, 50),
+    ("Гиря", 10, 100),
+)
+MISSING_ID = 999_999_999  # Идентификатор товара, которого нет в корзине
+# Значения количества: частые корректные, граничные для MAX_ITEMS и некорректные
+QUANTITIES = (1, 1, 1, 2, 3, 5, 10, 29, 30, 31, 0, -1, "1", 1.0, True)
+# Доля товаров, заменяемых вариантом с тем же идентификатором, но другой ценой
+# или весом
+CONFLICT_RATE = 0.05
+# Ключи товаров кроме индексов пула: отсутствующий, другого типа, нехэшируемый
+FOREIGN_KEYS = ("missing", "str", "unhashable")
+
+Op = tuple  # (операция, *аргументы); товары заданы индексами pool_products()
+
+
+class ReferenceBasket:
+    """
+    Эталонная корзина: наивная реализация семантики Basket.
+
+    Хранит список единиц товара и пересчитывает итоги при каждом чтении.
+    Повторяет порядок проверок и типы исключений Basket, но не его
+    оптимизации (строки, накопленные итоги, кэш стоимости).
+    """
+
+    def __init__(
+        self,
+        max_items: int = Basket.MAX_ITEMS,
+        max_weight: int = Basket.MAX_WEIGHT,
+        shipping_policy: ShippingPolicy = DEFAULT_SHIPPING_POLICY,
+    ) -> None:
+        """
+        Инициализация пустой корзины.
+
+        :param max_items: Максимальное количество товаров
+        :param max_weight: Максимальный вес товаров
+        :param shipping_policy: Тарифы доставки
+        """
+        self.max_items = max_items
+        self.max_weight = max_weight
+        self.shipping_policy = shipping_policy
+        self.items: list[Product] = []
+
+    def add_product(self, product: Product, quantity: int = 1) -> None:
+        """Добавляет товар (TypeError — некорректный тип, ValueError — лимиты)."""
+        if not isinstance(product, Product):
+            raise TypeError("Ожидался объект Product")
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError("Ожидалось положительное целое число")
+        for item in self.items:
+            if item.id == product.id and (item.price, item.weight) != (
+                product.price,
+                product.weight,
+            ):
+                raise ValueError("Товар уже лежит в корзине с другой ценой или весом")
+        self._check_limits(quantity, product.weight * quantity)
+        self.items.extend([product] * quantity)
+
+    def add_many(self, lines: Iterable[tuple[Product, int]]) -> None:
+        """Добавляет строки по одной в копию корзины и принимает её целиком."""
+        scratch = ReferenceBasket(self.max_items, self.max_weight)
+        scratch.items = self.items[:]
+        for line in lines:
+            try:
+                product, quantity = line
+            except (TypeError, ValueError):
+                raise TypeError("Ожидалась пара (товар, количество)") from None
+            scratch.add_product(product, quantity)
+        self.items = scratch.items
+
+    def delete_product(self, product_id: int) -> None:
+        """Удаляет все единицы товара (TypeError — нехэшируемый ключ)."""
+        hash(product_id)
+        self.items = [item for item in self.items if item.id != product_id]
+
+    def set_quantity(self, product_id: int, quantity: int) -> None:
+        """Устанавливает количество товара, уже лежащего в корзине."""
+        if not isinstance(quantity, int) or quantity < 0:
+            raise TypeError("Ожидалось неотрицательное целое число")
+        product = self._find(product_id)
+        delta = quantity - self.quantity_of(product_id)
+        if delta > 0:
+            self._check_limits(delta, product.weight * delta)
+        self.delete_product(product_id)
+        self.items.extend([product] * quantity)
+
+    def decrement(self, product_id: int, quantity: int = 1) -> None:
+        """Убирает единицы товара (ValueError — в корзине меньше единиц)."""
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError("Ожидалось положительное целое число")
+        product = self._find(product_id)
+        current = self.quantity_of(product_id)
+        if quantity > current:
+            raise ValueError("В корзине меньше единиц товара")
+        self.delete_product(product_id)
+        self.items.extend([product] * (current - quantity))
+
+    def quantity_of(self, product_id: int) -> int:
+        """Возвращает количество единиц товара."""
+        return sum(item.id == product_id for item in self.items)
+
+    def state(self, product_ids: Iterable[int]) -> tuple:
+        """Возвращает наблюдаемое состояние корзины (см. observe)."""
+        total_price = sum(item.price for item in self.items)
+        shipping = self.shipping_policy.cost(total_price)
+        return (
+            len(self.items),
+            total_price,
+            sum(item.weight for item in self.items),
+            shipping,
+            total_price + shipping,
+            sorted(item.id for item in self.items),
+            [self.quantity_of(product_id) for product_id in product_ids],
+        )
+
+    def _find(self, product_id: int) -> Product:
+        """Возвращает товар корзины (KeyError — товара нет, TypeError — ключ)."""
+        hash(product_id)
+        for item in self.items:
+            if item.id == product_id:
+                return item
+        raise KeyError(f"Товар с идентификатором {product_id} отсутствует в корзине")
+
+    def _check_limits(self, quantity: int, weight: int) -> None:
+        """Проверяет лимиты (ValueError при превышении)."""
+        if len(self.items) + quantity > self.max_items:
+            raise ValueError("Превышено максимальное количество товаров")
+        if sum(item.weight for item in self.items) + weight > self.max_weight:
+            raise ValueError("Превышен максимальный вес")
+
+
+class FuzzFailure(NamedTuple):
+    """Расхождение кандидата с эталоном на минимальной последовательности."""
+
+    seed: int  # Зерно последовательности, на которой найдено расхождение
+    ops: list[Op]  # Минимизированная последовательность операций
+    message: str  # Описание расхождения на последней операции
+
+    def repro(self) -> str:
+        """Возвращает воспроизведение в виде кода на Python."""
+        lines = [
+            "products = basket_fuzz.pool_products()",
+            "basket = <кандидат>()",
+        ]
+        lines += [f"basket.{_render(op)}" for op in self.ops]
+        return "\n".join(lines + [f"# {self.message}"])
+
+
+def pool_products() -> list[Product]:
+    """
+    Создаёт товары пула для последовательности операций.
+
+    За товарами POOL_SPECS следуют их варианты с тем же идентификатором, но
+    ценой (чётные индексы) или весом (нечётные) на 1 больше: добавление
+    варианта товара, уже лежащего в корзине, отклоняется с ValueError.
+
+    :return: Товары POOL_SPECS и их варианты, в этом порядке
+    """
+    products = [Product(*spec) for spec in POOL_SPECS]
+    return products + [
+        Product._from_trusted(
+            product.id, product.name, product.price + 1 - i % 2, product.weight + i % 2
+        )
+        for i, product in enumerate(products)
+    ]
+
+
+def observe(basket: Basket, product_ids: Iterable[int]) -> tuple:
+    """
+    Возвращает наблюдаемое состояние корзины.
+
+    :param basket: Корзина
+    :param product_ids: Идентификаторы товаров для quantity_of
+    :return: Количество, стоимость, вес, доставка, итоговая стоимость,
+        отсортированные идентификаторы единиц товара и quantity_of по товарам
+    """
+    return (
+        basket.total_items,
+        basket.total_price,
+        basket.total_weight,
+        basket.get_shipping_cost,
+        basket.get_price,
+        sorted(product.id for product in basket.list_products),
+        [basket.quantity_of(product_id) for product_id in product_ids],
+    )
+
+
+def random_ops(rng: random.Random, length: int) -> list[Op]:
+    """
+    Создаёт случайную последовательность операций.
+
+    :param rng: Генератор случайных чисел
+    :param length: Количество операций
+    """
+    pool = len(POOL_SPECS)
+
+    def product() -> int:
+        variant = pool if rng.random() < CONFLICT_RATE else 0
+        return rng.randrange(pool) + variant
+
+    def key() -> int | str:
+        return rng.randrange(pool) if rng.random() < 0.9 else rng.choice(FOREIGN_KEYS)
+
+    ops: list[Op] = []
+    for _ in range(length):
+        roll = rng.random()
+        if roll < 0.45:
+            added = product() if rng.random() < 0.97 else "str"
+            ops.append(("add_product", added, rng.choice(QUANTITIES)))
+        elif roll < 0.6:
+            lines = [
+                (product(), rng.choice(QUANTITIES)) for _ in range(rng.randint(0, 3))
+            ]
+            ops.append(("add_many", lines))
+        elif roll < 0.75:
+            ops.append(("delete_product", key()))
+        elif roll < 0.88:
+            ops.append(("set_quantity", key(), rng.choice(QUANTITIES)))
+        else:
+            ops.append(("decrement", key(), rng.choice(QUANTITIES)))
+    return ops
+
+
+def run_ops(factory: Callable[[], Basket], ops: list[Op]) -> str | None:
+    """
+    Выполняет операции над кандидатом и эталоном и сравнивает результаты.
+
+    После каждой операции сравниваются тип исключения (или его отсутствие)
+    и наблюдаемое состояние корзины.
+
+    :param factory: Фабрика корзин-кандидатов
+    :param ops: Последовательность операций
+    :return: Описание первого расхождения или None
+    """
+    products = pool_products()
+    product_ids = [product.id for product in products[: len(POOL_SPECS)]]
+    candidate = factory()
+    reference = ReferenceBasket(
+        candidate.MAX_ITEMS, candidate.MAX_WEIGHT, candidate.shipping_policy
+    )
+    for step, op in enumerate(ops):
+        args = _resolve(op, products)
+        outcomes = []
+        for basket in (candidate, reference):
+            try:
+                getattr(basket, op[0])(*args)
+            except (TypeError, ValueError, KeyError) as error:
+                # Подклассы (например, BatchValueError у add_many) сравниваются
+                # по встроенному исключению, которое они расширяют
+                outcomes.append(
+                    next(
+                        kind.__name__
+                        for kind in (TypeError, ValueError, KeyError)
+                        if isinstance(error, kind)
+                    )
+                )
+            else:
+                outcomes.append("ok")
+        if outcomes[0] != outcomes[1]:
+            return (
+                f"операция {step} {_render(op)}: кандидат — {outcomes[0]}, "
+                f"эталон — {outcomes[1]}"
+            )
+        actual = observe(candidate, product_ids)
+        expected = reference.state(product_ids)
+        if actual != expected:
+            return (
+                f"операция {step} {_render(op)}: состояние {actual} "
+                f"вместо {expected}"
+            )
+    return None
+
+
+def shrink(ops: list[Op], fails: Callable[[list[Op]], bool]) -> list[Op]:
+    """
+    Минимизирует последовательность, на которой проявляется расхождение.
+
+    Сначала удаляются блоки операций убывающего размера, затем аргументы
+    оставшихся операций заменяются более простыми (меньшие индексы товаров
+    и количества, меньше строк в пакете), пока это сохраняет расхождение.
+
+    :param ops: Последовательность с расхождением
+    :param fails: Проверка, что последовательность всё ещё даёт расхождение
+    :return: Минимизированная последовательность
+    """
+    ops = list(ops)
+    changed = True
+    while changed:
+        changed = False
+        chunk = max(len(ops) // 2, 1)
+        while chunk:
+            start = 0
+            while start < len(ops):
+                candidate = ops[:start] + ops[start + chunk :]
+                if fails(candidate):
+                    ops = candidate
+                    changed = True
+                else:
+                    start += chunk
+            chunk //= 2
+        for index in range(len(ops)):
+            for simpler in _simplifications(ops[index]):
+                candidate = ops[:index] + [simpler] + ops[index + 1 :]
+                if fails(candidate):
+                    ops = candidate
+                    changed = True
+                    break
+    return ops
+
+
+def fuzz(
+    factory: Callable[[], Basket],
+    sequences: int = 1000,
+    length: int = 20,
+    seed: int = 0,
+) -> FuzzFailure | None:
+    """
+    Сравнивает кандидата с эталоном на случайных последовательностях операций.
+
+    :param factory: Фабрика корзин-кандидатов с интерфейсом Basket
+    :param sequences: Количество последовательностей
+    :param length: Количество операций в последовательности
+    :param seed: Начальное зерно; последовательность i использует seed + i
+    :return: Минимизированное расхождение или None, если расхождений нет
+    """
+    for index in range(sequences):
+        ops = random_ops(random.Random(seed + index), length)
+        message = run_ops(factory, ops)
+        if message is not None:
+            ops = shrink(ops, lambda candidate: run_ops(factory, candidate) is not None)
+            return FuzzFailure(seed + index, ops, run_ops(factory, ops) or message)
+    return None
+
+
+def _resolve(op: Op, products: list[Product]) -> list:
+    """Подставляет товары и ключи вместо индексов пула в аргументы операции."""
+    name, *args = op
+
+    def key(value: int | str) -> object:
+        if isinstance(value, int):
+            return products[value].id
+        if value == "missing":
+            return MISSING_ID
+        if value == "unhashable":
+            return [value]
+        return value
+
+    if name == "add_product":
+        product = args[0] if args[0] == "str" else products[args[0]]
+        return [product, args[1]]
+    if name == "add_many":
+        return [[(products[index], quantity) for index, quantity in args[0]]]
+    return [key(args[0])] + args[1:]
+
+
+def _render(op: Op) -> str:
+    """Возвращает вызов операции в виде кода на Python."""
+    name, *args = op
+
+    def product(value: int | str) -> str:
+        return repr(value) if value == "str" else f"products[{value}]"
+
+    def key(value: int | str) -> str:
+        rendered = {"missing": repr(MISSING_ID), "unhashable": "['unhashable']"}
+        return rendered.get(value, product(value) + ".id")  # type: ignore[arg-type]
+
+    if name == "add_product":
+        return f"add_product({product(args[0])}, {args[1]!r})"
+    if name == "add_many":
+        lines = ", ".join(f"({product(i)}, {q!r})" for i, q in args[0])
+        return f"add_many([{lines}])"
+    rendered = ", ".join([key(args[0])] + [repr(arg) for arg in args[1:]])
+    return f"{name}({rendered})"
+
+
+def _simplifications(op: Op) -> Iterable[Op]:
+    """Возвращает более простые варианты операции по возрастанию сложности."""
+    name, *args = op
+
+    def smaller(value: object) -> list:
+        if isinstance(value, int) and not isinstance(value, bool) and value > 1:
+            return sorted({1, value // 2, value - 1})
+        return []
+
+    def lower_index(value: object) -> list:
+        if isinstance(value, int) and value > 0:
+            # Вариант товара упрощается и до самого товара пула
+            original = value % len(POOL_SPECS)
+            return sorted({0, original, *smaller(value)} - {value})
+        return []
+
+    if name == "add_many":
+        lines = args[0]
+        for index in range(len(lines)):
+            yield (name, lines[:index] + lines[index + 1 :])
+        for index, (product, quantity) in enumerate(lines):
+            simpler_lines = [(simpler, quantity) for simpler in lower_index(product)]
+            simpler_lines += [(product, simpler) for simpler in smaller(quantity)]
+            for line in simpler_lines:
+                yield (name, lines[:index] + [line] + lines[index + 1 :])
+        return
+    for simpler in lower_index(args[0]):
+        yield (name, simpler, *args[1:])
+    if len(args) > 1:
+        for simpler in smaller(args[1]):
+            yield (name, args[0], simpler)
@@ -0,0 +1,361 @@
+import mmap
+from typing import Iterable, Iterator, Self
+
+from product_basket import Basket, Product, ShippingPolicy
+
+
+class IndexedBasket(Basket):
+    """
+    Корзина, зарегистрированная в BasketIndex.
+
+    Появление и исчезновение строк корзины обновляет обратный индекс
+    «товар → корзины»; новые цены и веса товаров применяются к корзине
+    через BasketIndex.reprice и BasketIndex.reweigh. Товары, уже изменённые
+    в индексе, при добавлении заменяются актуальной версией, поэтому
+    устаревший экземпляр Product не возвращает в корзину старую цену.
+    """
+
+    def __init__(
+        self,
+        index: "BasketIndex",
+        basket_id: int,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> None:
+        """
+        Инициализация корзины.
+
+        :param index: Индекс, в котором зарегистрирована корзина
+        :param basket_id: Идентификатор корзины в индексе
+        :param verify: Режим сверки накопленных итогов после каждого изменения
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+        """
+        super().__init__(verify, shipping_policy)
+        self._index: BasketIndex | None = index
+        self._basket_id = basket_id
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: bytes | bytearray | memoryview | mmap.mmap,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> Self:
+        """
+        Не поддерживается: корзина индекса восстанавливается через BasketIndex.restore.
+
+        :raises TypeError: всегда
+        """
+        raise TypeError(
+            "Корзина индекса восстанавливается через BasketIndex.restore, "
+            "чтобы её товары попали в обратный индекс"
+        )
+
+    @property
+    def basket_id(self) -> int:
+        """Возвращает идентификатор корзины в индексе."""
+        return self._basket_id
+
+    def add_product(self, product: Product, quantity: int = 1) -> None:
+        """Добавляет товар в корзину (см. Basket.add_product)."""
+        if self._index is not None:
+            product = self._index._current(product)
+        super().add_product(product, quantity)
+
+    def add_many(self, lines: Iterable[tuple[Product, int]]) -> None:
+        """Добавляет в корзину пакет строк атомарно (см. Basket.add_many)."""
+        if self._index is not None and (self._index._updated or self._index._pending):
+            lines = self._current_lines(lines)
+        super().add_many(lines)
+
+    def _current_lines(
+        self, lines: Iterable[tuple[Product, int]]
+    ) -> Iterator[tuple[Product, int]]:
+        """Заменяет товары строк пакета актуальными версиями из индекса."""
+        current = self._index._current  # type: ignore[union-attr]
+        for line in lines:
+            if isinstance(line, tuple) and len(line) == 2:
+                yield current(line[0]), line[1]
+            else:
+                yield line
+
+    def _apply(self, product: Product, delta: int) -> None:
+        """Изменяет количество товара и обновляет обратный индекс."""
+        present = product.id in self._products
+        super()._apply(product, delta)
+        if self._index is not None and present != (product.id in self._products):
+            if present:
+                self._index._unlink(product.id, self._basket_id)
+            else:
+                self._index._link(product.id, self._basket_id)
+
+    def _apply_lines(
+        self, lines: dict[int, tuple[Product, int]], count: int, price: int, weight: int
+    ) -> None:
+        """Добавляет проверенные строки пакета и обновляет обратный индекс."""
+        added = [product_id for product_id in lines if product_id not in self._products]
+        super()._apply_lines(lines, count, price, weight)
+        if self._index is not None:
+            for product_id in added:
+                self._index._link(product_id, self._basket_id)
+
+    def _replace_product(self, product: Product) -> None:
+        """
+        Заменяет товар в строке корзины новой версией и пересчитывает итоги.
+
+        Лимиты не проверяются: изменение товара уже произошло, корзины
+        с превышением веса сообщает BasketIndex.reweigh.
+
+        :param product: Новая версия товара с тем же идентификатором
+        """
+        self._replace(product, self._products[product.id][1])
+
+
+class BasketIndex:
+    """
+    Реестр живых корзин с обратным индексом «товар → корзины».
+
+    Для каждого товара хранится множество идентификаторов корзин, в которых
+    он лежит; множество обновляется при появлении и исчезновении строки
+    корзины. Изменение цены или веса товара обходит только корзины
+    с этим товаром и обновляет их итоги за O(1) на корзину, без сканирования
+    всех корзин.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого индекса."""
+        self._baskets: dict[int, IndexedBasket] = {}
+        self._holders: dict[int, set[int]] = {}  # Товар -> корзины с ним
+        self._updated: dict[int, Product] = {}  # Актуальные версии изменённых товаров
+        # Изменения товаров, которых не было ни в одной корзине: товар ->
+        # (новая цена, новый вес), None — значение не менялось
+        self._pending: dict[int, tuple[int | None, int | None]] = {}
+
+    def create(
+        self,
+        basket_id: int,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> IndexedBasket:
+        """
+        Создаёт пустую корзину и регистрирует её в индексе.
+
+        :param basket_id: Идентификатор корзины
+        :param verify: Режим сверки накопленных итогов после каждого изменения
+        :param shipping_policy: Тарифы доставки; по умолчанию Basket.SHIPPING_POLICY
+        :return: Корзина
+        :raises ValueError: если корзина с таким идентификатором уже есть
+        """
+        if basket_id in self._baskets:
+            raise ValueError(
+                f"Корзина с идентификатором {basket_id} уже зарегистрирована"
+            )
+
+        basket = IndexedBasket(self, basket_id, verify, shipping_policy)
+        self._baskets[basket_id] = basket
+        return basket
+
+    def restore(
+        self,
+        basket_id: int,
+        buffer: bytes | bytearray | memoryview | mmap.mmap,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> IndexedBasket:
+        """
+        Восстанавливает корзину из данных Basket.to_bytes и регистрирует её в индексе.
+
+        Товары, изменённые в индексе, попадают в корзину в актуальной версии.
+
+        :param basket_id: Идентификатор корзины
+        :param buffer: Данные корзины (см. Basket.from_buffer)
+        :param verify: Режим сверки накопленных итогов после каждого изменения
+        :param shipping_policy: Тарифы доставки; по умолчанию Basket.SHIPPING_POLICY
+        :return: Корзина
+        :raises ValueError: если корзина с таким идентификатором уже есть, данные
+            повреждены или корзина превышает лимиты
+        """
+        lines = Basket.from_buffer(buffer).lines()
+        basket = self.create(basket_id, verify, shipping_policy)
+        try:
+            basket.add_many(lines)
+        except ValueError:
+            self.remove(basket_id)
+            raise
+        return basket
+
+    def remove(self, basket_id: int) -> None:
+        """
+        Удаляет корзину из индекса.
+
+        Корзина остаётся работоспособной, но её изменения больше не
+        отражаются в индексе, а изменения товаров — в ней.
+
+        :param basket_id: Идентификатор корзины
+        :raises KeyError: если корзины нет в индексе
+        """
+        basket = self._baskets.pop(basket_id, None)
+        if basket is None:
+            raise KeyError(
+                f"Корзина с идентификатором {basket_id} отсутствует в индексе"
+            )
+
+        basket._index = None
+        for product_id in basket._products:
+            self._unlink(product_id, basket_id)
+
+    def get(self, basket_id: int) -> IndexedBasket:
+        """
+        Возвращает корзину по идентификатору.
+
+        :param basket_id: Идентификатор корзины
+        :raises KeyError: если корзины нет в индексе
+        """
+        basket = self._baskets.get(basket_id)
+        if basket is None:
+            raise KeyError(
+                f"Корзина с идентификатором {basket_id} отсутствует в индексе"
+            )
+        return basket
+
+    def baskets_with(self, product_id: int) -> frozenset[int]:
+        """
+        Возвращает идентификаторы корзин, в которых лежит товар.
+
+        :param product_id: Идентификатор товара
+        """
+        return frozenset(self._holders.get(product_id, ()))
+
+    def reprice(self, product_id: int, new_price: int) -> int:
+        """
+        Устанавливает новую цену товара во всех корзинах с ним.
+
+        Итоги каждой затронутой корзины обновляются на разницу цен,
+        умноженную на количество товара в ней. Если товара нет ни в одной
+        корзине, новая цена применяется при его следующем добавлении.
+
+        :param product_id: Идентификатор товара
+        :param new_price: Новая цена товара (натуральное число)
+        :return: Количество обновлённых корзин
+        :raises ValueError: если цена меньше 1
+        """
+        if new_price < 1:
+            raise ValueError("Цена товара должна быть не меньше 1 у.е.")
+
+        return len(self._change(product_id, new_price, None))
+
+    def reweigh(self, product_id: int, new_weight: int) -> list[int]:
+        """
+        Устанавливает новый вес товара во всех корзинах с ним.
+
+        Корзины не отклоняют изменение, а перепроверяются: идентификаторы
+        корзин, вес которых превысил MAX_WEIGHT, возвращаются вызывающему.
+        Если товара нет ни в одной корзине, новый вес применяется при его
+        следующем добавлении.
+
+        :param product_id: Идентификатор товара
+        :param new_weight: Новый вес товара (натуральное число)
+        :return: Идентификаторы корзин с превышением максимального веса
+            по возрастанию
+        :raises ValueError: если вес меньше 1
+        """
+        if new_weight < 1:
+            raise ValueError("Вес товара должен быть не меньше 1 у.е.")
+
+        return sorted(
+            basket.basket_id
+            for basket in self._change(product_id, None, new_weight)
+            if basket.total_weight > basket.MAX_WEIGHT
+        )
+
+    def _change(
+        self, product_id: int, price: int | None, weight: int | None
+    ) -> list[IndexedBasket]:
+        """
+        Применяет новую цену или вес товара.
+
+        Если версия товара неизвестна (его не было ни в одной корзине),
+        изменение запоминается и применяется при добавлении товара в корзину.
+
+        :param product_id: Идентификатор товара
+        :param price: Новая цена; None — цена не меняется
+        :param weight: Новый вес; None — вес не меняется
+        :return: Обновлённые корзины
+        """
+        old = self._product(product_id)
+        if old is None:
+            pending_price, pending_weight = self._pending.get(product_id, (None, None))
+            self._pending[product_id] = (
+                price or pending_price,
+                weight or pending_weight,
+            )
+            return []
+        product = Product._from_trusted(
+            product_id, old.name, price or old.price, weight or old.weight
+        )
+        return self._update(product)
+
+    def _product(self, product_id: int) -> Product | None:
+        """Возвращает текущую версию товара из корзины с ним или из индекса."""
+        holders = self._holders.get(product_id)
+        if not holders:
+            return self._updated.get(product_id)
+        basket_id = next(iter(holders))
+        return self._baskets[basket_id]._products[product_id][0]
+
+    def _update(self, product: Product) -> list[IndexedBasket]:
+        """
+        Заменяет товар новой версией во всех корзинах с ним.
+
+        :param product: Новая версия товара
+        :return: Обновлённые корзины
+        """
+        self._updated[product.id] = product
+        holders = self._holders.get(product.id, ())
+        baskets = [self._baskets[basket_id] for basket_id in holders]
+        for basket in baskets:
+            basket._replace_product(product)
+        return baskets
+
+    def _current(self, product: Product) -> Product:
+        """Возвращает актуальную версию товара, если он менялся в индексе."""
+        if self._pending and isinstance(product, Product):
+            pending = self._pending.pop(product.id, None)
+            if pending is not None:
+                price, weight = pending
+                self._updated[product.id] = Product._from_trusted(
+                    product.id,
+                    product.name,
+                    price or product.price,
+                    weight or product.weight,
+                )
+        if self._updated and isinstance(product, Product):
+            return self._updated.get(product.id, product)
+        return product
+
+    def _link(self, product_id: int, basket_id: int) -> None:
+        """Отмечает, что товар появился в корзине."""
+        holders = self._holders.get(product_id)
+        if holders is None:
+            self._holders[product_id] = {basket_id}
+        else:
+            holders.add(basket_id)
+
+    def _unlink(self, product_id: int, basket_id: int) -> None:
+        """Отмечает, что товара больше нет в корзине."""
+        holders = self._holders[product_id]
+        holders.discard(basket_id)
+        if not holders:
+            del self._holders[product_id]
+
+    def __len__(self) -> int:
+        """Возвращает количество корзин в индексе."""
+        return len(self._baskets)
+
+    def __contains__(self, basket_id: object) -> bool:
+        """Проверяет, зарегистрирована ли корзина в индексе."""
+        return basket_id in self._baskets
+
+    def __iter__(self) -> Iterator[int]:
+        """Возвращает итератор по идентификаторам корзин."""
+        return iter(self._baskets)
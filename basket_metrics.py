@@ -0,0 +1,339 @@
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Iterable, Protocol
+
+from product_basket import Basket, Product, ShippingPolicy
+
+# Результаты операций: успех или причина отказа
+OUTCOME_OK = "ok"
+REASON_MAX_ITEMS = "max_items"  # Превышен MAX_ITEMS
+REASON_MAX_WEIGHT = "max_weight"  # Превышен MAX_WEIGHT
+REASON_TYPE_ERROR = "type_error"  # Данные некорректного типа
+REASON_NOT_FOUND = "not_found"  # Товара нет в корзине
+REASON_INVALID = "invalid"  # Прочие некорректные значения
+REASON_ERROR = "error"  # Прочие исключения (например, AssertionError сверки итогов)
+
+# Верхние границы корзин гистограммы задержек, секунды
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2)
+
+# Реализации измеряемых свойств Basket
+_total_price = Basket.total_price.fget  # type: ignore[attr-defined]
+_total_weight = Basket.total_weight.fget  # type: ignore[attr-defined]
+_get_shipping_cost = Basket.get_shipping_cost.fget  # type: ignore[attr-defined]
+_get_price = Basket.get_price.fget  # type: ignore[attr-defined]
+
+
+class MetricsSink(Protocol):
+    """Приёмник измерений операций корзины."""
+
+    def record(self, operation: str, outcome: str, seconds: float) -> None:
+        """
+        Принимает измерение одной операции.
+
+        :param operation: Название операции (имя метода корзины)
+        :param outcome: Результат: OUTCOME_OK или причина отказа
+        :param seconds: Длительность операции в секундах
+        """
+
+
+class Histogram:
+    """Гистограмма задержек с фиксированными границами корзин."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS) -> None:
+        """
+        Инициализация пустой гистограммы.
+
+        :param bounds: Верхние границы корзин по возрастанию; последняя
+            корзина (+Inf) добавляется автоматически
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Не накопленные значения
+        self.total = 0.0  # Сумма наблюдений
+        self.count = 0  # Количество наблюдений
+
+    def observe(self, value: float) -> None:
+        """
+        Добавляет наблюдение.
+
+        :param value: Наблюдаемое значение
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Возвращает пары (верхняя граница, накопленное количество), включая +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+class InMemorySink:
+    """
+    Приёмник, накапливающий счётчики и гистограммы задержек в памяти.
+
+    Гистограмма ведётся для каждой пары (операция, результат); счётчик
+    операций — её количество наблюдений. Запись потокобезопасна, поэтому
+    один приёмник можно использовать для многих корзин.
+    """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        """
+        Инициализация пустого приёмника.
+
+        :param buckets: Верхние границы корзин гистограмм задержек, секунды
+        """
+        self._buckets = tuple(buckets)
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Передаёт гистограммы без блокировки, которая не сериализуется."""
+        state = self.__dict__.copy()
+        state["_histograms"] = self.snapshot()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Восстанавливает приёмник с новой блокировкой."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, outcome: str, seconds: float) -> None:
+        """Принимает измерение одной операции (см. MetricsSink.record)."""
+        key = (operation, outcome)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def count(self, operation: str, outcome: str | None = None) -> int:
+        """
+        Возвращает количество операций.
+
+        :param operation: Название операции
+        :param outcome: Результат операции; None — все результаты
+        """
+        with self._lock:
+            return sum(
+                histogram.count
+                for (name, result), histogram in self._histograms.items()
+                if name == operation and outcome in (None, result)
+            )
+
+    def histogram(self, operation: str, outcome: str = OUTCOME_OK) -> Histogram:
+        """
+        Возвращает гистограмму задержек операции.
+
+        :param operation: Название операции
+        :param outcome: Результат операции
+        :raises KeyError: если операция с таким результатом не измерялась
+        """
+        with self._lock:
+            histogram = self._histograms.get((operation, outcome))
+        if histogram is None:
+            raise KeyError(
+                f"Нет измерений операции {operation!r} с результатом {outcome!r}"
+            )
+        return histogram
+
+    def snapshot(self) -> dict[tuple[str, str], Histogram]:
+        """Возвращает гистограммы по (операция, результат) на текущий момент."""
+        with self._lock:
+            snapshot = {}
+            for key, histogram in self._histograms.items():
+                copy = Histogram(histogram.bounds)
+                copy.counts = histogram.counts[:]
+                copy.total = histogram.total
+                copy.count = histogram.count
+                snapshot[key] = copy
+            return snapshot
+
+
+class PrometheusSink(InMemorySink):
+    """Приёмник в памяти с выгрузкой в текстовом формате Prometheus."""
+
+    def __init__(
+        self, namespace: str = "basket", buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> None:
+        """
+        Инициализация пустого приёмника.
+
+        :param namespace: Префикс имён метрик
+        :param buckets: Верхние границы корзин гистограмм задержек, секунды
+        """
+        super().__init__(buckets)
+        self._namespace = namespace
+
+    def exposition(self) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus (версия 0.0.4).
+
+        Счётчик ``<namespace>_operations_total`` и гистограмма
+        ``<namespace>_operation_seconds`` с метками ``operation`` и ``outcome``.
+        """
+        histograms = sorted(self.snapshot().items())
+        counter = f"{self._namespace}_operations_total"
+        seconds = f"{self._namespace}_operation_seconds"
+        lines = [
+            f"# HELP {counter} Количество операций корзины по результату.",
+            f"# TYPE {counter} counter",
+        ]
+        for (operation, outcome), histogram in histograms:
+            labels = f'operation="{operation}",outcome="{outcome}"'
+            lines.append(f"{counter}{{{labels}}} {histogram.count}")
+        lines += [
+            f"# HELP {seconds} Длительность операций корзины в секундах.",
+            f"# TYPE {seconds} histogram",
+        ]
+        for (operation, outcome), histogram in histograms:
+            labels = f'operation="{operation}",outcome="{outcome}"'
+            for bound, count in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{seconds}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{seconds}_sum{{{labels}}} {histogram.total!r}")
+            lines.append(f"{seconds}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class CallbackSink:
+    """Приёмник, передающий каждое измерение в пользовательскую функцию."""
+
+    def __init__(self, callback: Callable[[str, str, float], None]) -> None:
+        """
+        Инициализация приёмника.
+
+        :param callback: Функция (операция, результат, секунды)
+        """
+        self.record = callback
+
+
+def _reason(error: Exception) -> str:
+    """Возвращает причину отказа операции по исключению."""
+    if isinstance(error, TypeError):
+        return REASON_TYPE_ERROR
+    if isinstance(error, KeyError):
+        return REASON_NOT_FOUND
+    if isinstance(error, ValueError):
+        return getattr(error, "reason", REASON_INVALID)
+    return REASON_ERROR
+
+
+class InstrumentedBasket(Basket):
+    """
+    Корзина с измерением операций.
+
+    Изменяющие операции, итоги и расчёт стоимости (total_price, total_weight,
+    get_price, get_shipping_cost) передают в приёмник длительность и
+    результат: успех или причину отказа (MAX_ITEMS, MAX_WEIGHT, некорректный
+    тип, отсутствие товара, прочие исключения). Приёмник можно подключить и
+    отключить в любой момент через атрибут ``sink``; без приёмника
+    (``sink=None``) операции выполняются без измерений.
+    """
+
+    def __init__(
+        self,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+        sink: MetricsSink | None = None,
+    ) -> None:
+        """
+        Инициализация корзины.
+
+        :param verify: Режим сверки накопленных итогов после каждого изменения
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+        :param sink: Приёмник измерений; None — измерения отключены
+        """
+        super().__init__(verify, shipping_policy)
+        self.sink = sink
+
+    def _observe(self, operation: str, method: Callable, *args: object) -> object:
+        """
+        Выполняет операцию и передаёт её длительность и результат в приёмник.
+
+        :param operation: Название операции
+        :param method: Реализация операции
+        :param args: Аргументы операции
+        :return: Результат операции
+        """
+        sink = self.sink
+        if sink is None:
+            return method(*args)
+        started = perf_counter()
+        try:
+            result = method(*args)
+        except Exception as error:
+            sink.record(operation, _reason(error), perf_counter() - started)
+            raise
+        sink.record(operation, OUTCOME_OK, perf_counter() - started)
+        return result
+
+    def add_product(self, product: Product, quantity: int = 1) -> None:
+        """Добавляет товар в корзину (см. Basket.add_product)."""
+        self._observe("add_product", super().add_product, product, quantity)
+
+    def add_many(self, lines: Iterable[tuple[Product, int]]) -> None:
+        """Добавляет в корзину пакет строк атомарно (см. Basket.add_many)."""
+        self._observe("add_many", super().add_many, lines)
+
+    def delete_product(self, product_id: int) -> None:
+        """Удаляет товар из корзины целиком (см. Basket.delete_product)."""
+        self._observe("delete_product", super().delete_product, product_id)
+
+    def set_quantity(self, product_id: int, quantity: int) -> None:
+        """Устанавливает количество товара (см. Basket.set_quantity)."""
+        self._observe("set_quantity", super().set_quantity, product_id, quantity)
+
+    def replace_product(self, product: Product, quantity: int) -> None:
+        """Заменяет товар строки новой версией (см. Basket.replace_product)."""
+        self._observe("replace_product", super().replace_product, product, quantity)
+
+    def decrement(self, product_id: int, quantity: int = 1) -> None:
+        """Уменьшает количество товара в корзине (см. Basket.decrement)."""
+        self._observe("decrement", super().decrement, product_id, quantity)
+
+    def _check_limits(self, quantity: int, weight: int) -> None:
+        """Проверяет лимиты корзины, отмечая в исключении превышенный лимит."""
+        try:
+            super()._check_limits(quantity, weight)
+        except ValueError as error:
+            over_items = self._count + quantity > self.MAX_ITEMS
+            error.reason = (  # type: ignore[attr-defined]
+                REASON_MAX_ITEMS if over_items else REASON_MAX_WEIGHT
+            )
+            raise
+
+    @property
+    def total_price(self) -> int:
+        """Возвращает общую стоимость товаров в корзине."""
+        return self._observe(  # type: ignore[return-value]
+            "total_price", _total_price, self
+        )
+
+    @property
+    def total_weight(self) -> int:
+        """Возвращает общий вес товаров в корзине."""
+        return self._observe(  # type: ignore[return-value]
+            "total_weight", _total_weight, self
+        )
+
+    @property
+    def get_shipping_cost(self) -> int:
+        """Возвращает стоимость доставки в зависимости от общей стоимости товаров."""
+        return self._observe(  # type: ignore[return-value]
+            "get_shipping_cost", _get_shipping_cost, self
+        )
+
+    @property
+    def get_price(self) -> int:
+        """Возвращает итоговую стоимость корзины с учетом доставки."""
+        return self._observe(  # type: ignore[return-value]
+            "get_price", _get_price, self
+        )
@@ -0,0 +1,193 @@
+import os
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from basket_batch import BasketBatch
+from product_basket import Basket, Product, ShippingPolicy
+from product_catalog import ProductCatalog
+from product_ids import IdAllocator
+
+# Состояние процесса-воркера, устанавливается в _init_worker
+_worker_state: tuple[ProductCatalog, type[Basket], ShippingPolicy | None] | None = None
+
+
+class _NoIdSource:
+    """
+    Источник идентификаторов воркера пересчёта, запрещающий их выдачу.
+
+    Воркер получает только идентификаторы товаров из родительского процесса
+    и не создаёт Product; при запуске через fork счётчик идентификаторов
+    скопирован из родителя, и новые товары получили бы уже занятые номера.
+    """
+
+    def reserve(self, count: int) -> range:
+        """
+        Запрещает выдачу идентификаторов.
+
+        :raises RuntimeError: всегда
+        """
+        raise RuntimeError("Воркер пересчёта корзин не должен создавать товары")
+
+
+def encode_chunk(baskets: Iterable[Basket]) -> bytes:
+    """
+    Кодирует корзины в компактное колоночное представление.
+
+    Строки корзин записываются тремя массивами ``array('q')`` (границы корзин,
+    идентификаторы и количества товаров, как в BasketBatch) без объектов Product.
+
+    :param baskets: Корзины
+    :return: Данные пачки корзин
+    """
+    offsets = array("q", [0])
+    product_ids = array("q")
+    quantities = array("q")
+    for basket in baskets:
+        for product, quantity in basket.lines():
+            product_ids.append(product.id)
+            quantities.append(quantity)
+        offsets.append(len(product_ids))
+    header = array("q", [len(offsets), len(product_ids)])
+    return b"".join(
+        column.tobytes() for column in (header, offsets, product_ids, quantities)
+    )
+
+
+def decode_chunk(data: bytes) -> tuple[array, array, array]:
+    """
+    Декодирует пачку корзин, закодированную encode_chunk.
+
+    :param data: Данные пачки корзин
+    :return: Границы корзин, идентификаторы и количества товаров
+    """
+    columns = array("q")
+    columns.frombytes(data)
+    offsets_size, lines = columns[0], columns[1]
+    start = 2 + offsets_size
+    return (
+        columns[2:start],
+        columns[start : start + lines],
+        columns[start + lines : start + 2 * lines],
+    )
+
+
+def _price_chunk(
+    data: bytes,
+    catalog: ProductCatalog,
+    basket_cls: type[Basket],
+    shipping_policy: ShippingPolicy | None,
+) -> array:
+    """
+    Считает итоговые стоимости корзин пачки по ценам каталога.
+
+    :param data: Данные пачки корзин
+    :param catalog: Каталог с актуальными ценами и весами
+    :param basket_cls: Класс корзины, задающий тарифы доставки
+    :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+    :return: Итоговые стоимости корзин в порядке пачки
+    """
+    batch = BasketBatch(*decode_chunk(data), catalog)
+    return array("q", batch.evaluate(basket_cls, shipping_policy).price)
+
+
+def _init_worker(
+    catalog: ProductCatalog,
+    basket_cls: type[Basket],
+    shipping_policy: ShippingPolicy | None,
+) -> None:
+    """Запоминает каталог и параметры пересчёта в процессе-воркере."""
+    global _worker_state
+    _worker_state = (catalog, basket_cls, shipping_policy)
+    Product.use_id_allocator(IdAllocator(_NoIdSource()))
+
+
+def _reprice_in_worker(data: bytes) -> bytes:
+    """
+    Пересчитывает пачку корзин в процессе-воркере.
+
+    :param data: Данные пачки корзин
+    :return: Итоговые стоимости корзин (``array('q')`` в виде байтов)
+    """
+    assert _worker_state is not None, "Воркер не инициализирован"
+    return _price_chunk(data, *_worker_state).tobytes()
+
+
+def reprice_all(
+    baskets: Iterable[Basket],
+    catalog: ProductCatalog,
+    workers: int | None = None,
+    chunk_size: int = 2000,
+    basket_cls: type[Basket] = Basket,
+    shipping_policy: ShippingPolicy | None = None,
+) -> Iterator[int]:
+    """
+    Пересчитывает итоговую стоимость корзин по актуальным ценам каталога.
+
+    Корзины разбиваются на пачки по ``chunk_size``, каждая пачка кодируется
+    колонками идентификаторов и количеств (encode_chunk) и считается в пуле
+    процессов через BasketBatch. Каталог передаётся в каждый воркер один раз
+    при запуске. Результаты отдаются по мере готовности в порядке корзин;
+    в работе одновременно не больше двух пачек на воркер, поэтому память
+    не зависит от количества корзин.
+
+    :param baskets: Корзины (итерируются один раз)
+    :param catalog: Каталог с актуальными ценами и весами товаров
+    :param workers: Количество процессов; 1 — расчёт в текущем процессе,
+        None — по числу ядер процессора
+    :param chunk_size: Количество корзин в одной пачке
+    :param basket_cls: Класс корзины, задающий тарифы доставки
+    :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+    :return: Итоговые стоимости корзин с доставкой в порядке ``baskets``
+    :raises KeyError: если какого-либо товара корзины нет в каталоге
+    :raises ValueError: если количество процессов или размер пачки меньше 1
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Количество процессов должно быть не меньше 1")
+    if chunk_size < 1:
+        raise ValueError("Размер пачки корзин должен быть не меньше 1")
+
+    iterator = iter(baskets)
+    chunks = iter(lambda: encode_chunk(islice(iterator, chunk_size)), None)
+    return _reprice_chunks(chunks, catalog, workers, basket_cls, shipping_policy)
+
+
+def _reprice_chunks(
+    chunks: Iterator[bytes],
+    catalog: ProductCatalog,
+    workers: int,
+    basket_cls: type[Basket],
+    shipping_policy: ShippingPolicy | None,
+) -> Iterator[int]:
+    """Генератор результатов reprice_all (параметры проверены вызывающим)."""
+    empty = encode_chunk(())
+    if workers == 1:
+        for data in chunks:
+            if data == empty:
+                return
+            yield from _price_chunk(data, catalog, basket_cls, shipping_policy)
+        return
+
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(catalog, basket_cls, shipping_policy),
+    ) as executor:
+        pending: deque[Future[bytes]] = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                data = next(chunks)
+                if data == empty:
+                    exhausted = True
+                else:
+                    pending.append(executor.submit(_reprice_in_worker, data))
+            if not pending:
+                return
+            prices = array("q")
+            prices.frombytes(pending.popleft().result())
+            yield from prices
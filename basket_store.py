@@ -0,0 +1,366 @@
+import mmap
+import os
+import struct
+from typing import Iterator, MutableMapping, Self
+
+from product_basket import Basket, Product, ShippingPolicy
+
+STORE_FORMAT_MAGIC = b"PBST"
+STORE_FORMAT_VERSION = 1
+# Заголовок файла: сигнатура, версия формата, резерв
+_FILE_HEADER = struct.Struct("<4sHH")
+# Заголовок записи: идентификатор корзины, размер данных корзины (0 — запись
+# об удалении), количество единиц товара, общая стоимость и общий вес
+_RECORD = struct.Struct("<qIIqq")
+
+
+class StoredBasket(Basket):
+    """
+    Корзина, загруженная из BasketStore.
+
+    Итоги (total_items, total_price, total_weight, get_price и т.д.) берутся
+    из заголовка записи; строки корзины и объекты Product создаются только
+    при первом обращении к содержимому. Лимиты корзины проверялись при
+    сохранении, поэтому при разборе строк не проверяются повторно.
+    """
+
+    _lines: MutableMapping[int, tuple[Product, int]]  # Разобранные строки корзины
+
+    def __init__(
+        self,
+        payload: bytes,
+        totals: tuple[int, int, int],
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> None:
+        """
+        Инициализация корзины.
+
+        :param payload: Данные корзины в формате Basket.to_bytes
+        :param totals: Общее количество, общая стоимость и общий вес товаров
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+        """
+        super().__init__(shipping_policy=shipping_policy)
+        self._payload: bytes | None = payload
+        self._count, self._total_price, self._total_weight = totals
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: bytes | bytearray | memoryview | mmap.mmap,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> Self:
+        """
+        Восстанавливает корзину из данных to_bytes (см. Basket.from_buffer).
+
+        Итоги считаются по строкам, поэтому корзина создаётся уже разобранной.
+        """
+        products, count, total_price, total_weight = cls._read_lines(buffer)
+        basket = cls(b"", (0, 0, 0), shipping_policy)
+        basket._check_limits(count, total_weight)
+        basket._products = products
+        basket._payload = None
+        basket._count = count
+        basket._total_price = total_price
+        basket._total_weight = total_weight
+        basket._verify = verify
+
+        if verify:
+            basket.verify_totals()
+        return basket
+
+    @property
+    def _products(self) -> MutableMapping[int, tuple[Product, int]]:
+        """Строки корзины; при первом обращении разбираются из данных записи."""
+        if self._payload is not None:
+            self._lines = self._read_lines(self._payload)[0]
+            self._payload = None
+        return self._lines
+
+    @_products.setter
+    def _products(self, products: MutableMapping[int, tuple[Product, int]]) -> None:
+        self._lines = products
+
+    @property
+    def is_hydrated(self) -> bool:
+        """Возвращает True, если строки корзины уже разобраны."""
+        return self._payload is None
+
+
+class BasketStore:
+    """
+    Хранилище корзин в файле, отображённом в память (mmap).
+
+    Корзины записываются в конец файла в формате Basket.to_bytes вместе с
+    итогами; индекс в памяти хранит только смещение последней записи каждой
+    корзины. Перезаписанные и удалённые записи остаются в файле как мусор,
+    пока его доля не превысит ``compact_ratio`` — тогда файл переписывается
+    только с актуальными записями (уплотнение).
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        compact_ratio: float = 0.5,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> None:
+        """
+        Открывает хранилище, создавая файл при необходимости.
+
+        Обрезанная последняя запись (например, после сбоя во время записи)
+        отбрасывается.
+
+        :param path: Путь к файлу хранилища
+        :param compact_ratio: Доля мусора в файле, при превышении которой
+            выполняется уплотнение
+        :param shipping_policy: Тарифы доставки для загружаемых корзин и
+            расчёта итоговых стоимостей; по умолчанию Basket.SHIPPING_POLICY
+        :raises ValueError: если доля мусора вне (0, 1] или файл имеет
+            неизвестный формат
+        """
+        if not 0 < compact_ratio <= 1:
+            raise ValueError(
+                "Доля мусора для уплотнения должна быть в диапазоне (0, 1]"
+            )
+
+        self._path = os.fspath(path)
+        self._compact_ratio = compact_ratio
+        self._shipping_policy = shipping_policy or Basket.SHIPPING_POLICY
+        self._index: dict[int, int] = {}  # Смещение записи по идентификатору корзины
+        self._garbage = 0  # Размер неактуальных записей, байт
+        # Счётчик уплотнений, по нему сканирование обнаруживает перестроение файла
+        self._generation = 0
+        self._open()
+
+    def _open(self) -> None:
+        """Открывает файл хранилища и строит индекс по записям."""
+        if not os.path.exists(self._path) or not os.path.getsize(self._path):
+            with open(self._path, "wb") as file:
+                file.write(
+                    _FILE_HEADER.pack(STORE_FORMAT_MAGIC, STORE_FORMAT_VERSION, 0)
+                )
+
+        self._file = open(self._path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _ = _FILE_HEADER.unpack_from(self._map)
+        except struct.error:
+            magic, version = None, None
+        if magic != STORE_FORMAT_MAGIC or version != STORE_FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Неизвестный формат файла хранилища корзин: {self._path}")
+
+        index = self._index
+        index.clear()
+        self._garbage = 0
+        offset = _FILE_HEADER.size
+        size = self._size = len(self._map)
+        while offset + _RECORD.size <= size:
+            cart_id, payload_size = _RECORD.unpack_from(self._map, offset)[:2]
+            end = offset + _RECORD.size + payload_size
+            if end > size:
+                break
+            previous = index.pop(cart_id, None)
+            if previous is not None:
+                self._garbage += self._record_size(previous)
+            if payload_size:
+                index[cart_id] = offset
+            else:
+                self._garbage += end - offset
+            offset = end
+
+        if offset != size:
+            self._map.close()
+            self._file.truncate(offset)
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._file.seek(offset)
+        self._size = offset
+
+    def _remap(self) -> None:
+        """Отображает в память записи, дописанные после последнего отображения."""
+        if len(self._map) < self._size:
+            self._file.flush()
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _record_size(self, offset: int) -> int:
+        """
+        Возвращает полный размер записи.
+
+        :param offset: Смещение записи в файле
+        """
+        self._remap()
+        return _RECORD.size + _RECORD.unpack_from(self._map, offset)[1]
+
+    def _append(
+        self, cart_id: int, payload: bytes, totals: tuple[int, int, int]
+    ) -> int:
+        """
+        Дописывает запись в конец файла.
+
+        :param cart_id: Идентификатор корзины
+        :param payload: Данные корзины (пустые — запись об удалении)
+        :param totals: Общее количество, общая стоимость и общий вес товаров
+        :return: Смещение записи
+        """
+        offset = self._size
+        self._file.write(_RECORD.pack(cart_id, len(payload), *totals))
+        self._file.write(payload)
+        self._size += _RECORD.size + len(payload)
+        return offset
+
+    def put(self, cart_id: int, basket: Basket) -> None:
+        """
+        Сохраняет корзину, заменяя предыдущую версию с тем же идентификатором.
+
+        :param cart_id: Идентификатор корзины
+        :param basket: Корзина
+        """
+        previous = self._index.get(cart_id)
+        if previous is not None:
+            self._garbage += self._record_size(previous)
+        self._index[cart_id] = self._append(
+            cart_id,
+            basket.to_bytes(),
+            (basket.total_items, basket.total_price, basket.total_weight),
+        )
+        self._maybe_compact()
+
+    def delete(self, cart_id: int) -> None:
+        """
+        Удаляет корзину из хранилища.
+
+        :param cart_id: Идентификатор корзины
+        :raises KeyError: если корзины нет в хранилище
+        """
+        previous = self._index.pop(cart_id, None)
+        if previous is None:
+            raise KeyError(
+                f"Корзина с идентификатором {cart_id} отсутствует в хранилище"
+            )
+
+        self._garbage += self._record_size(previous) + _RECORD.size
+        self._append(cart_id, b"", (0, 0, 0))
+        self._maybe_compact()
+
+    def get(self, cart_id: int) -> StoredBasket:
+        """
+        Возвращает корзину с ленивым разбором строк.
+
+        :param cart_id: Идентификатор корзины
+        :return: Корзина; итоги доступны сразу, строки разбираются при
+            первом обращении
+        :raises KeyError: если корзины нет в хранилище
+        """
+        offset = self._index.get(cart_id)
+        if offset is None:
+            raise KeyError(
+                f"Корзина с идентификатором {cart_id} отсутствует в хранилище"
+            )
+
+        self._remap()
+        _, payload_size, *totals = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size
+        return StoredBasket(
+            self._map[start : start + payload_size],
+            tuple(totals),  # type: ignore[arg-type]
+            self._shipping_policy,
+        )
+
+    def iter_prices(self) -> Iterator[tuple[int, int]]:
+        """
+        Перебирает итоговые стоимости всех корзин (с учётом доставки).
+
+        Читает только заголовки записей, последовательно по файлу, без
+        создания корзин и товаров; память не зависит от размера хранилища.
+
+        :return: Пары (идентификатор корзины, итоговая стоимость) в порядке
+            записей в файле
+        :raises RuntimeError: если хранилище уплотнилось во время перебора
+        """
+        generation = self._generation
+        cost = self._shipping_policy.cost
+        index = self._index
+        record_size = _RECORD.size
+        self._remap()
+        offset = _FILE_HEADER.size
+        end = self._size
+        while offset < end:
+            if self._generation != generation:
+                raise RuntimeError("Хранилище уплотнилось во время перебора")
+            cart_id, payload_size, _, total_price, _ = _RECORD.unpack_from(
+                self._map, offset
+            )
+            if payload_size and index.get(cart_id) == offset:
+                yield cart_id, total_price + cost(total_price)
+            offset += record_size + payload_size
+
+    def sum_prices(self) -> int:
+        """Возвращает сумму итоговых стоимостей всех корзин хранилища."""
+        return sum(price for _, price in self.iter_prices())
+
+    def compact(self) -> None:
+        """Переписывает файл хранилища, оставляя только актуальные записи."""
+        self._remap()
+        temporary = self._path + ".compact"
+        index: dict[int, int] = {}
+        with open(temporary, "wb") as file:
+            file.write(_FILE_HEADER.pack(STORE_FORMAT_MAGIC, STORE_FORMAT_VERSION, 0))
+            offset = _FILE_HEADER.size
+            for cart_id, old_offset in self._index.items():
+                end = old_offset + self._record_size(old_offset)
+                file.write(self._map[old_offset:end])
+                index[cart_id] = offset
+                offset += end - old_offset
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.close()
+        os.replace(temporary, self._path)
+        self._file = open(self._path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._file.seek(offset)
+        self._size = offset
+        self._index = index
+        self._garbage = 0
+        self._generation += 1
+
+    def _maybe_compact(self) -> None:
+        """Уплотняет хранилище, если доля мусора превысила compact_ratio."""
+        if self._garbage > self._compact_ratio * self._size:
+            self.compact()
+
+    @property
+    def garbage_ratio(self) -> float:
+        """Возвращает долю неактуальных записей в файле хранилища."""
+        return self._garbage / self._size
+
+    def flush(self) -> None:
+        """Сбрасывает дописанные записи на диск."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Закрывает файл хранилища."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "BasketStore":
+        """Возвращает хранилище для использования в блоке with."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Закрывает хранилище при выходе из блока with."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Возвращает количество корзин в хранилище."""
+        return len(self._index)
+
+    def __contains__(self, cart_id: object) -> bool:
+        """Проверяет, есть ли корзина в хранилище."""
+        return cart_id in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        """Перебирает идентификаторы корзин хранилища."""
+        return iter(self._index)
@@ -0,0 +1,52 @@
+"""
+Бенчмарк восстановления сохранённой корзины: add_many против цикла add_product.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_add_many
+"""
+
+import timeit
+
+from product_basket import Basket, Product
+
+
+class WholesaleBasket(Basket):
+    """Оптовая корзина с увеличенными лимитами."""
+
+    MAX_ITEMS = 10_000
+    MAX_WEIGHT = 1_000_000
+
+
+def restore_with_add_product(lines: list[tuple[Product, int]]) -> Basket:
+    """Восстанавливает корзину построчными вызовами add_product."""
+    basket = WholesaleBasket()
+    for product, quantity in lines:
+        basket.add_product(product, quantity)
+    return basket
+
+
+def restore_with_add_many(lines: list[tuple[Product, int]]) -> Basket:
+    """Восстанавливает корзину одним вызовом add_many."""
+    basket = WholesaleBasket()
+    basket.add_many(lines)
+    return basket
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает время восстановления одной корзины."""
+    print(f"{'Строк':>8}{'add_product, мкс':>20}{'add_many, мкс':>18}")
+    for size in (30, 3000):
+        lines = [(Product(f"Товар {i}", i % 500 + 1, 1), 1) for i in range(size)]
+        number = max(1, 30_000 // size)
+        timings = []
+        for restore in (restore_with_add_product, restore_with_add_many):
+            elapsed = min(
+                timeit.repeat(lambda: restore(lines), number=number, repeat=5)
+            )
+            timings.append(elapsed / number * 1e6)
+        print(f"{size:>8}{timings[0]:>20.1f}{timings[1]:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Бенчмарк задержек и пропускной способности AsyncBasketService.
+
+Поток запросов на добавление товаров в множество корзин проходит через
+ProductLoader и FakeBackend с задержкой; сравниваются пакетирование
+запросов и загрузка по одному товару.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_async_basket_service [количество_запросов]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from async_basket_service import (
+    AsyncBasketService,
+    ConnectionPool,
+    FakeBackend,
+    ProductLoader,
+)
+from product_basket import Product
+
+DEFAULT_REQUESTS = 20_000
+CONCURRENCY = 500  # Одновременно обрабатываемых запросов
+CARTS = 5_000
+LATENCY = 0.002
+JITTER = 0.001
+POOL_SIZE = 10
+
+
+async def run(requests: int, max_batch_size: int, products: list[Product]) -> None:
+    """
+    Выполняет прогон и печатает p50/p99 задержки и запросов в секунду.
+
+    :param requests: Количество запросов на добавление
+    :param max_batch_size: Максимальный размер пачки загрузчика
+    :param products: Товары бэкенда
+    """
+    backend = FakeBackend.from_products(
+        products, latency=LATENCY, jitter=JITTER, seed=1
+    )
+    loader = ProductLoader(ConnectionPool(backend, POOL_SIZE), max_batch_size)
+    service = AsyncBasketService(loader)
+    rng = random.Random(42)
+    plan = [(rng.randrange(CARTS), rng.choice(products).id) for _ in range(requests)]
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def request(cart_id: int, product_id: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await service.add_product(cart_id, product_id)
+            except ValueError:
+                pass  # Корзина заполнена — отказ тоже является ответом
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(cart_id, pid) for cart_id, pid in plan))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    p50, p99 = quantiles[49] * 1000, quantiles[98] * 1000
+    print(
+        f"{max_batch_size:>10}{p50:>10.2f}{p99:>10.2f}"
+        f"{requests / elapsed:>14,.0f}{backend.requests:>14,}"
+    )
+
+
+def main() -> None:
+    """Запускает прогоны с пакетированием и без него."""
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    products = [Product(f"Товар {i}", i % 900 + 1, 1) for i in range(2_000)]
+    print(
+        f"{'пачка':>10}{'p50, мс':>10}{'p99, мс':>10}"
+        f"{'запросов/с':>14}{'к бэкенду':>14}"
+    )
+    for max_batch_size in (1, 100):
+        asyncio.run(run(requests, max_batch_size, products))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Бенчмарк пакетного расчёта корзин BasketBatch против поштучного Basket.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_batch [количество_корзин]
+"""
+
+import random
+import sys
+import time
+from array import array
+
+from basket_batch import BasketBatch
+from product_basket import Basket
+from product_catalog import ProductCatalog
+
+DEFAULT_BASKETS = 200_000
+CATALOG_SIZE = 10_000
+
+
+def main() -> None:
+    """Строит случайные корзины в колоночном виде и сравнивает время расчёта."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BASKETS
+    rng = random.Random(42)
+    catalog = ProductCatalog()
+    ids = [
+        catalog.add(f"Товар {i}", rng.randint(1, 800), 1) for i in range(CATALOG_SIZE)
+    ]
+
+    offsets = array("q", [0])
+    product_ids = array("q")
+    quantities = array("q")
+    for _ in range(count):
+        for product_id in rng.sample(ids, rng.randint(0, 6)):
+            product_ids.append(product_id)
+            quantities.append(rng.randint(1, 4))
+        offsets.append(len(product_ids))
+
+    started = time.perf_counter()
+    products = {product_id: catalog.product(product_id) for product_id in ids}
+    scalar = []
+    for i in range(count):
+        basket = Basket()
+        for j in range(offsets[i], offsets[i + 1]):
+            basket.add_product(products[product_ids[j]], quantities[j])
+        scalar.append(basket.get_price)
+    scalar_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = BasketBatch(offsets, product_ids, quantities, catalog).evaluate()
+    batch_elapsed = time.perf_counter() - started
+
+    assert result.price == scalar, "Результаты пакета расходятся с Basket"
+    print(f"Корзин: {count:,}, строк: {len(product_ids):,}")
+    for title, elapsed in (
+        ("Basket поштучно", scalar_elapsed),
+        ("BasketBatch", batch_elapsed),
+    ):
+        print(f"{title:<17}{elapsed:8.3f} с ({count / elapsed:,.0f} корзин/с)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Бенчмарк подбора добавок Basket.suggest_fill по каталогу ProductCatalog.
+
+Для случайных корзин измеряется время подбора минимальной добавки до более
+дешёвого тарифа доставки (next_tier) и добавки максимальной стоимости
+(max_price), а также доля точных решений в режиме с бюджетом времени.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_fill [количество_товаров]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from product_basket import Basket, Product
+from product_catalog import ProductCatalog
+
+DEFAULT_SIZE = 100_000
+BASKETS = 50
+TIME_BUDGET = 0.005
+
+
+def main() -> None:
+    """Заполняет каталог и печатает время подбора."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    rng = random.Random(7)
+    catalog = ProductCatalog()
+    for i in range(size):
+        catalog.add(f"Товар {i}", rng.randint(1, 5000), rng.randint(1, 100))
+
+    baskets = []
+    for _ in range(BASKETS):
+        basket = Basket()
+        basket.add_product(
+            Product("Товар корзины", rng.randint(1, 999), rng.randint(1, 50))
+        )
+        baskets.append(basket)
+
+    print(f"Каталог: {size:,} товаров, корзин: {BASKETS}")
+    print(f"{'Режим':<28}{'p50, мс':>10}{'макс., мс':>12}{'точных':>9}")
+    modes = [
+        ("next_tier", "next_tier", None),
+        (f"next_tier, бюджет {TIME_BUDGET * 1000:g} мс", "next_tier", TIME_BUDGET),
+        ("max_price", "max_price", None),
+    ]
+    for title, objective, budget in modes:
+        timings = []
+        optimal = 0
+        for basket in baskets:
+            started = time.perf_counter()
+            suggestion = basket.suggest_fill(catalog, objective, budget)
+            timings.append((time.perf_counter() - started) * 1000)
+            optimal += suggestion.optimal
+        print(
+            f"{title:<28}{statistics.median(timings):>10.2f}"
+            f"{max(timings):>12.2f}{optimal:>6}/{BASKETS}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Бенчмарк скорости дифференциального фаззинга корзин (basket_fuzz).
+
+Для каждой реализации корзины выводится количество последовательностей
+операций, сверяемых с эталоном в секунду.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_fuzz [количество_последовательностей]
+"""
+
+import sys
+import time
+
+from basket_fuzz import fuzz
+from basket_index import BasketIndex
+from concurrent_basket import ConcurrentBasket
+from persistent_basket import PersistentBasket
+from product_basket import Basket
+
+DEFAULT_SEQUENCES = 2_000
+LENGTH = 20
+
+
+def main() -> None:
+    """Прогоняет фаззинг каждой реализации и выводит пропускную способность."""
+    sequences = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SEQUENCES
+    print(f"Последовательностей: {sequences:,} по {LENGTH} операций")
+    for title, factory in (
+        ("Basket", Basket),
+        ("ConcurrentBasket", ConcurrentBasket),
+        ("PersistentBasket", PersistentBasket),
+        ("IndexedBasket", lambda: BasketIndex().create(1)),
+    ):
+        started = time.perf_counter()
+        failure = fuzz(factory, sequences, LENGTH)
+        elapsed = time.perf_counter() - started
+
+        assert failure is None, f"{title} расходится с эталоном:\n{failure.repro()}"
+        print(f"{title:<18}{sequences / elapsed:>10,.0f} последовательностей/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Бенчмарк обратного индекса BasketIndex: изменение цены товара в 1 000 000 корзин.
+
+Сравниваются наполнение корзин с индексом и без него, а также изменение
+цены популярного и редкого товара через reprice() против сканирования
+всех корзин с пересборкой затронутых.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_index [количество_корзин]
+"""
+
+import random
+import sys
+import time
+from itertools import accumulate
+
+from basket_index import BasketIndex
+from product_basket import Basket, Product
+
+DEFAULT_BASKETS = 1_000_000
+CATALOG_SIZE = 10_000
+
+
+def main() -> None:
+    """Наполняет корзины случайными товарами и изменяет цены товаров."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BASKETS
+    rng = random.Random(42)
+    products = [
+        Product(f"Товар {i}", rng.randint(1, 800), 1) for i in range(CATALOG_SIZE)
+    ]
+    # Популярность товаров по закону Ципфа: первые товары лежат в большинстве корзин
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(CATALOG_SIZE)))
+    contents = [
+        set(rng.choices(products, cum_weights=cum_weights, k=rng.randint(1, 6)))
+        for _ in range(count)
+    ]
+
+    started = time.perf_counter()
+    plain = []
+    for lines in contents:
+        basket = Basket()
+        for product in lines:
+            basket.add_product(product)
+        plain.append(basket)
+    plain_elapsed = time.perf_counter() - started
+
+    index = BasketIndex()
+    started = time.perf_counter()
+    for basket_id, lines in enumerate(contents):
+        basket = index.create(basket_id)
+        for product in lines:
+            basket.add_product(product)
+    indexed_elapsed = time.perf_counter() - started
+
+    print(f"Корзин: {count:,}")
+    print(f"Наполнение Basket      {plain_elapsed:8.3f} с")
+    print(f"Наполнение с индексом  {indexed_elapsed:8.3f} с")
+
+    for title, product in (("популярный", products[0]), ("редкий", products[-1])):
+        new_price = product.price + 1
+        started = time.perf_counter()
+        affected = 0
+        for i, basket in enumerate(plain):
+            quantity = basket.quantity_of(product.id)
+            if quantity:
+                # Product неизменяем: корзина пересобирается с новой версией товара
+                rebuilt = Basket()
+                rebuilt.add_many(
+                    (
+                        (
+                            Product(line.name, new_price, line.weight)
+                            if line.id == product.id
+                            else line
+                        ),
+                        line_quantity,
+                    )
+                    for line, line_quantity in basket.lines()
+                )
+                plain[i] = rebuilt
+                affected += 1
+        scan_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        updated = index.reprice(product.id, new_price)
+        reprice_elapsed = time.perf_counter() - started
+
+        assert updated == affected, "reprice() должен затронуть те же корзины"
+        print(
+            f"Товар {title:<10} корзин с товаром {affected:>9,}: "
+            f"сканирование {scan_elapsed:7.3f} с, reprice() {reprice_elapsed:7.4f} с "
+            f"({reprice_elapsed / max(updated, 1) * 1e9:,.0f} нс на корзину)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Бенчмарк накладных расходов измерений InstrumentedBasket.
+
+Один цикл — add_product, get_price, get_shipping_cost и delete_product.
+Сравниваются Basket, InstrumentedBasket с отключёнными измерениями
+(``sink=None``) и с приёмниками InMemorySink и CallbackSink.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_metrics
+"""
+
+import timeit
+from typing import Callable
+
+from basket_metrics import CallbackSink, InMemorySink, InstrumentedBasket
+from product_basket import Basket, Product
+
+N_CYCLES = 200_000
+REPEAT = 5
+
+
+def cycle_ns(basket: Basket) -> float:
+    """
+    Измеряет время одного цикла операций над корзиной.
+
+    :param basket: Корзина
+    :return: Лучшее из REPEAT повторов время цикла в наносекундах
+    """
+    product = Product("Чайник", 300, 3)
+    basket.add_product(Product("Тостер", 400, 4))
+
+    def cycle() -> None:
+        basket.add_product(product)
+        basket.get_price
+        basket.get_shipping_cost
+        basket.delete_product(product.id)
+
+    return min(timeit.repeat(cycle, number=N_CYCLES, repeat=REPEAT)) / N_CYCLES * 1e9
+
+
+def main() -> None:
+    """Выводит время цикла и накладные расходы относительно Basket."""
+    variants: list[tuple[str, Callable[[], Basket]]] = [
+        ("Basket", Basket),
+        ("InstrumentedBasket, sink=None", InstrumentedBasket),
+        ("InMemorySink", lambda: InstrumentedBasket(sink=InMemorySink())),
+        (
+            "CallbackSink (пустая функция)",
+            lambda: InstrumentedBasket(sink=CallbackSink(lambda *_: None)),
+        ),
+    ]
+    baseline = None
+    for title, factory in variants:
+        elapsed = cycle_ns(factory())
+        baseline = baseline or elapsed
+        print(f"{title:<32}{elapsed:8.0f} нс/цикл ({elapsed / baseline - 1:+7.1%})")
+
+
+if __name__ == "__main__":
+    main()
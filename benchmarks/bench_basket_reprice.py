@@ -0,0 +1,65 @@
+"""
+Бенчмарк параллельного пересчёта корзин reprice_all: масштабирование по ядрам.
+
+Для каждого количества процессов от 1 до числа ядер выводится пропускная
+способность, ускорение относительно одного процесса и эффективность
+(ускорение, делённое на количество процессов).
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_reprice [количество_корзин] [процессов]
+"""
+
+import os
+import random
+import sys
+import time
+
+from basket_reprice import reprice_all
+from product_basket import Basket
+from product_catalog import ProductCatalog
+
+DEFAULT_BASKETS = 200_000
+CATALOG_SIZE = 10_000
+
+
+def main() -> None:
+    """Пересчитывает одни и те же корзины разным количеством процессов."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BASKETS
+    rng = random.Random(42)
+    catalog = ProductCatalog()
+    for i in range(CATALOG_SIZE):
+        catalog.add(f"Товар {i}", rng.randint(1, 800), 1)
+    products = [catalog.product(product_id) for product_id in catalog.columns()[0]]
+
+    baskets = []
+    for _ in range(count):
+        basket = Basket()
+        basket.add_many(
+            (product, rng.randint(1, 4))
+            for product in rng.sample(products, rng.randint(0, 6))
+        )
+        baskets.append(basket)
+
+    cores = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    print(f"Корзин: {count:,}, ядер: {os.cpu_count()}")
+    expected: list[int] | None = None
+    single = 0.0
+    for workers in range(1, cores + 1):
+        started = time.perf_counter()
+        prices = list(reprice_all(baskets, catalog, workers=workers))
+        elapsed = time.perf_counter() - started
+
+        if expected is None:
+            expected, single = prices, elapsed
+        assert prices == expected, "Результаты зависят от количества процессов"
+        speedup = single / elapsed
+        print(
+            f"процессов {workers:>3}: {elapsed:7.3f} с ({count / elapsed:>10,.0f} "
+            f"корзин/с), ускорение {speedup:5.2f}, "
+            f"эффективность {speedup / workers:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
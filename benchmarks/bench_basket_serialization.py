@@ -0,0 +1,95 @@
+"""
+Бенчмарк сериализации корзины: размер данных и скорость сохранения/загрузки.
+
+Сравниваются двоичный формат Basket.to_bytes()/Basket.from_buffer(), pickle
+прежнего представления (словарь списков с товаром на каждую единицу), pickle
+самой корзины и JSON со строками корзины.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_serialization
+"""
+
+import json
+import pickle
+import timeit
+from typing import Callable
+
+from product_basket import Basket, Product
+
+
+class WholesaleBasket(Basket):
+    """Оптовая корзина с увеличенными лимитами."""
+
+    MAX_ITEMS = 100_000
+    MAX_WEIGHT = 1_000_000
+
+
+def save_legacy_pickle(basket: Basket) -> bytes:
+    """Сохраняет корзину как pickle словаря списков (товар на каждую единицу)."""
+    return pickle.dumps(
+        {product.id: [product] * quantity for product, quantity in basket.lines()}
+    )
+
+
+def load_legacy_pickle(data: bytes) -> Basket:
+    """Загружает корзину из pickle словаря списков."""
+    basket = WholesaleBasket()
+    basket.add_many((units[0], len(units)) for units in pickle.loads(data).values())
+    return basket
+
+
+def save_json(basket: Basket) -> bytes:
+    """Сохраняет строки корзины в JSON."""
+    return json.dumps(
+        [
+            [product.id, product.name, product.price, product.weight, quantity]
+            for product, quantity in basket.lines()
+        ],
+        ensure_ascii=False,
+    ).encode()
+
+
+def load_json(data: bytes) -> Basket:
+    """Загружает корзину из JSON."""
+    basket = WholesaleBasket()
+    basket.add_many(
+        (Product._from_trusted(product_id, name, price, weight), quantity)
+        for product_id, name, price, weight, quantity in json.loads(data)
+    )
+    return basket
+
+
+FORMATS: dict[str, tuple[Callable[[Basket], bytes], Callable[[bytes], Basket]]] = {
+    "to_bytes": (Basket.to_bytes, WholesaleBasket.from_buffer),
+    "pickle (единицы)": (save_legacy_pickle, load_legacy_pickle),
+    "pickle (Basket)": (pickle.dumps, pickle.loads),
+    "JSON": (save_json, load_json),
+}
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает таблицу для корзин разного размера."""
+    for lines, quantity in ((10, 3), (3000, 10)):
+        basket = WholesaleBasket()
+        basket.add_many(
+            (Product(f"Товар {i}", i % 500 + 1, 1), quantity) for i in range(lines)
+        )
+        number = max(1, 30_000 // lines)
+        print(f"\nСтрок: {lines}, единиц товара: {basket.total_items}")
+        print(f"{'Формат':<18}{'байт':>10}{'сохранение, мкс':>18}{'загрузка, мкс':>16}")
+        for name, (save, load) in FORMATS.items():
+            data = save(basket)
+            assert load(data).get_price == basket.get_price, name
+            save_time = min(
+                timeit.repeat(lambda: save(basket), number=number, repeat=5)
+            )
+            load_time = min(timeit.repeat(lambda: load(data), number=number, repeat=5))
+            print(
+                f"{name:<18}{len(data):>10}"
+                f"{save_time / number * 1e6:>18.1f}{load_time / number * 1e6:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Бенчмарк хранилища корзин BasketStore на файле, отображённом в память.
+
+Записывает заданное количество корзин, затем измеряет случайную загрузку
+корзин через get() и потоковый расчёт итоговых стоимостей через
+iter_prices() вместе с пиковой памятью сканирования (tracemalloc).
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_basket_store [количество_корзин]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from basket_store import BasketStore
+from product_basket import Basket, Product
+
+DEFAULT_CARTS = 200_000
+RANDOM_GETS = 50_000
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает результаты."""
+    carts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CARTS
+    products = [Product(f"Товар {i}", 10 * (i + 1), 1 + i % 3) for i in range(100)]
+    rng = random.Random(0)
+    baskets = []
+    for _ in range(64):
+        basket = Basket()
+        basket.add_many((product, 1) for product in rng.sample(products, 5))
+        baskets.append(basket)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "baskets.bin")
+        with BasketStore(path) as store:
+            started = time.perf_counter()
+            for cart_id in range(carts):
+                store.put(cart_id, baskets[cart_id % len(baskets)])
+            store.flush()
+            elapsed = time.perf_counter() - started
+            print(f"Запись:      {carts / elapsed:>12,.0f} корзин/с")
+            size = os.path.getsize(path) / carts
+            print(f"Размер файла:{size:>12.1f} байт на корзину")
+
+            ids = [rng.randrange(carts) for _ in range(RANDOM_GETS)]
+            started = time.perf_counter()
+            for cart_id in ids:
+                store.get(cart_id).get_price
+            elapsed = time.perf_counter() - started
+            print(f"get():       {RANDOM_GETS / elapsed:>12,.0f} корзин/с")
+
+            started = time.perf_counter()
+            for cart_id in ids:
+                store.get(cart_id).lines()
+            elapsed = time.perf_counter() - started
+            print(f"get()+lines: {RANDOM_GETS / elapsed:>12,.0f} корзин/с")
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            total = store.sum_prices()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"Сканирование:{carts / elapsed:>12,.0f} корзин/с, сумма {total}")
+            print(f"Пиковая память сканирования: {peak / 1024:.1f} КиБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Бенчмарк потоковой загрузки корзин из выгрузки заказов.
+
+Генерирует выгрузки CSV и JSONL, прогоняет конвейер read_carts →
+summarize → write_summaries и выводит скорость в строках в секунду. Пиковая
+память конвейера измеряется для выгрузок разного размера: она не должна
+расти вместе с файлом.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_cart_io [количество_строк]
+"""
+
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from cart_io import CART_FIELDS, run_pipeline
+
+DEFAULT_ROWS = 500_000
+LINES_PER_CART = (1, 8)  # Минимум и максимум позиций в корзине
+
+
+def generate(path: str, rows: int, seed: int = 0) -> None:
+    """
+    Записывает выгрузку заказов с корзинами из подряд идущих строк.
+
+    :param path: Путь к файлу .csv или .jsonl
+    :param rows: Количество строк
+    :param seed: Зерно генератора случайных чисел
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file) if path.endswith(".csv") else None
+        if writer:
+            writer.writerow(CART_FIELDS)
+        cart = 0
+        left = 0
+        for _ in range(rows):
+            if not left:
+                cart += 1
+                left = rng.randint(*LINES_PER_CART)
+            left -= 1
+            product = rng.randrange(10_000)
+            row = (cart, product, f"Товар {product}", product % 900 + 1, 1, 1)
+            if writer:
+                writer.writerow(row)
+            else:
+                file.write(json.dumps(dict(zip(CART_FIELDS, row))) + "\n")
+
+
+def main() -> None:
+    """Выводит скорость конвейера и пиковую память для CSV и JSONL."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix in (".csv", ".jsonl"):
+            source = os.path.join(directory, f"orders{suffix}")
+            target = os.path.join(directory, f"summaries{suffix}")
+            generate(source, rows)
+            stats = run_pipeline(source, target)
+            print(f"{suffix[1:]:<6}{stats}")
+
+        for size in (rows // 10, rows):
+            source = os.path.join(directory, f"memory{size}.csv")
+            generate(source, size)
+            tracemalloc.start()
+            run_pipeline(source, os.path.join(directory, "memory.csv"))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"Пиковая память при {size:,} строк: {peak / 2**20:.1f} МиБ")
+
+
+if __name__ == "__main__":
+    main()
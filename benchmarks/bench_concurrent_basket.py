@@ -0,0 +1,84 @@
+"""
+Бенчмарк конкурентного доступа к ConcurrentBasket при 1–32 потоках.
+
+Каждый поток выполняет смесь операций над одной общей корзиной: добавление,
+уменьшение количества и чтение итоговой стоимости. После прогона проверяется,
+что лимиты не превышены, а итоги совпадают с полным пересчётом.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_concurrent_basket [операций_на_поток]
+"""
+
+import sys
+import threading
+import time
+
+from concurrent_basket import ConcurrentBasket
+from product_basket import Product
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+DEFAULT_OPERATIONS = 20_000
+
+
+class WholesaleConcurrentBasket(ConcurrentBasket):
+    """Оптовая потокобезопасная корзина с увеличенными лимитами."""
+
+    MAX_ITEMS = 1_000
+    MAX_WEIGHT = 10_000
+
+
+def run(threads: int, operations: int, products: list[Product]) -> float:
+    """
+    Выполняет прогон и возвращает пропускную способность (операций в секунду).
+
+    :param threads: Количество потоков
+    :param operations: Количество операций на поток
+    :param products: Товары
+    """
+    basket = WholesaleConcurrentBasket()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index: int) -> None:
+        product = products[index % len(products)]
+        barrier.wait()
+        for i in range(operations):
+            if i % 3 == 0:
+                try:
+                    basket.add_product(product, 2)
+                except ValueError:
+                    pass
+            elif i % 3 == 1:
+                try:
+                    basket.decrement(product.id)
+                except (KeyError, ValueError):
+                    pass
+            else:
+                basket.get_price
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert basket.total_items <= basket.MAX_ITEMS, "Превышено MAX_ITEMS"
+    assert basket.total_weight <= basket.MAX_WEIGHT, "Превышено MAX_WEIGHT"
+    basket.verify_totals()
+    return threads * operations / elapsed
+
+
+def main() -> None:
+    """Запускает прогоны для разного числа потоков и печатает таблицу."""
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OPERATIONS
+    products = [Product(f"Товар {i}", 10 * (i + 1), 1 + i % 3) for i in range(64)]
+    print(f"{'Потоков':>8}{'операций/с':>16}")
+    for threads in THREAD_COUNTS:
+        print(f"{threads:>8}{run(threads, operations, products):>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Набор микробенчмарков горячих путей product_basket с проверкой регрессий.
+
+Измеряются Product.__init__, add_product при разном размере корзины и
+количестве товара, list_products, total_price, get_shipping_cost (чтение
+из кэша и пересчёт после изменения корзины), delete_product и пиковая память
+на корзину. Для операций, которые должны
+выполняться за O(1), дополнительно считается коэффициент масштабирования —
+отношение времени операции в самой большой корзине к времени в самой
+маленькой; он не зависит от скорости машины и ловит возврат квадратичного
+поведения add_product.
+
+Результаты выводятся таблицей и по ``--json`` сохраняются в JSON. С
+``--baseline`` результаты сравниваются с сохранённым прогоном: время
+операции не должно вырасти больше чем в ``1 + tolerance`` раз, а
+коэффициенты масштабирования не должны превышать SCALING_LIMITS. При
+регрессии процесс завершается с кодом 1. Абсолютное время зависит от
+машины, поэтому базовый прогон (``benchmarks/baseline_hot_paths.json``)
+обновляется через ``--json`` на той же машине, где выполняется проверка.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_hot_paths [--json результат.json]
+        [--baseline benchmarks/baseline_hot_paths.json] [--tolerance 1.0]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from itertools import cycle
+from typing import Any, Callable
+
+from product_basket import Basket, Product
+
+SIZES = (10, 100, 1_000, 10_000)  # Количество строк в корзине
+QUANTITY = 1_000  # Количество единиц товара в строке для проверки add_product
+MEMORY_BASKETS = 10_000  # Корзин для измерения памяти
+MEMORY_LINES = 5  # Строк в каждой корзине при измерении памяти
+REPEAT = 5  # Повторов измерения, берётся лучший результат
+OPERATIONS = 20_000  # Минимум операций в одном повторе
+
+# Предельные коэффициенты масштабирования: во сколько раз операция в корзине
+# из SIZES[-1] строк может быть медленнее, чем в корзине из SIZES[0] строк
+SCALING_LIMITS = {
+    "add_product": 3.0,
+    "add_product_quantity": 3.0,
+    "delete_product": 3.0,
+    "total_price": 3.0,
+    "get_shipping_cost": 3.0,
+    "get_shipping_cost_changed": 3.0,
+    "list_products": 3.0,  # На единицу товара
+}
+
+
+class UnlimitedBasket(Basket):
+    """Корзина без практических лимитов для измерений на больших размерах."""
+
+    MAX_ITEMS = sys.maxsize
+    MAX_WEIGHT = sys.maxsize
+
+
+def best_ns(func: Callable[[], object], number: int) -> float:
+    """
+    Измеряет время одного вызова функции.
+
+    :param func: Функция без аргументов
+    :param number: Количество вызовов в одном повторе
+    :return: Лучшее из REPEAT повторов время вызова в наносекундах
+    """
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number * 1e9
+
+
+def best_per_item_ns(
+    prepare: Callable[[], object], run: Callable[[Any], object], items: int
+) -> float:
+    """
+    Измеряет время обработки одного элемента операцией с подготовкой состояния.
+
+    Операция повторяется над свежими состояниями, пока в одном повторе
+    не наберётся не меньше OPERATIONS элементов.
+
+    :param prepare: Создаёт свежее состояние для операции (не измеряется)
+    :param run: Операция над состоянием
+    :param items: Количество элементов, обрабатываемых одной операцией
+    :return: Лучшее из REPEAT повторов время на элемент в наносекундах
+    """
+    rounds = max(OPERATIONS // items, 1)
+    timings = []
+    for _ in range(REPEAT):
+        states = [prepare() for _ in range(rounds)]
+        started = time.perf_counter()
+        for state in states:
+            run(state)
+        timings.append(time.perf_counter() - started)
+    return min(timings) / (items * rounds) * 1e9
+
+
+def fill(products: list[Product], quantity: int = 1) -> UnlimitedBasket:
+    """Создаёт корзину с одной строкой на каждый товар."""
+    basket = UnlimitedBasket()
+    for product in products:
+        basket.add_product(product, quantity)
+    return basket
+
+
+def delete_all(basket: UnlimitedBasket) -> None:
+    """Удаляет из корзины все строки по одной."""
+    for product, _ in basket.lines():
+        basket.delete_product(product.id)
+
+
+def changed_shipping_cost(basket: Basket, product_id: int) -> Callable[[], int]:
+    """
+    Возвращает чтение стоимости доставки после изменения корзины.
+
+    Каждый вызов меняет количество товара (1 и 2 по очереди), поэтому кэш
+    стоимости сброшен и измеряется set_quantity вместе с пересчётом доставки.
+
+    :param basket: Корзина со строкой товара
+    :param product_id: Идентификатор товара в корзине
+    """
+    quantities = cycle((2, 1))
+
+    def read() -> int:
+        basket.set_quantity(product_id, next(quantities))
+        return basket.get_shipping_cost
+
+    return read
+
+
+def bytes_per_basket() -> float:
+    """Измеряет пиковую память на одну корзину из MEMORY_LINES строк."""
+    products = [Product(f"Товар {i}", 10, 1) for i in range(MEMORY_LINES)]
+    tracemalloc.start()
+    baskets = []
+    for _ in range(MEMORY_BASKETS):
+        basket = Basket()
+        for product in products:
+            basket.add_product(product)
+        baskets.append(basket)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / len(baskets)
+
+
+def measure() -> dict[str, float]:
+    """
+    Выполняет все измерения.
+
+    :return: Метрики по имени: время в наносекундах (``*_ns``) или память
+        в байтах (``*_bytes``)
+    """
+    metrics = {"product_init_ns": best_ns(lambda: Product("Товар", 100, 1), 20_000)}
+    for size in SIZES:
+        products = [Product(f"Товар {i}", 1 + i % 500, 1) for i in range(size)]
+        basket = fill(products)
+        units = basket.total_items
+        reads = max(1_000_000 // size, 10)
+
+        metrics[f"add_product[{size}]_ns"] = best_per_item_ns(
+            lambda: None, lambda _: fill(products), size
+        )
+        metrics[f"add_product_quantity[{size}]_ns"] = best_per_item_ns(
+            lambda: None, lambda _: fill(products, QUANTITY), size
+        )
+        metrics[f"delete_product[{size}]_ns"] = best_per_item_ns(
+            lambda: fill(products), delete_all, size
+        )
+        metrics[f"list_products[{size}]_ns"] = (
+            best_ns(lambda: basket.list_products, reads) / units
+        )
+        metrics[f"total_price[{size}]_ns"] = best_ns(lambda: basket.total_price, reads)
+        metrics[f"get_shipping_cost[{size}]_ns"] = best_ns(
+            lambda: basket.get_shipping_cost, reads
+        )
+        metrics[f"get_shipping_cost_changed[{size}]_ns"] = best_ns(
+            changed_shipping_cost(basket, products[0].id), reads
+        )
+    metrics["basket_peak_bytes"] = bytes_per_basket()
+    return metrics
+
+
+def scaling(metrics: dict[str, float]) -> dict[str, float]:
+    """
+    Считает коэффициенты масштабирования операций по размеру корзины.
+
+    :param metrics: Результаты measure
+    :return: Отношение времени в корзине из SIZES[-1] строк к времени
+        в корзине из SIZES[0] строк
+    """
+    return {
+        name: metrics[f"{name}[{SIZES[-1]}]_ns"] / metrics[f"{name}[{SIZES[0]}]_ns"]
+        for name in SCALING_LIMITS
+    }
+
+
+def regressions(report: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    """
+    Находит регрессии относительно предельных коэффициентов и базового прогона.
+
+    :param report: Текущий отчёт (metrics и scaling)
+    :param baseline: Базовый отчёт того же формата или None
+    :param tolerance: Допустимый относительный рост метрики
+    :return: Описания регрессий; пустой список, если их нет
+    """
+    problems = [
+        f"{name}: коэффициент масштабирования {value:.2f} больше "
+        f"{SCALING_LIMITS[name]:.2f}"
+        for name, value in report["scaling"].items()
+        if value > SCALING_LIMITS[name]
+    ]
+    if baseline is not None:
+        for name, value in report["metrics"].items():
+            base = baseline["metrics"].get(name)
+            if base is not None and value > base * (1 + tolerance):
+                problems.append(
+                    f"{name}: {value:,.1f} против {base:,.1f} в базовом прогоне "
+                    f"(+{value / base - 1:.0%})"
+                )
+    return problems
+
+
+def main() -> None:
+    """Запускает измерения, сохраняет отчёт и проверяет регрессии."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--json", help="Путь для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="JSON базового прогона для сравнения")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.0,
+        help="Допустимый относительный рост метрики (по умолчанию 1.0)",
+    )
+    args = parser.parse_args()
+
+    metrics = measure()
+    report: dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "metrics": {name: round(value, 1) for name, value in metrics.items()},
+        "scaling": {name: round(value, 3) for name, value in scaling(metrics).items()},
+    }
+    for name, value in metrics.items():
+        print(f"{name:<32}{value:>14,.1f}")
+    for name, value in report["scaling"].items():
+        print(f"масштабирование {name:<24}{value:>6.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    problems = regressions(report, baseline, args.tolerance)
+    if problems:
+        print("Обнаружены регрессии производительности:")
+        for problem in problems:
+            print(f"- {problem}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
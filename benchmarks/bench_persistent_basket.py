@@ -0,0 +1,72 @@
+"""
+Бенчмарк снимков корзины: PersistentBasket.snapshot() против копирования Basket.
+
+Для корзин разного размера измеряется время снимка (copy.deepcopy строк
+Basket против O(1) snapshot()) и время одного изменения (add_product
+в Basket против PersistentBasket с сохранением истории для undo).
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_persistent_basket
+"""
+
+import copy
+import timeit
+
+from persistent_basket import PersistentBasket
+from product_basket import Basket, Product
+
+
+class WholesaleBasket(Basket):
+    """Оптовая корзина с увеличенными лимитами."""
+
+    MAX_ITEMS = 10**9
+    MAX_WEIGHT = 10**9
+
+
+class WholesalePersistentBasket(PersistentBasket):
+    """Оптовая корзина со снимками и увеличенными лимитами."""
+
+    MAX_ITEMS = 10**9
+    MAX_WEIGHT = 10**9
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает время в микросекундах."""
+    print(
+        f"{'Строк':>8}{'deepcopy, мкс':>16}{'snapshot, мкс':>16}"
+        f"{'add Basket, мкс':>18}{'add Persistent, мкс':>22}"
+    )
+    for size in (10, 1_000, 100_000):
+        products = [Product(f"Товар {i}", i % 500 + 1, 1) for i in range(size)]
+        lines = [(product, 2) for product in products]
+        basket = WholesaleBasket()
+        basket.add_many(lines)
+        persistent = WholesalePersistentBasket()
+        persistent.add_many(lines)
+        product = products[size // 2]
+
+        number = max(1, 10_000 // size)
+        deepcopy_time = min(
+            timeit.repeat(
+                lambda: copy.deepcopy(basket._products), number=number, repeat=3
+            )
+        )
+        snapshot_time = min(timeit.repeat(persistent.snapshot, number=10_000, repeat=3))
+        add_basket = min(
+            timeit.repeat(lambda: basket.add_product(product), number=10_000, repeat=3)
+        )
+        add_persistent = min(
+            timeit.repeat(
+                lambda: persistent.add_product(product), number=10_000, repeat=3
+            )
+        )
+        print(
+            f"{size:>8}{deepcopy_time / number * 1e6:>16.1f}"
+            f"{snapshot_time / 10_000 * 1e6:>16.2f}"
+            f"{add_basket / 10_000 * 1e6:>18.2f}{add_persistent / 10_000 * 1e6:>22.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
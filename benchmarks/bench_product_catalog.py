@@ -0,0 +1,44 @@
+"""
+Бенчмарк массовых запросов к колоночному каталогу ProductCatalog.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_product_catalog [количество_товаров]
+"""
+
+import random
+import sys
+import time
+
+from product_catalog import ProductCatalog
+
+DEFAULT_SIZE = 1_000_000
+
+
+def main() -> None:
+    """Заполняет каталог и печатает время массовых запросов."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    rng = random.Random(42)
+    catalog = ProductCatalog()
+
+    started = time.perf_counter()
+    for i in range(size):
+        catalog.add(f"Товар {i}", rng.randint(1, 5000), rng.randint(1, 100))
+    print(f"Заполнение {size:,} товаров: {time.perf_counter() - started:.2f} с")
+
+    ids = list(catalog.filter_price(1, 5000))
+    sample = rng.choices(ids, k=size)
+    queries = [
+        ("filter_price(500, 999)", lambda: catalog.filter_price(500, 999)),
+        ("fits_weight(10)", lambda: catalog.fits_weight(10)),
+        (f"sum_prices({size:,} ид.)", lambda: catalog.sum_prices(sample)),
+    ]
+    for title, query in queries:
+        started = time.perf_counter()
+        query()
+        elapsed = time.perf_counter() - started
+        print(f"{title:<28}{elapsed:>8.3f} с{size / elapsed:>16,.0f} строк/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Стресс-бенчмарк распределения идентификаторов товаров в нескольких процессах.
+
+8 процессов создают по 1 000 000 товаров (всего 8 млн) с общим источником
+SharedIdSource и с источниками SnowflakeIdSource, затем проверяется
+уникальность всех идентификаторов.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_product_ids [товаров_на_процесс]
+"""
+
+import multiprocessing
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from product_basket import Product
+from product_ids import IdAllocator, SharedIdSource, SnowflakeIdSource
+
+WORKERS = 8
+DEFAULT_PER_WORKER = 1_000_000
+
+
+def install_allocator(allocator: IdAllocator) -> None:
+    """Инициализатор процесса-воркера с общим источником идентификаторов."""
+    Product.use_id_allocator(allocator)
+
+
+def install_snowflake(node_ids) -> None:
+    """Инициализатор процесса-воркера с собственным номером узла."""
+    Product.use_id_allocator(IdAllocator(SnowflakeIdSource(node_ids.get())))
+
+
+def create_products(count: int) -> bytes:
+    """Создаёт товары и возвращает их идентификаторы."""
+    return array("q", (Product("Товар", 1, 1).id for _ in range(count))).tobytes()
+
+
+def run(title: str, per_worker: int, initializer, initargs: tuple) -> None:
+    """Запускает воркеры, проверяет уникальность и печатает пропускную способность."""
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        WORKERS, initializer=initializer, initargs=initargs
+    ) as pool:
+        ids = array("q")
+        for chunk in pool.map(create_products, [per_worker] * WORKERS):
+            ids.frombytes(chunk)
+    elapsed = time.perf_counter() - started
+
+    unique = len(set(ids))
+    status = "OK" if unique == len(ids) else f"ПОВТОРЫ: {len(ids) - unique}"
+    rate = len(ids) / elapsed
+    print(f"{title:<16}{len(ids):>12,} ид.{elapsed:>8.2f} с{rate:>14,.0f}/с  {status}")
+
+
+def main() -> None:
+    """Запускает стресс-бенчмарк для обоих видов источников."""
+    per_worker = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PER_WORKER
+    allocator = IdAllocator(SharedIdSource(), block_size=65_536)
+    run("SharedIdSource", per_worker, install_allocator, (allocator,))
+
+    with multiprocessing.Manager() as manager:
+        node_ids = manager.Queue()
+        for node_id in range(WORKERS):
+            node_ids.put(node_id)
+        run("Snowflake", per_worker, install_snowflake, (node_ids,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Бенчмарк загрузки прайс-листа в товары.
+
+Сравнивает создание товаров по одному через ``Product(...)`` с пакетными
+конструкторами Product.from_rows и Product.from_columns.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_product_ingest [количество_строк]
+"""
+
+import sys
+import time
+from typing import Callable
+
+from product_basket import Product
+
+DEFAULT_ROWS = 1_000_000
+
+
+def elapsed(build: Callable[[], list[Product]]) -> float:
+    """
+    Измеряет время создания товаров.
+
+    :param build: Функция, создающая список товаров
+    :return: Время в секундах
+    """
+    started = time.perf_counter()
+    products = build()
+    result = time.perf_counter() - started
+    del products
+    return result
+
+
+def main() -> None:
+    """Выводит время загрузки и ускорение относительно Product(...)."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    rows = [(f"Товар {i}", i % 1000 + 1, i % 50 + 1) for i in range(count)]
+    names, prices, weights = (list(column) for column in zip(*rows))
+
+    variants: list[tuple[str, Callable[[], list[Product]]]] = [
+        ("Product(...) по строкам", lambda: [Product(*row) for row in rows]),
+        ("Product.from_rows", lambda: Product.from_rows(rows)),
+        (
+            "Product.from_columns",
+            lambda: Product.from_columns(names, prices, weights),
+        ),
+    ]
+    print(f"Строк: {count:,}")
+    baseline = None
+    for title, build in variants:
+        seconds = elapsed(build)
+        baseline = baseline or seconds
+        print(
+            f"{title:<28}{seconds:8.2f} с{count / seconds:>14,.0f} строк/с"
+            f"  (x{baseline / seconds:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Бенчмарк памяти и скорости чтения атрибутов Product.
+
+Сравнивает прежнее представление товара (``__dict__`` и свойства) с текущим
+(слоты) и с интернированием одинаковых позиций через ProductRegistry.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_product_memory
+"""
+
+import itertools
+import timeit
+import tracemalloc
+from typing import Callable
+
+from product_basket import Product, ProductRegistry
+
+N_PRODUCTS = 200_000
+N_READS = 2_000_000
+
+
+class LegacyProduct:
+    """Прежнее представление товара: атрибуты в ``__dict__``, чтение через свойства."""
+
+    _id_counter = itertools.count(1)
+
+    def __init__(self, name: str, price: int, weight: int) -> None:
+        if price < 1:
+            raise ValueError("Цена товара должна быть не меньше 1 у.е.")
+        if weight < 1:
+            raise ValueError("Вес товара должен быть не меньше 1 у.е.")
+
+        self._id = next(self._id_counter)
+        self._name = name
+        self._price = price
+        self._weight = weight
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def price(self) -> int:
+        return self._price
+
+    @property
+    def weight(self) -> int:
+        return self._weight
+
+
+def bytes_per_product(factory: Callable[[int], object]) -> float:
+    """
+    Измеряет прирост памяти на один созданный товар.
+
+    :param factory: Функция, создающая товар по номеру строки каталога
+    :return: Среднее количество байт на товар
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    products = [factory(i) for i in range(N_PRODUCTS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Список ссылок на товары не относится к размеру самих товаров
+    list_overhead = 8 * len(products)
+    return (after - before - list_overhead) / N_PRODUCTS
+
+
+def reads_per_second(product: object) -> float:
+    """
+    Измеряет пропускную способность чтения атрибута price.
+
+    :param product: Товар
+    :return: Количество чтений в секунду
+    """
+    elapsed = min(
+        timeit.repeat(
+            "product.price", globals={"product": product}, number=N_READS, repeat=5
+        )
+    )
+    return N_READS / elapsed
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает таблицу результатов."""
+    registry = ProductRegistry()
+    # Каталог с повторяющимися позициями: 1000 уникальных товаров
+    cases = [
+        ("LegacyProduct (__dict__)", lambda i: LegacyProduct("Товар", i % 1000 + 1, 1)),
+        ("Product (__slots__)", lambda i: Product("Товар", i % 1000 + 1, 1)),
+        ("ProductRegistry.intern", lambda i: registry.intern("Товар", i % 1000 + 1, 1)),
+    ]
+    print(f"{'Вариант':<28}{'байт/товар':>12}{'чтений price/с':>18}")
+    for title, factory in cases:
+        size = bytes_per_product(factory)
+        reads = reads_per_second(factory(0))
+        print(f"{title:<28}{size:>12.1f}{reads:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
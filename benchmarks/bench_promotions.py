@@ -0,0 +1,111 @@
+"""
+Бенчмарк расчёта стоимости корзин с акциями.
+
+Сравнивает наивный расчёт (перебор всех правил для каждой единицы товара
+из list_products) со скомпилированным PromotionPlan для отдельных корзин и
+с пакетным расчётом BasketBatch.evaluate(promotions=...).
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_promotions [количество_корзин]
+"""
+
+import random
+import sys
+import time
+
+from basket_batch import BasketBatch
+from product_basket import Basket, Product
+from promotions import BundleDeal, PercentOff, PromotionPlan, ThresholdDiscount
+
+DEFAULT_BASKETS = 20_000
+N_PRODUCTS = 2_000
+N_RULES = 500
+
+
+def naive_price(basket: Basket, rules: list) -> int:
+    """Считает стоимость перебором правил для каждой единицы товара."""
+    discounts: dict[int, int] = {}
+    for rule in rules:
+        if isinstance(rule, ThresholdDiscount):
+            continue
+        targets = set(rule.targets)
+        counts: dict[int, int] = {}
+        for product in basket.list_products:
+            if product.id not in targets:
+                continue
+            counts[product.id] = counts.get(product.id, 0) + 1
+            if isinstance(rule, PercentOff):
+                discount = product.price * counts[product.id] * rule.percent // 100
+            else:
+                free = counts[product.id] // rule.buy * (rule.buy - rule.pay)
+                discount = free * product.price
+            discounts[product.id] = max(discounts.get(product.id, 0), discount)
+    subtotal = basket.total_price - sum(discounts.values())
+    reached = [r for r in rules if isinstance(r, ThresholdDiscount)]
+    reached = [r for r in reached if r.min_total <= subtotal]
+    if reached:
+        rule = max(reached, key=lambda rule: rule.min_total)
+        subtotal -= min(subtotal, rule.amount + subtotal * rule.percent // 100)
+    return subtotal + basket.shipping_policy.cost(subtotal)
+
+
+def main() -> None:
+    """Выводит время расчёта и ускорение относительно наивного перебора."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BASKETS
+    rng = random.Random(0)
+    products = [
+        Product(f"Товар {i}", rng.randint(1, 500), rng.randint(1, 10))
+        for i in range(N_PRODUCTS)
+    ]
+    ids = [product.id for product in products]
+    rules: list = []
+    for _ in range(N_RULES):
+        targets = tuple(rng.sample(ids, 10))
+        if rng.random() < 0.5:
+            rules.append(PercentOff(rng.randint(5, 50), targets))
+        else:
+            rules.append(BundleDeal(3, 2, targets))
+    rules += [ThresholdDiscount(bound, amount=bound // 20) for bound in (300, 600, 900)]
+
+    baskets = []
+    for _ in range(count):
+        basket = Basket()
+        for _ in range(rng.randint(1, 8)):
+            try:
+                basket.add_product(rng.choice(products), rng.randint(1, 4))
+            except ValueError:
+                pass
+        baskets.append(basket)
+
+    started = time.perf_counter()
+    plan = PromotionPlan(rules)
+    compile_time = time.perf_counter() - started
+    print(f"Корзин: {count:,}, правил: {len(rules)}, компиляция {compile_time:.4f} с")
+
+    sample = baskets[: max(1, count // 20)]
+    started = time.perf_counter()
+    naive = [naive_price(basket, rules) for basket in sample]
+    naive_time = (time.perf_counter() - started) * count / len(sample)
+
+    started = time.perf_counter()
+    planned = [basket.price_with(plan) for basket in baskets]
+    plan_time = time.perf_counter() - started
+
+    batch = BasketBatch.from_baskets(baskets)
+    started = time.perf_counter()
+    result = batch.evaluate(promotions=plan)
+    batch_time = time.perf_counter() - started
+
+    assert planned[: len(sample)] == naive, "Расчёт плана расходится с перебором"
+    assert result.price == planned, "Пакетный расчёт расходится с корзинами"
+    for title, seconds in (
+        ("Перебор правил (оценка)", naive_time),
+        ("Basket.price_with", plan_time),
+        ("BasketBatch.evaluate", batch_time),
+    ):
+        print(f"{title:<26}{seconds:8.3f} с  (x{naive_time / seconds:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Бенчмарк корзин в разделяемой памяти SharedBasketArena.
+
+Сравнивает чтение итоговой стоимости корзины из арены (без блокировки и
+десериализации) с загрузкой корзины из двоичного формата
+(``Basket.from_buffer``) и выводит пропускную способность смеси изменений и
+чтений при 1…N процессах, работающих с одной ареной.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.bench_shared_arena [процессов]
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import time
+import timeit
+
+from product_basket import Basket, Product
+from shared_arena import SharedBasketArena
+
+N_SLOTS = 10_000
+N_READS = 200_000
+OPERATIONS = 50_000  # Операций на процесс
+PRODUCTS = [Product(f"Товар {i}", i % 900 + 1, i % 5 + 1) for i in range(1000)]
+
+
+def work(arena: SharedBasketArena, seed: int, operations: int) -> None:
+    """
+    Смесь операций воркера: 80 % чтений get_price, 20 % изменений.
+
+    :param arena: Арена корзин
+    :param seed: Зерно генератора случайных чисел
+    :param operations: Количество операций
+    """
+    rng = random.Random(seed)
+    for _ in range(operations):
+        slot = rng.randrange(N_SLOTS)
+        if rng.random() < 0.8:
+            arena.get_price(slot)
+            continue
+        product = rng.choice(PRODUCTS)
+        try:
+            if rng.random() < 0.6:
+                arena.add_product(slot, product)
+            else:
+                arena.decrement(slot, product.id)
+        except (KeyError, ValueError):
+            pass
+
+
+def main() -> None:
+    """Выводит время чтения стоимости и пропускную способность по процессам."""
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    context = multiprocessing.get_context("fork")
+    with SharedBasketArena(N_SLOTS, mp_context=context) as arena:
+        basket = Basket()
+        for product in PRODUCTS[:8]:
+            arena.add_product(0, product)
+            basket.add_product(product)
+        data = basket.to_bytes()
+
+        arena_ns = timeit.timeit(lambda: arena.get_price(0), number=N_READS)
+        buffer_ns = timeit.timeit(
+            lambda: Basket.from_buffer(data).get_price, number=N_READS
+        )
+        print(f"get_price из арены:          {arena_ns / N_READS * 1e9:8.0f} нс")
+        print(f"from_buffer(...).get_price:  {buffer_ns / N_READS * 1e9:8.0f} нс")
+
+        baseline = None
+        for count in range(1, workers + 1):
+            processes = [
+                context.Process(target=work, args=(arena, seed, OPERATIONS))
+                for seed in range(count)
+            ]
+            started = time.perf_counter()
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            rate = count * OPERATIONS / (time.perf_counter() - started)
+            baseline = baseline or rate
+            print(
+                f"Процессов: {count:>2}  {rate:12,.0f} операций/с"
+                f"  (x{rate / baseline:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+import csv
+import json
+import os
+from operator import itemgetter
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, NamedTuple, TextIO
+
+from product_basket import Basket, BatchLineError, Product, ShippingPolicy
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+_FORMATS_BY_SUFFIX = {
+    ".csv": FORMAT_CSV,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+}
+
+# Поля строки выгрузки заказов: одна строка — одна позиция корзины
+CART_FIELDS = ("cart_id", "product_id", "name", "price", "weight", "quantity")
+# Поля итогов корзины в выходном файле
+SUMMARY_FIELDS = (
+    "cart_id",
+    "total_items",
+    "total_price",
+    "total_weight",
+    "shipping_cost",
+    "price",
+)
+# Размер буфера чтения и записи: файл обрабатывается блоками, а не построчно
+BUFFER_SIZE = 1 << 20
+
+
+class RejectedLine(NamedTuple):
+    """Отклонённая строка входного файла."""
+
+    line_number: int  # Номер строки во входном файле, начиная с 1
+    record: object  # Исходная запись: текст строки JSONL или список полей CSV
+    reason: str  # Причина отказа
+
+
+class CartSummary(NamedTuple):
+    """Итоги одной корзины."""
+
+    cart_id: object  # Идентификатор корзины из входного файла
+    total_items: int  # Количество единиц товара
+    total_price: int  # Общая стоимость товаров
+    total_weight: int  # Общий вес товаров
+    shipping_cost: int  # Стоимость доставки
+    price: int  # Итоговая стоимость с доставкой
+
+
+class PipelineStats:
+    """Счётчики конвейера и скорость обработки строк."""
+
+    def __init__(self) -> None:
+        """Инициализация счётчиков; отсчёт времени начинается при создании."""
+        self.rows = 0  # Прочитано строк с позициями
+        self.rejected = 0  # Отклонено строк
+        self.carts = 0  # Собрано корзин
+        self._started = perf_counter()
+        self._finished: float | None = None
+
+    def finish(self) -> None:
+        """Останавливает отсчёт времени."""
+        self._finished = perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Возвращает время работы конвейера в секундах."""
+        return (self._finished or perf_counter()) - self._started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Возвращает скорость обработки в строках в секунду."""
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Возвращает отчёт о работе конвейера."""
+        return (
+            f"строк: {self.rows}, корзин: {self.carts}, отклонено: {self.rejected}, "
+            f"{self.rows_per_second:,.0f} строк/с"
+        )
+
+
+class RejectionLog:
+    """
+    Приёмник отклонённых строк, записывающий их в файл JSONL.
+
+    Каждая строка файла — объект с полями ``line_number``, ``reason`` и
+    ``record``. Используется как контекстный менеджер.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Открывает файл журнала на запись.
+
+        :param path: Путь к файлу журнала
+        """
+        self._file = open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+
+    def __call__(self, rejected: RejectedLine) -> None:
+        """Записывает отклонённую строку в журнал."""
+        self._file.write(
+            json.dumps(rejected._asdict(), ensure_ascii=False, default=str) + "\n"
+        )
+
+    def close(self) -> None:
+        """Закрывает файл журнала."""
+        self._file.close()
+
+    def __enter__(self) -> "RejectionLog":
+        """Возвращает журнал для записи отклонённых строк."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Закрывает файл журнала при выходе из контекста."""
+        self.close()
+
+
+def detect_format(path: str | os.PathLike) -> str:
+    """
+    Определяет формат файла по расширению.
+
+    :param path: Путь к файлу
+    :return: FORMAT_CSV или FORMAT_JSONL
+    :raises ValueError: если расширение не поддерживается
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    try:
+        return _FORMATS_BY_SUFFIX[suffix]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный формат файла {os.fspath(path)!r}: ожидается .csv или .jsonl"
+        ) from None
+
+
+def _csv_records(
+    file: TextIO,
+) -> tuple[Iterator[tuple[int, object]], Callable[[object], tuple]]:
+    """
+    Возвращает записи файла CSV и функцию извлечения полей позиции.
+
+    :param file: Файл CSV с заголовком
+    :raises ValueError: если в заголовке нет обязательных полей
+    """
+    reader = csv.reader(file)
+    header = next(reader, None) or []
+    missing = [field for field in CART_FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"В заголовке CSV нет полей: {', '.join(missing)}")
+    width = len(header)
+    getter = itemgetter(*map(header.index, CART_FIELDS))
+
+    def fields(row: object) -> tuple:
+        size = len(row)  # type: ignore[arg-type]
+        if size != width:
+            raise ValueError(f"Ожидалось {width} полей, но получено {size}")
+        return getter(row)  # type: ignore[arg-type]
+
+    records = ((reader.line_num, row) for row in reader if row)
+    return records, fields
+
+
+def _jsonl_records(
+    file: TextIO,
+) -> tuple[Iterator[tuple[int, object]], Callable[[object], tuple]]:
+    """
+    Возвращает записи файла JSONL и функцию извлечения полей позиции.
+
+    :param file: Файл JSONL, по одному объекту на строку
+    """
+
+    def fields(line: object) -> tuple:
+        data = json.loads(line)  # type: ignore[arg-type]
+        if not isinstance(data, dict):
+            raise ValueError("Строка JSONL должна содержать объект")
+        missing = [field for field in CART_FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"Нет полей: {', '.join(missing)}")
+        return tuple(data[field] for field in CART_FIELDS)
+
+    records = (
+        (number, line.rstrip("\n"))
+        for number, line in enumerate(file, 1)
+        if not line.isspace()
+    )
+    return records, fields
+
+
+def _to_int(value: object, field: str) -> int:
+    """
+    Преобразует значение поля в целое число.
+
+    :param value: Значение из CSV (строка) или JSONL (число или строка)
+    :param field: Название поля для сообщения об ошибке
+    :raises ValueError: если значение не является целым числом
+    """
+    if type(value) is int:
+        return value  # type: ignore[return-value]
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise ValueError(f"Поле {field} должно быть целым числом, но получено {value!r}")
+
+
+def _parse_line(values: tuple) -> tuple[object, Product, int]:
+    """
+    Проверяет поля позиции и создаёт товар.
+
+    :param values: Значения полей в порядке CART_FIELDS
+    :return: Идентификатор корзины, товар и количество
+    :raises ValueError: если значения полей некорректны
+    """
+    cart_id, product_id, name, price, weight, quantity = values
+    product_id = _to_int(product_id, "product_id")
+    price = _to_int(price, "price")
+    weight = _to_int(weight, "weight")
+    quantity = _to_int(quantity, "quantity")
+    if not isinstance(name, str):
+        raise ValueError(f"Поле name должно быть строкой, но получено {name!r}")
+    if price < 1:
+        raise ValueError("Цена товара должна быть не меньше 1 у.е.")
+    if weight < 1:
+        raise ValueError("Вес товара должен быть не меньше 1 у.е.")
+    if quantity < 1:
+        raise ValueError(
+            f"Количество товара должно быть не меньше 1, но получено {quantity}"
+        )
+    return cart_id, Product._from_trusted(product_id, name, price, weight), quantity
+
+
+def read_carts(
+    path: str | os.PathLike,
+    errors: Callable[[RejectedLine], None] | None = None,
+    stats: PipelineStats | None = None,
+    fmt: str | None = None,
+    basket_cls: type[Basket] = Basket,
+    shipping_policy: ShippingPolicy | None = None,
+) -> Iterator[tuple[object, Basket]]:
+    """
+    Читает корзины из выгрузки заказов потоком.
+
+    Каждая строка файла — одна позиция (поля CART_FIELDS); подряд идущие
+    строки с одним ``cart_id`` образуют корзину, поэтому в памяти находится
+    только текущая корзина, а не весь файл. Позиции корзины добавляются
+    одним вызовом ``add_many``. Строки с некорректными полями, позиции,
+    превышающие лимиты корзины, и позиции с ``product_id`` товара корзины,
+    но другой ценой или весом, передаются в приёмник ``errors`` и не
+    прерывают обработку; остальные позиции корзины сохраняются.
+
+    :param path: Путь к файлу .csv (с заголовком) или .jsonl
+    :param errors: Приёмник отклонённых строк; None — строки отбрасываются
+        (их количество учитывается в ``stats``)
+    :param stats: Счётчики конвейера, обновляются по ходу чтения
+    :param fmt: Формат файла (FORMAT_CSV или FORMAT_JSONL); по умолчанию
+        определяется по расширению
+    :param basket_cls: Класс создаваемых корзин
+    :param shipping_policy: Тарифы доставки корзин; по умолчанию тарифы класса
+    :return: Итератор пар (идентификатор корзины, корзина)
+    :raises ValueError: если формат не поддерживается или в заголовке CSV нет
+        обязательных полей
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in (FORMAT_CSV, FORMAT_JSONL):
+        raise ValueError(f"Неизвестный формат файла: {fmt!r}")
+    stats = stats if stats is not None else PipelineStats()
+
+    def reject(number: int, record: object, reason: str) -> None:
+        stats.rejected += 1
+        if errors is not None:
+            errors(RejectedLine(number, record, reason))
+
+    def build(
+        lines: list[tuple[Product, int]], sources: list[tuple[int, object]]
+    ) -> Basket:
+        basket = basket_cls(shipping_policy=shipping_policy)
+        start = 0
+        while start < len(lines):
+            try:
+                basket.add_many(lines[start:] if start else lines)
+                break
+            except BatchLineError as error:
+                # add_many атомарна: позиции до отказавшей помещаются в корзину
+                failed = start + error.failed_line.line_index
+                basket.add_many(lines[start:failed])
+                number, record = sources[failed]
+                reject(number, record, str(error))
+                start = failed + 1
+            except ValueError:
+                # Ошибка без номера строки пакета: позиции добавляются по одной
+                for (product, quantity), (number, record) in zip(
+                    lines[start:], sources[start:]
+                ):
+                    try:
+                        basket.add_product(product, quantity)
+                    except ValueError as error:
+                        reject(number, record, str(error))
+                break
+        stats.carts += 1
+        return basket
+
+    with open(path, encoding="utf-8", newline="", buffering=BUFFER_SIZE) as file:
+        if fmt == FORMAT_CSV:
+            records, fields = _csv_records(file)
+        else:
+            records, fields = _jsonl_records(file)
+
+        cart_id: object = None
+        lines: list[tuple[Product, int]] = []
+        sources: list[tuple[int, object]] = []  # (номер строки, запись) позиций
+        for number, record in records:
+            stats.rows += 1
+            try:
+                line_cart, product, quantity = _parse_line(fields(record))
+            except (ValueError, TypeError) as error:
+                reject(number, record, str(error))
+                continue
+            if lines and line_cart != cart_id:
+                yield cart_id, build(lines, sources)
+                lines = []
+                sources = []
+            cart_id = line_cart
+            lines.append((product, quantity))
+            sources.append((number, record))
+        if lines:
+            yield cart_id, build(lines, sources)
+
+
+def summarize(carts: Iterable[tuple[object, Basket]]) -> Iterator[CartSummary]:
+    """
+    Считает итоги корзин потоком.
+
+    :param carts: Пары (идентификатор корзины, корзина)
+    :return: Итератор итогов корзин
+    """
+    for cart_id, basket in carts:
+        yield CartSummary(
+            cart_id,
+            basket.total_items,
+            basket.total_price,
+            basket.total_weight,
+            basket.get_shipping_cost,
+            basket.get_price,
+        )
+
+
+def write_summaries(
+    path: str | os.PathLike,
+    summaries: Iterable[CartSummary],
+    fmt: str | None = None,
+) -> int:
+    """
+    Записывает итоги корзин в файл потоком.
+
+    :param path: Путь к файлу .csv или .jsonl
+    :param summaries: Итоги корзин
+    :param fmt: Формат файла; по умолчанию определяется по расширению
+    :return: Количество записанных корзин
+    :raises ValueError: если формат не поддерживается
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in (FORMAT_CSV, FORMAT_JSONL):
+        raise ValueError(f"Неизвестный формат файла: {fmt!r}")
+
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as file:
+        if fmt == FORMAT_CSV:
+            writer = csv.writer(file)
+            writer.writerow(SUMMARY_FIELDS)
+            for summary in summaries:
+                writer.writerow(summary)
+                count += 1
+        else:
+            for summary in summaries:
+                file.write(
+                    json.dumps(dict(zip(SUMMARY_FIELDS, summary)), ensure_ascii=False)
+                    + "\n"
+                )
+                count += 1
+    return count
+
+
+def run_pipeline(
+    source: str | os.PathLike,
+    target: str | os.PathLike,
+    errors: Callable[[RejectedLine], None] | None = None,
+    basket_cls: type[Basket] = Basket,
+    shipping_policy: ShippingPolicy | None = None,
+) -> PipelineStats:
+    """
+    Читает корзины из выгрузки заказов и записывает их итоги.
+
+    Форматы входного и выходного файлов определяются по расширениям и могут
+    различаться. Память не зависит от размера файла.
+
+    :param source: Путь к выгрузке заказов (.csv или .jsonl)
+    :param target: Путь к файлу итогов (.csv или .jsonl)
+    :param errors: Приёмник отклонённых строк
+    :param basket_cls: Класс создаваемых корзин
+    :param shipping_policy: Тарифы доставки корзин; по умолчанию тарифы класса
+    :return: Счётчики конвейера со скоростью обработки строк
+    """
+    stats = PipelineStats()
+    carts = read_carts(source, errors, stats, None, basket_cls, shipping_policy)
+    write_summaries(target, summarize(carts))
+    stats.finish()
+    return stats
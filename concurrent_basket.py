@@ -0,0 +1,71 @@
+import threading
+from typing import Iterable
+
+from product_basket import Basket, Product, ShippingPolicy
+
+
+class ConcurrentBasket(Basket):
+    """
+    Потокобезопасная корзина.
+
+    Проверка лимитов и изменение содержимого выполняются под блокировкой
+    корзины как одна атомарная операция, поэтому параллельные добавления
+    не могут превысить MAX_ITEMS и MAX_WEIGHT. Итоги (total_price,
+    total_weight, get_shipping_cost, get_price и т.д.) читаются без
+    блокировки; снимки содержимого (lines, list_products) — под блокировкой.
+    """
+
+    def __init__(
+        self, verify: bool = False, shipping_policy: ShippingPolicy | None = None
+    ) -> None:
+        """
+        Инициализация корзины.
+
+        :param verify: Режим отладки: после каждого изменения корзины
+            накопленные итоги сверяются с полным пересчётом
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+        """
+        super().__init__(verify, shipping_policy)
+        # Реентерабельная: verify_totals внутри изменения читает list_products
+        self._lock = threading.RLock()
+
+    def add_product(self, product: Product, quantity: int = 1) -> None:
+        """Атомарно выполняет Basket.add_product."""
+        with self._lock:
+            super().add_product(product, quantity)
+
+    def add_many(self, lines: Iterable[tuple[Product, int]]) -> None:
+        """Атомарно выполняет Basket.add_many."""
+        with self._lock:
+            super().add_many(lines)
+
+    def delete_product(self, product_id: int) -> None:
+        """Атомарно выполняет Basket.delete_product."""
+        with self._lock:
+            super().delete_product(product_id)
+
+    def set_quantity(self, product_id: int, quantity: int) -> None:
+        """Атомарно выполняет Basket.set_quantity."""
+        with self._lock:
+            super().set_quantity(product_id, quantity)
+
+    def replace_product(self, product: Product, quantity: int) -> None:
+        """Атомарно выполняет Basket.replace_product."""
+        with self._lock:
+            super().replace_product(product, quantity)
+
+    def decrement(self, product_id: int, quantity: int = 1) -> None:
+        """Атомарно выполняет Basket.decrement."""
+        with self._lock:
+            super().decrement(product_id, quantity)
+
+    def lines(self) -> list[tuple[Product, int]]:
+        """Возвращает согласованный снимок строк корзины."""
+        with self._lock:
+            return super().lines()
+
+    @property
+    def list_products(self) -> list[Product]:
+        """Возвращает согласованный снимок списка всех товаров в корзине."""
+        with self._lock:
+            return Basket.list_products.fget(self)  # type: ignore[attr-defined]
@@ -0,0 +1,493 @@
+import mmap
+from collections import deque
+from typing import (
+    Any,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    Self,
+    TypeVar,
+)
+
+from product_basket import Basket, Product, ShippingPolicy
+
+_BITS = 5  # Битов хэша на уровень дерева
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+_MISSING = object()
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Node:
+    """
+    Узел HAMT: битовая карта занятых позиций и упакованный кортеж детей.
+
+    Ребёнок — лист ``(хэш, ключ, значение)``, вложенный узел или узел
+    коллизий. Узлы не изменяются после создания.
+    """
+
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap: int, children: tuple) -> None:
+        """
+        Инициализация узла.
+
+        :param bitmap: Битовая карта занятых позиций
+        :param children: Дети в порядке позиций
+        """
+        self.bitmap = bitmap
+        self.children = children
+
+
+class _Collision:
+    """Узел коллизий: пары (ключ, значение) с одинаковым полным хэшем."""
+
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, hash_: int, pairs: tuple[tuple[Hashable, object], ...]) -> None:
+        """
+        Инициализация узла коллизий.
+
+        :param hash_: Общий хэш ключей
+        :param pairs: Пары (ключ, значение)
+        """
+        self.hash = hash_
+        self.pairs = pairs
+
+
+def _hash(key: Hashable) -> int:
+    """Возвращает неотрицательный 64-битный хэш ключа."""
+    return hash(key) & _HASH_MASK
+
+
+def _entry_hash(entry: tuple | _Collision) -> int:
+    """Возвращает хэш листа или узла коллизий."""
+    return entry.hash if isinstance(entry, _Collision) else entry[0]
+
+
+def _merge(first: tuple | _Collision, second: tuple, shift: int) -> _Node | _Collision:
+    """
+    Создаёт поддерево из двух записей с разными ключами.
+
+    :param first: Лист или узел коллизий
+    :param second: Новый лист
+    :param shift: Сдвиг хэша на уровне создаваемого узла
+    """
+    first_hash = _entry_hash(first)
+    if first_hash == second[0]:
+        pairs = first.pairs if isinstance(first, _Collision) else (first[1:],)
+        return _Collision(first_hash, pairs + (second[1:],))
+
+    first_index = (first_hash >> shift) & _MASK
+    second_index = (second[0] >> shift) & _MASK
+    if first_index == second_index:
+        return _Node(1 << first_index, (_merge(first, second, shift + _BITS),))
+    children = (first, second) if first_index < second_index else (second, first)
+    return _Node((1 << first_index) | (1 << second_index), children)
+
+
+def _get(node: _Node, hash_: int, key: Hashable) -> Any:
+    """Ищет значение ключа в дереве; возвращает _MISSING, если ключа нет."""
+    shift = 0
+    while True:
+        bit = 1 << ((hash_ >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        entry = node.children[(node.bitmap & (bit - 1)).bit_count()]
+        if type(entry) is tuple:
+            return entry[2] if entry[0] == hash_ and entry[1] == key else _MISSING
+        if type(entry) is _Collision:
+            if entry.hash == hash_:
+                for pair_key, value in entry.pairs:
+                    if pair_key == key:
+                        return value
+            return _MISSING
+        node = entry
+        shift += _BITS
+
+
+def _set(node: _Node, leaf: tuple, shift: int) -> tuple[_Node, bool]:
+    """
+    Возвращает копию пути дерева с установленным значением ключа.
+
+    :param node: Узел
+    :param leaf: Лист (хэш, ключ, значение)
+    :param shift: Сдвиг хэша на уровне узла
+    :return: Новый узел и признак того, что ключ добавлен, а не заменён
+    """
+    bit = 1 << ((leaf[0] >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    if not node.bitmap & bit:
+        return (
+            _Node(node.bitmap | bit, children[:index] + (leaf,) + children[index:]),
+            True,
+        )
+
+    entry = children[index]
+    added = True
+    if type(entry) is tuple:
+        if entry[0] == leaf[0] and entry[1] == leaf[1]:
+            entry, added = leaf, False
+        else:
+            entry = _merge(entry, leaf, shift + _BITS)
+    elif type(entry) is _Collision:
+        if entry.hash == leaf[0]:
+            pairs = tuple(pair for pair in entry.pairs if pair[0] != leaf[1])
+            added = len(pairs) == len(entry.pairs)
+            entry = _Collision(entry.hash, pairs + (leaf[1:],))
+        else:
+            entry = _merge(entry, leaf, shift + _BITS)
+    else:
+        entry, added = _set(entry, leaf, shift + _BITS)
+    children = children[:index] + (entry,) + children[index + 1 :]
+    return _Node(node.bitmap, children), added
+
+
+def _delete(node: _Node, hash_: int, key: Hashable, shift: int) -> object:
+    """
+    Возвращает копию пути дерева без ключа.
+
+    :param node: Узел
+    :param hash_: Хэш ключа
+    :param key: Ключ
+    :param shift: Сдвиг хэша на уровне узла
+    :return: Тот же узел, если ключа нет; иначе новый узел, единственный
+        оставшийся лист (для схлопывания пути) или None, если узел опустел
+    """
+    bit = 1 << ((hash_ >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entry = original = node.children[index]
+
+    if type(entry) is tuple:
+        if entry[0] != hash_ or entry[1] != key:
+            return node
+        entry = None
+    elif type(entry) is _Collision:
+        if entry.hash != hash_:
+            return node
+        pairs = tuple(pair for pair in entry.pairs if pair[0] != key)
+        if len(pairs) == len(entry.pairs):
+            return node
+        entry = (hash_, *pairs[0]) if len(pairs) == 1 else _Collision(hash_, pairs)
+    else:
+        entry = _delete(entry, hash_, key, shift + _BITS)
+        if entry is original:
+            return node
+
+    children = node.children
+    if entry is None:
+        bitmap = node.bitmap & ~bit
+        children = children[:index] + children[index + 1 :]
+    else:
+        bitmap = node.bitmap
+        children = children[:index] + (entry,) + children[index + 1 :]
+
+    if not children:
+        return None
+    # Единственный лист поднимается на уровень выше (кроме корня)
+    if shift and len(children) == 1 and type(children[0]) is not _Node:
+        return children[0]
+    return _Node(bitmap, children)
+
+
+def _items(node: _Node | _Collision | tuple) -> Iterator[tuple[Any, Any]]:
+    """Перебирает пары (ключ, значение) поддерева."""
+    if isinstance(node, tuple):
+        yield node[1], node[2]
+    elif isinstance(node, _Collision):
+        yield from node.pairs
+    else:
+        for child in node.children:
+            yield from _items(child)
+
+
+class PersistentMap(Generic[K, V]):
+    """
+    Неизменяемое отображение на основе HAMT (hash array mapped trie).
+
+    ``set`` и ``delete`` не меняют отображение, а возвращают новое, которое
+    разделяет с исходным все узлы, кроме пути к изменённому ключу, поэтому
+    каждое изменение стоит O(log32 n) по времени и памяти.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self) -> None:
+        """Инициализация пустого отображения."""
+        self._root = _Node(0, ())
+        self._size = 0
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]]) -> "PersistentMap[K, V]":
+        """
+        Создаёт отображение из пар (ключ, значение).
+
+        :param items: Пары (ключ, значение)
+        """
+        result = cls()
+        for key, value in items:
+            result = result.set(key, value)
+        return result
+
+    def _replace(self, root: _Node, size: int) -> "PersistentMap[K, V]":
+        """Создаёт отображение с заданным корнем и размером."""
+        result: PersistentMap[K, V] = PersistentMap.__new__(PersistentMap)
+        result._root = root
+        result._size = size
+        return result
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Возвращает значение ключа.
+
+        :param key: Ключ
+        :param default: Значение, если ключа нет
+        """
+        value = _get(self._root, _hash(key), key)
+        return default if value is _MISSING else value
+
+    def set(self, key: K, value: V) -> "PersistentMap[K, V]":
+        """
+        Возвращает новое отображение с установленным значением ключа.
+
+        :param key: Ключ
+        :param value: Значение
+        """
+        root, added = _set(self._root, (_hash(key), key, value), 0)
+        return self._replace(root, self._size + added)
+
+    def delete(self, key: K) -> "PersistentMap[K, V]":
+        """
+        Возвращает новое отображение без ключа (или это же, если ключа нет).
+
+        :param key: Ключ
+        """
+        root = _delete(self._root, _hash(key), key, 0)
+        if root is self._root:
+            return self
+        # Корень не схлопывается в лист: None означает, что ключей не осталось
+        if not isinstance(root, _Node):
+            root = _Node(0, ())
+        return self._replace(root, self._size - 1)
+
+    def __contains__(self, key: object) -> bool:
+        """Проверяет наличие ключа."""
+        return _get(self._root, _hash(key), key) is not _MISSING
+
+    def __len__(self) -> int:
+        """Возвращает количество ключей."""
+        return self._size
+
+    def __iter__(self) -> Iterator[K]:
+        """Перебирает ключи."""
+        return (key for key, _ in _items(self._root))
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """Перебирает пары (ключ, значение)."""
+        return _items(self._root)
+
+    def values(self) -> Iterator[V]:
+        """Перебирает значения."""
+        return (value for _, value in _items(self._root))
+
+
+# Строки корзины в неизменяемом отображении: идентификатор -> (товар, количество)
+_LineMap = PersistentMap[int, tuple[Product, int]]
+
+
+class _PersistentLines(MutableMapping[int, tuple[Product, int]]):
+    """
+    Строки PersistentBasket: изменяемое отображение поверх PersistentMap.
+
+    Каждое изменение заменяет ``map`` новым отображением, а прежнее остаётся
+    нетронутым, поэтому сохранённое значение ``map`` — снимок строк за O(1).
+    """
+
+    __slots__ = ("map",)
+
+    def __init__(self, lines: _LineMap | None = None) -> None:
+        """
+        Инициализация строк.
+
+        :param lines: Исходные строки; по умолчанию строк нет
+        """
+        self.map = PersistentMap() if lines is None else lines
+
+    def __getitem__(self, product_id: int) -> tuple[Product, int]:
+        """Возвращает строку товара."""
+        line = self.map.get(product_id)
+        if line is None:
+            raise KeyError(product_id)
+        return line
+
+    def __setitem__(self, product_id: int, line: tuple[Product, int]) -> None:
+        """Устанавливает строку товара."""
+        self.map = self.map.set(product_id, line)
+
+    def __delitem__(self, product_id: int) -> None:
+        """Удаляет строку товара."""
+        lines = self.map.delete(product_id)
+        if lines is self.map:
+            raise KeyError(product_id)
+        self.map = lines
+
+    def __contains__(self, product_id: object) -> bool:
+        """Проверяет наличие строки товара."""
+        return product_id in self.map
+
+    def __iter__(self) -> Iterator[int]:
+        """Перебирает идентификаторы товаров."""
+        return iter(self.map)
+
+    def __len__(self) -> int:
+        """Возвращает количество строк."""
+        return len(self.map)
+
+
+# Состояние корзины: строки и накопленные итоги (количество, стоимость, вес)
+_State = tuple[_LineMap, int, int, int]
+
+
+class PersistentBasket(Basket):
+    """
+    Корзина со снимками и отменой изменений.
+
+    Строки хранятся в неизменяемом отображении PersistentMap, поэтому
+    снимок корзины (``snapshot``) создаётся за O(1), а каждое изменение
+    стоит O(log n) и разделяет с предыдущим состоянием почти всю память.
+    Предыдущие состояния хранятся в истории для ``undo``/``redo``.
+    Публичный интерфейс совпадает с Basket; порядок строк определяется
+    хэшами идентификаторов товаров, а не порядком добавления.
+    """
+
+    def __init__(
+        self,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+        history_size: int = 100,
+    ) -> None:
+        """
+        Инициализация корзины.
+
+        :param verify: Режим отладки: после каждого изменения корзины
+            накопленные итоги сверяются с полным пересчётом
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+        :param history_size: Сколько последних изменений можно отменить
+        """
+        super().__init__(verify, shipping_policy)
+        self._products: _PersistentLines = _PersistentLines()
+        self._undo: deque[_State] = deque(maxlen=history_size)
+        self._redo: list[_State] = []
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: bytes | bytearray | memoryview | mmap.mmap,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> Self:
+        """Восстанавливает корзину из данных to_bytes (см. Basket.from_buffer)."""
+        basket = super().from_buffer(buffer, verify, shipping_policy)
+        basket._products = _PersistentLines(
+            PersistentMap.from_items(basket._products.items())
+        )
+        return basket
+
+    def _state(self) -> _State:
+        """Возвращает текущее состояние корзины."""
+        return self._products.map, self._count, self._total_price, self._total_weight
+
+    def _restore_state(self, state: _State) -> None:
+        """
+        Устанавливает состояние корзины.
+
+        :param state: Состояние корзины
+        """
+        lines, self._count, self._total_price, self._total_weight = state
+        self._products.map = lines
+        self._version += 1
+
+        if self._verify:
+            self.verify_totals()
+
+    def _record(self) -> None:
+        """Сохраняет текущее состояние в историю перед изменением."""
+        self._undo.append(self._state())
+        self._redo.clear()
+
+    def _apply(self, product: Product, delta: int) -> None:
+        """Изменяет количество товара, сохраняя предыдущее состояние в историю."""
+        self._record()
+        super()._apply(product, delta)
+
+    def _apply_lines(
+        self, lines: dict[int, tuple[Product, int]], count: int, price: int, weight: int
+    ) -> None:
+        """Добавляет проверенные строки пакета одним изменением в истории."""
+        self._record()
+        super()._apply_lines(lines, count, price, weight)
+
+    def _replace(self, product: Product, quantity: int) -> None:
+        """Заменяет товар строки, сохраняя предыдущее состояние в историю."""
+        self._record()
+        super()._replace(product, quantity)
+
+    def snapshot(self) -> "PersistentBasket":
+        """
+        Возвращает независимую копию корзины за O(1).
+
+        Копия разделяет строки с исходной корзиной; дальнейшие изменения
+        любой из них не видны в другой. История изменений не копируется.
+        """
+        copy = type(self)(self._verify, self._shipping_policy, self._undo.maxlen or 0)
+        lines, copy._count, copy._total_price, copy._total_weight = self._state()
+        copy._products.map = lines
+        return copy
+
+    def restore(self, snapshot: "PersistentBasket") -> None:
+        """
+        Возвращает корзину к содержимому снимка; восстановление можно отменить.
+
+        :param snapshot: Снимок, полученный через snapshot()
+        """
+        self._record()
+        self._restore_state(snapshot._state())
+
+    @property
+    def can_undo(self) -> bool:
+        """Возвращает True, если есть изменение для отмены."""
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """Возвращает True, если есть отменённое изменение для повтора."""
+        return bool(self._redo)
+
+    def undo(self) -> None:
+        """
+        Отменяет последнее изменение корзины.
+
+        :raises IndexError: если отменять нечего
+        """
+        if not self._undo:
+            raise IndexError("Нет изменений корзины для отмены")
+        self._redo.append(self._state())
+        self._restore_state(self._undo.pop())
+
+    def redo(self) -> None:
+        """
+        Повторяет последнее отменённое изменение корзины.
+
+        :raises IndexError: если повторять нечего
+        """
+        if not self._redo:
+            raise IndexError("Нет отменённых изменений корзины для повтора")
+        self._undo.append(self._state())
+        self._restore_state(self._redo.pop())
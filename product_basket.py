@@ -1,10 +1,46 @@
+import gc
 import itertools
+import mmap
+import struct
+from bisect import bisect_right
+from collections import deque
+from functools import partial
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    NamedTuple,
+    Self,
+    Sequence,
+)
+
+from product_ids import IdAllocator, LocalIdSource
+
+if TYPE_CHECKING:
+    from basket_fill import FillSuggestion
+    from product_catalog import ProductCatalog
+    from promotions import PromotionPlan
 
 
 class Product:
-    """Класс, представляющий товар на маркетплейсе."""
+    """
+    Класс, представляющий товар на маркетплейсе.
+
+    Атрибуты хранятся в слотах (без ``__dict__`` у экземпляра) и читаются
+    напрямую, без вызова свойств; после создания товар неизменяем.
+    """
+
+    __slots__ = ("id", "name", "price", "weight")
 
-    _id_counter = itertools.count(1)  # Генератор уникальных идентификаторов
+    id: int  # Уникальный идентификатор товара
+    name: str  # Название товара
+    price: int  # Цена товара
+    weight: int  # Вес товара
+
+    _id_allocator = IdAllocator(LocalIdSource())  # Распределитель идентификаторов
+    _id_counter = iter(_id_allocator)  # Генератор уникальных идентификаторов
 
     def __init__(self, name: str, price: int, weight: int) -> None:
         """
@@ -20,30 +56,290 @@ class Product:
         if weight < 1:
             raise ValueError("Вес товара должен быть не меньше 1 у.е.")
 
-        self._id = next(self._id_counter)
-        self._name = name
-        self._price = price
-        self._weight = weight
+        _set_id(self, next(self._id_counter))
+        _set_name(self, name)
+        _set_price(self, price)
+        _set_weight(self, weight)
 
-    @property
-    def id(self) -> int:
-        """Возвращает уникальный идентификатор товара."""
-        return self._id
+    @classmethod
+    def use_id_allocator(cls, allocator: IdAllocator) -> None:
+        """
+        Устанавливает распределитель идентификаторов для всех новых товаров.
 
-    @property
-    def name(self) -> str:
-        """Возвращает название товара."""
-        return self._name
+        В многопроцессной среде вызывается в каждом процессе-воркере, например
+        в ``initializer`` ProcessPoolExecutor или в хуке запуска воркера gunicorn.
 
-    @property
-    def price(self) -> int:
-        """Возвращает цену товара."""
-        return self._price
+        :param allocator: Распределитель идентификаторов
+        """
+        Product._id_allocator = allocator
+        Product._id_counter = iter(allocator)
+
+    @classmethod
+    def _from_trusted(
+        cls, product_id: int, name: str, price: int, weight: int
+    ) -> "Product":
+        """
+        Создаёт товар из уже проверенных данных с заданным идентификатором.
+
+        Не выполняет проверок и не расходует идентификатор из генератора.
+
+        :param product_id: Идентификатор товара
+        :param name: Название товара
+        :param price: Цена товара
+        :param weight: Вес товара
+        :return: Экземпляр товара
+        """
+        product = cls.__new__(cls)
+        _set_id(product, product_id)
+        _set_name(product, name)
+        _set_price(product, price)
+        _set_weight(product, weight)
+        return product
+
+    @classmethod
+    def from_columns(
+        cls, names: Sequence[str], prices: Sequence[int], weights: Sequence[int]
+    ) -> list["Product"]:
+        """
+        Создаёт товары из колонок названий, цен и весов.
+
+        Цены и веса проверяются по колонкам целиком (``min``), идентификаторы
+        резервируются одним непрерывным блоком, а экземпляры создаются без
+        вызова __init__. Новые товары не образуют циклов ссылок, поэтому на
+        время создания сборщик мусора отключается: иначе его проходы по
+        растущему списку товаров занимают большую часть времени загрузки.
+
+        :param names: Названия товаров
+        :param prices: Цены товаров (натуральные числа)
+        :param weights: Веса товаров (натуральные числа)
+        :return: Товары в порядке строк
+        :raises ValueError: если длины колонок различаются или цена либо вес
+            меньше 1 (в сообщении указывается номер строки, начиная с 0)
+        """
+        count = len(names)
+        if len(prices) != count or len(weights) != count:
+            raise ValueError(
+                f"Колонки товаров разной длины: названий {count}, "
+                f"цен {len(prices)}, весов {len(weights)}"
+            )
+        if count and (min(prices) < 1 or min(weights) < 1):
+            for row, (price, weight) in enumerate(zip(prices, weights)):
+                if price < 1:
+                    raise ValueError(
+                        f"Цена товара должна быть не меньше 1 у.е. (строка {row})"
+                    )
+                if weight < 1:
+                    raise ValueError(
+                        f"Вес товара должен быть не меньше 1 у.е. (строка {row})"
+                    )
+
+        ids = cls._id_allocator.reserve(count)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            products = [cls.__new__(cls) for _ in range(count)]
+            consume = deque[object](maxlen=0).extend
+            consume(map(_set_id, products, ids))
+            consume(map(_set_name, products, names))
+            consume(map(_set_price, products, prices))
+            consume(map(_set_weight, products, weights))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return products
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[str, int, int]]) -> list["Product"]:
+        """
+        Создаёт товары из строк (название, цена, вес).
+
+        Строки раскладываются по колонкам и передаются в from_columns.
+
+        :param rows: Строки товаров
+        :return: Товары в порядке строк
+        :raises ValueError: если строка не из трёх значений или цена либо вес
+            меньше 1 (в сообщении указывается номер строки, начиная с 0)
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if any(map((3).__ne__, map(len, rows))):
+            row = next(i for i, values in enumerate(rows) if len(values) != 3)
+            raise ValueError(
+                f"Строка товара должна содержать название, цену и вес (строка {row})"
+            )
+        names, prices, weights = (list(map(itemgetter(i), rows)) for i in range(3))
+        return cls.from_columns(names, prices, weights)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Запрещает изменение атрибутов товара."""
+        raise AttributeError(f"Атрибут товара '{name}' доступен только для чтения")
+
+    def __delattr__(self, name: str) -> None:
+        """Запрещает удаление атрибутов товара."""
+        raise AttributeError(f"Атрибут товара '{name}' доступен только для чтения")
+
+    def __reduce__(self) -> tuple:
+        """Сериализует товар для pickle с сохранением идентификатора."""
+        return Product._from_trusted, (self.id, self.name, self.price, self.weight)
+
+
+# Прямая запись в слоты в обход запрещающего __setattr__
+_set_id = Product.id.__set__  # type: ignore[misc, attr-defined]
+_set_name = Product.name.__set__  # type: ignore[misc, attr-defined]
+_set_price = Product.price.__set__  # type: ignore[misc, attr-defined]
+_set_weight = Product.weight.__set__  # type: ignore[misc, attr-defined]
+
+
+class ProductRegistry:
+    """
+    Таблица интернирования товаров.
+
+    Для одинаковых позиций каталога (название, цена, вес) возвращает один
+    и тот же экземпляр Product, чтобы не хранить в памяти дубликаты.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустой таблицы."""
+        self._products: dict[tuple[str, int, int], Product] = {}
+
+    def intern(self, name: str, price: int, weight: int) -> Product:
+        """
+        Возвращает товар с заданными характеристиками, создавая его при первом обращении.
+
+        :param name: Название товара
+        :param price: Цена товара (натуральное число)
+        :param weight: Вес товара (натуральное число)
+        :return: Общий экземпляр товара
+        :raises ValueError: если цена или вес меньше 1
+        """
+        key = (name, price, weight)
+        product = self._products.get(key)
+        if product is None:
+            product = self._products[key] = Product(name, price, weight)
+        return product
+
+    def __len__(self) -> int:
+        """Возвращает количество уникальных товаров в таблице."""
+        return len(self._products)
+
+    def clear(self) -> None:
+        """Очищает таблицу."""
+        self._products.clear()
+
+
+class ShippingPolicy:
+    """
+    Тарифы доставки в виде отсортированной таблицы порогов общей стоимости.
+
+    Каждый тариф (порог, стоимость) действует от своего порога включительно
+    до следующего порога; ниже первого порога действует ``base_cost``.
+    Тариф для общей стоимости находится двоичным поиском за O(log n).
+    """
+
+    __slots__ = ("_thresholds", "_costs")
+
+    def __init__(self, tiers: Iterable[tuple[int, int]], base_cost: int = 0) -> None:
+        """
+        Инициализация таблицы тарифов.
+
+        :param tiers: Пары (порог общей стоимости, стоимость доставки)
+        :param base_cost: Стоимость доставки ниже первого порога
+        :raises ValueError: если пороги повторяются или стоимость доставки отрицательна
+        """
+        tiers = sorted(tiers)
+        thresholds = [threshold for threshold, _ in tiers]
+        costs = [base_cost] + [cost for _, cost in tiers]
+        if len(set(thresholds)) != len(thresholds):
+            raise ValueError("Пороги тарифов доставки не должны повторяться")
+        if any(cost < 0 for cost in costs):
+            raise ValueError("Стоимость доставки не может быть отрицательной")
+
+        self._thresholds = thresholds
+        self._costs = costs
 
     @property
-    def weight(self) -> int:
-        """Возвращает вес товара."""
-        return self._weight
+    def tiers(self) -> list[tuple[int, int]]:
+        """Возвращает тарифы в виде пар (порог, стоимость) по возрастанию порога."""
+        return list(zip(self._thresholds, self._costs[1:]))
+
+    def next_cheaper_threshold(self, total_price: int) -> int | None:
+        """
+        Возвращает ближайший порог, начиная с которого доставка дешевле текущей.
+
+        :param total_price: Общая стоимость товаров
+        :return: Порог или None, если доставка уже не может стать дешевле
+        """
+        current = self.cost(total_price)
+        start = bisect_right(self._thresholds, total_price)
+        for threshold, cost in zip(self._thresholds[start:], self._costs[start + 1 :]):
+            if cost < current:
+                return threshold
+        return None
+
+    def cost(self, total_price: int) -> int:
+        """
+        Возвращает стоимость доставки для общей стоимости товаров.
+
+        :param total_price: Общая стоимость товаров
+        """
+        return self._costs[bisect_right(self._thresholds, total_price)]
+
+    def costs(self, totals: Iterable[int]) -> list[int]:
+        """
+        Возвращает стоимость доставки для каждой общей стоимости из набора.
+
+        :param totals: Общие стоимости товаров
+        """
+        tier_of = partial(bisect_right, self._thresholds)
+        return list(map(self._costs.__getitem__, map(tier_of, totals)))
+
+    def __repr__(self) -> str:
+        """Возвращает строковое представление для отладки."""
+        return f"{type(self).__name__}({self.tiers!r}, base_cost={self._costs[0]!r})"
+
+
+# Тарифы по умолчанию: пустая корзина — 0, до 500 у.е. — 250,
+# от 500 до 999 у.е. — 100, от 1000 у.е. — бесплатно
+DEFAULT_SHIPPING_POLICY = ShippingPolicy([(1, 250), (500, 100), (1000, 0)])
+
+
+# Двоичный формат корзины (все числа little-endian):
+#   заголовок: сигнатура, версия формата, резерв, количество строк;
+#   строки: идентификатор товара и количество (по 12 байт на строку);
+#   таблица товаров: цена, вес и длина названия в байтах UTF-8 (по 20 байт);
+#   названия товаров в кодировке UTF-8 подряд, в порядке строк.
+BASKET_FORMAT_MAGIC = b"PBSK"
+BASKET_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_LINE = struct.Struct("<qI")
+_PRODUCT = struct.Struct("<qqI")
+
+
+class FailedLine(NamedTuple):
+    """Строка пакета, на которой Basket.add_many прервал добавление."""
+
+    line_index: int  # Номер строки в пакете, начиная с 0
+    line: object  # Содержимое строки
+
+
+class BatchLineError(Exception):
+    """Ошибка строки пакета Basket.add_many с указанием ошибочной строки."""
+
+    failed_line: FailedLine  # Номер и содержимое строки, на которой произошла ошибка
+
+
+class BatchTypeError(BatchLineError, TypeError):
+    """Строка пакета содержит данные некорректного типа."""
+
+
+class BatchValueError(BatchLineError, ValueError):
+    """Строка пакета превышает лимиты корзины или расходится с её строкой."""
+
+
+class CacheInfo(NamedTuple):
+    """Статистика кэша производных значений корзины."""
+
+    hits: int  # Количество чтений из кэша
+    misses: int  # Количество пересчётов
 
 
 class Basket:
@@ -51,10 +347,34 @@ class Basket:
 
     MAX_WEIGHT = 100  # Максимальный вес товаров в корзине
     MAX_ITEMS = 30  # Максимальное количество товаров в корзине
+    SHIPPING_POLICY = DEFAULT_SHIPPING_POLICY  # Тарифы доставки по умолчанию
 
-    def __init__(self) -> None:
-        """Инициализация корзины."""
-        self._products: dict[int, list[Product]] = {}
+    def __init__(
+        self, verify: bool = False, shipping_policy: ShippingPolicy | None = None
+    ) -> None:
+        """
+        Инициализация корзины.
+
+        :param verify: Режим отладки: после каждого изменения корзины
+            накопленные итоги сверяются с полным пересчётом
+        :param shipping_policy: Тарифы доставки (например, региональные);
+            по умолчанию используется SHIPPING_POLICY класса
+        """
+        self._shipping_policy = shipping_policy or self.SHIPPING_POLICY
+        # Одна строка (товар, количество) на каждый идентификатор товара
+        self._products: MutableMapping[int, tuple[Product, int]] = {}
+        self._verify = verify
+        # Накопленные итоги, обновляются при каждом изменении корзины за O(1)
+        self._count = 0
+        self._total_price = 0
+        self._total_weight = 0
+        # Счётчик изменений корзины, по нему представления обнаруживают
+        # изменение корзины во время итерации, а кэш — устаревшие значения
+        self._version = 0
+        # Кэш (версия, стоимость доставки, итоговая стоимость)
+        self._price_cache = (-1, 0, 0)
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def add_product(self, product: Product, quantity: int = 1) -> None:
         """
@@ -64,6 +384,363 @@ class Basket:
         :param quantity: Количество товара (по умолчанию 1)
         :raises TypeError: если переданы данные некорректного типа
         :raises ValueError: если добавление товара превышает лимиты корзины
+            или товар с тем же идентификатором лежит в корзине с другой ценой
+            либо весом
+        """
+        self._check_line(product, quantity)
+        line = self._products.get(product.id)
+        if line is not None and line[0] is not product:
+            self._check_same(line[0], product)
+        self._check_limits(quantity, product.weight * quantity)
+        self._apply(product, quantity)
+
+    def add_many(self, lines: Iterable[tuple[Product, int]]) -> None:
+        """
+        Добавляет в корзину пакет строк (товар, количество) атомарно.
+
+        Все строки проверяются за один проход до изменения корзины: если
+        хотя бы одна строка некорректна или пакет превышает лимиты, корзина
+        остаётся неизменной. Исключения — подклассы исключений add_product
+        с тем же текстом и атрибутом ``failed_line`` (FailedLine) с номером
+        и содержимым строки, на которой произошла ошибка.
+
+        :param lines: Строки пакета в виде пар (товар, количество)
+        :raises BatchTypeError: если строка пакета содержит данные некорректного
+            типа (подкласс TypeError)
+        :raises BatchValueError: если добавление пакета превышает лимиты корзины
+            или строки с одним идентификатором товара расходятся в цене либо весе
+            (подкласс ValueError)
+        """
+        pending: dict[int, tuple[Product, int]] = {}
+        products = self._products
+        count = self._count
+        weight = self._total_weight
+        price = 0
+        max_items = self.MAX_ITEMS
+        max_weight = self.MAX_WEIGHT
+        index = 0
+        line: object = None
+        try:
+            for index, line in enumerate(lines):
+                try:
+                    product, quantity = line  # type: ignore[misc]
+                except (TypeError, ValueError):
+                    raise TypeError(
+                        f"Ожидалась пара (товар, количество), но получен {type(line).__name__}"
+                    ) from None
+                # Быстрые проверки; подробные проверки с текстом ошибки
+                # выполняются только для некорректной строки
+                if (
+                    not isinstance(product, Product)
+                    or not isinstance(quantity, int)
+                    or quantity < 1
+                ):
+                    self._check_line(product, quantity)
+                count += quantity
+                weight += product.weight * quantity
+                price += product.price * quantity
+                if count > max_items or weight > max_weight:
+                    self._check_limits(count - self._count, weight - self._total_weight)
+
+                queued = pending.get(product.id)
+                if queued is None:
+                    current = products.get(product.id)
+                    if current is not None and current[0] is not product:
+                        self._check_same(current[0], product)
+                    pending[product.id] = (product, quantity)
+                else:
+                    if queued[0] is not product:
+                        self._check_same(queued[0], product)
+                    pending[product.id] = (queued[0], queued[1] + quantity)
+        except (TypeError, ValueError) as error:
+            kind = BatchTypeError if isinstance(error, TypeError) else BatchValueError
+            failed = kind(*error.args)
+            vars(failed).update(vars(error))
+            failed.failed_line = FailedLine(index, line)
+            failed.add_note(f"Ошибка в строке пакета №{index}: {line!r}")
+            raise failed.with_traceback(error.__traceback__) from None
+
+        if pending:
+            self._apply_lines(
+                pending, count - self._count, price, weight - self._total_weight
+            )
+
+    def delete_product(self, product_id: int) -> None:
+        """
+        Удаляет товар из корзины целиком.
+
+        :param product_id: Идентификатор товара
+        """
+        line = self._products.get(product_id)
+        if line is None:
+            return
+
+        product, quantity = line
+        self._apply(product, -quantity)
+
+    def set_quantity(self, product_id: int, quantity: int) -> None:
+        """
+        Устанавливает количество товара, уже лежащего в корзине.
+
+        :param product_id: Идентификатор товара
+        :param quantity: Новое количество товара (0 удаляет товар из корзины)
+        :raises KeyError: если товара нет в корзине
+        :raises TypeError: если количество не является неотрицательным целым числом
+        :raises ValueError: если новое количество превышает лимиты корзины
+        """
+        if not isinstance(quantity, int) or quantity < 0:
+            raise TypeError(
+                f"Ожидалось неотрицательное целое число, но получено {type(quantity).__name__}"
+            )
+
+        line = self._products.get(product_id)
+        if line is None:
+            raise KeyError(
+                f"Товар с идентификатором {product_id} отсутствует в корзине"
+            )
+
+        product, current = line
+        delta = quantity - current
+        if delta > 0:
+            self._check_limits(delta, product.weight * delta)
+        if delta:
+            self._apply(product, delta)
+
+    def replace_product(self, product: Product, quantity: int) -> None:
+        """
+        Заменяет товар строки корзины новой версией и устанавливает количество.
+
+        Строка остаётся на своём месте: цена и вес товара (например, после
+        изменения цены в каталоге) и количество меняются одним изменением
+        корзины.
+
+        :param product: Новая версия товара с идентификатором товара строки
+        :param quantity: Новое количество товара
+        :raises KeyError: если товара нет в корзине
+        :raises TypeError: если переданы данные некорректного типа
+        :raises ValueError: если строка с новым товаром превышает лимиты корзины
+        """
+        self._check_line(product, quantity)
+        line = self._products.get(product.id)
+        if line is None:
+            raise KeyError(
+                f"Товар с идентификатором {product.id} отсутствует в корзине"
+            )
+
+        old, current = line
+        self._check_limits(
+            quantity - current, product.weight * quantity - old.weight * current
+        )
+        self._replace(product, quantity)
+
+    def decrement(self, product_id: int, quantity: int = 1) -> None:
+        """
+        Уменьшает количество товара в корзине.
+
+        Если количество товара становится равным нулю, товар удаляется из корзины.
+
+        :param product_id: Идентификатор товара
+        :param quantity: На сколько единиц уменьшить количество (по умолчанию 1)
+        :raises KeyError: если товара нет в корзине
+        :raises TypeError: если количество не является положительным целым числом
+        :raises ValueError: если в корзине меньше единиц товара, чем требуется убрать
+        """
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError(
+                f"Ожидалось положительное целое число, но получено {type(quantity).__name__}"
+            )
+
+        line = self._products.get(product_id)
+        if line is None:
+            raise KeyError(
+                f"Товар с идентификатором {product_id} отсутствует в корзине"
+            )
+
+        product, current = line
+        if quantity > current:
+            raise ValueError(
+                f"В корзине {current} ед. товара, нельзя убрать {quantity} ед."
+            )
+        self._apply(product, -quantity)
+
+    def quantity_of(self, product_id: int) -> int:
+        """
+        Возвращает количество единиц товара в корзине.
+
+        :param product_id: Идентификатор товара
+        :return: Количество товара или 0, если товара нет в корзине
+        """
+        line = self._products.get(product_id)
+        return 0 if line is None else line[1]
+
+    def lines(self) -> list[tuple[Product, int]]:
+        """Возвращает список строк корзины в виде пар (товар, количество)."""
+        return list(self._products.values())
+
+    def to_bytes(self) -> bytes:
+        """
+        Сериализует корзину в компактный двоичный формат.
+
+        Каждый товар записывается один раз вместе с количеством, а не по
+        разу на единицу товара. Тарифы доставки и режим сверки не сохраняются.
+
+        :return: Данные корзины в формате версии BASKET_FORMAT_VERSION
+        :raises ValueError: если цена или вес товара не помещаются в 64-битное
+            целое формата
+        """
+        lines = list(self._products.values())
+        names = [product.name.encode() for product, _ in lines]
+        header = _HEADER.pack(BASKET_FORMAT_MAGIC, BASKET_FORMAT_VERSION, 0, len(lines))
+        pack_line = _LINE.pack
+        pack_product = _PRODUCT.pack
+        try:
+            return b"".join(
+                (
+                    header,
+                    *[pack_line(product.id, quantity) for product, quantity in lines],
+                    *[
+                        pack_product(product.price, product.weight, len(name))
+                        for (product, _), name in zip(lines, names)
+                    ],
+                    *names,
+                )
+            )
+        except struct.error:
+            raise ValueError(
+                "Цена или вес товара не помещаются в 64-битное целое формата корзины"
+            ) from None
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer: bytes | bytearray | memoryview | mmap.mmap,
+        verify: bool = False,
+        shipping_policy: ShippingPolicy | None = None,
+    ) -> Self:
+        """
+        Восстанавливает корзину из данных, полученных через to_bytes.
+
+        Принимает любой объект с буферным протоколом (bytes, bytearray,
+        memoryview, mmap) и читает записи из него напрямую, без копирования
+        буфера. Итоги корзины пересчитываются по строкам за один проход,
+        без поштучной проверки через add_product; лимиты корзины проверяются
+        для итогов целиком.
+
+        :param buffer: Данные корзины
+        :param verify: Режим отладки (см. __init__)
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY класса
+        :return: Восстановленная корзина
+        :raises ValueError: если данные повреждены, имеют неизвестный формат
+            или корзина превышает лимиты
+        """
+        basket = cls(verify, shipping_policy)
+        products, count, total_price, total_weight = cls._read_lines(buffer)
+        basket._check_limits(count, total_weight)
+        basket._products = products
+        basket._count = count
+        basket._total_price = total_price
+        basket._total_weight = total_weight
+
+        if basket._verify:
+            basket.verify_totals()
+        return basket
+
+    @staticmethod
+    def _read_lines(
+        buffer: bytes | bytearray | memoryview | mmap.mmap,
+    ) -> tuple[dict[int, tuple[Product, int]], int, int, int]:
+        """
+        Читает строки корзины из данных в формате to_bytes.
+
+        :param buffer: Данные корзины
+        :return: Строки корзины по идентификатору товара, общее количество,
+            общая стоимость и общий вес товаров
+        :raises ValueError: если данные повреждены или имеют неизвестный формат
+        """
+        products: dict[int, tuple[Product, int]] = {}
+        count = total_price = total_weight = 0
+        with memoryview(buffer) as view:
+            if view.ndim != 1 or view.itemsize != 1:
+                view = view.cast("B")
+            try:
+                magic, version, _, size = _HEADER.unpack_from(view)
+            except struct.error:
+                raise ValueError("Повреждённые данные корзины: нет заголовка") from None
+            if magic != BASKET_FORMAT_MAGIC:
+                raise ValueError("Неизвестный формат данных корзины")
+            if version != BASKET_FORMAT_VERSION:
+                raise ValueError(f"Неподдерживаемая версия формата корзины: {version}")
+
+            lines_start = _HEADER.size
+            table_start = lines_start + size * _LINE.size
+            names_start = table_start + size * _PRODUCT.size
+            if len(view) < names_start:
+                raise ValueError("Повреждённые данные корзины: таблицы обрезаны")
+
+            from_trusted = Product._from_trusted
+            view_size = len(view)
+            offset = names_start
+            for (product_id, quantity), (price, weight, name_size) in zip(
+                _LINE.iter_unpack(view[lines_start:table_start]),
+                _PRODUCT.iter_unpack(view[table_start:names_start]),
+            ):
+                end = offset + name_size
+                if quantity < 1 or price < 1 or weight < 1 or end > view_size:
+                    raise ValueError(
+                        f"Повреждённые данные корзины: некорректная строка "
+                        f"товара {product_id}"
+                    )
+                if product_id in products:
+                    raise ValueError(
+                        f"Повреждённые данные корзины: товар {product_id} повторяется"
+                    )
+                name = str(view[offset:end], "utf-8")
+                offset = end
+                products[product_id] = (
+                    from_trusted(product_id, name, price, weight),
+                    quantity,
+                )
+                count += quantity
+                total_price += price * quantity
+                total_weight += weight * quantity
+
+            if offset != view_size:
+                raise ValueError("Повреждённые данные корзины: лишние байты в конце")
+
+        return products, count, total_price, total_weight
+
+    def suggest_fill(
+        self,
+        catalog: "ProductCatalog",
+        objective: str = "next_tier",
+        time_budget: float | None = None,
+    ) -> "FillSuggestion":
+        """
+        Подбирает товары каталога, помещающиеся в остаток лимитов корзины.
+
+        Цели подбора и алгоритмы описаны в basket_fill.suggest_fill.
+
+        :param catalog: Каталог товаров
+        :param objective: Цель подбора: ``next_tier`` (дотянуть до ближайшего
+            порога с более дешёвой доставкой с минимальной доплатой) или
+            ``max_price`` (добавка максимальной стоимости)
+        :param time_budget: Бюджет времени подбора в секундах (None — без ограничения)
+        :return: Подобранный набор товаров
+        :raises ValueError: если цель подбора неизвестна
+        """
+        # basket_fill импортирует этот модуль, поэтому импорт выполняется здесь
+        from basket_fill import suggest_fill
+
+        return suggest_fill(self, catalog, objective, time_budget)
+
+    @staticmethod
+    def _check_line(product: Product, quantity: int) -> None:
+        """
+        Проверяет типы строки корзины.
+
+        :param product: Экземпляр класса Product
+        :param quantity: Количество товара
+        :raises TypeError: если переданы данные некорректного типа
         """
         if not isinstance(product, Product):
             raise TypeError(
@@ -75,54 +752,272 @@ class Basket:
                 f"Ожидалось положительное целое число, но получено {type(quantity).__name__}"
             )
 
-        if len(self.list_products) + quantity > self.MAX_ITEMS:
+    @staticmethod
+    def _check_same(known: Product, product: Product) -> None:
+        """
+        Проверяет, что товар совпадает по цене и весу с товаром строки корзины.
+
+        В строке корзины остаётся товар, добавленный первым: товар с тем же
+        идентификатором, но другой ценой или весом исказил бы накопленные итоги.
+
+        :param known: Товар, уже лежащий в строке корзины
+        :param product: Добавляемый товар с тем же идентификатором
+        :raises ValueError: если цена или вес товаров различаются
+        """
+        if known.price != product.price or known.weight != product.weight:
             raise ValueError(
-                "Превышено максимальное количество товаров в корзине (30 у.е.)."
+                f"Товар с идентификатором {product.id} уже лежит в корзине "
+                f"с ценой {known.price} у.е. и весом {known.weight} у.е., "
+                f"а добавляется с ценой {product.price} у.е. "
+                f"и весом {product.weight} у.е."
             )
 
-        if self.total_weight + product.weight * quantity > self.MAX_WEIGHT:
-            raise ValueError("Превышен максимальный вес товаров в корзине (100 у.е.).")
+    def _check_limits(self, quantity: int, weight: int) -> None:
+        """
+        Проверяет, что добавление единиц товара не превысит лимиты корзины.
 
-        if product.id not in self._products:
-            self._products[product.id] = []
+        :param quantity: Добавляемое количество единиц товара
+        :param weight: Добавляемый вес
+        :raises ValueError: если добавление превышает лимиты корзины
+        """
+        if self._count + quantity > self.MAX_ITEMS:
+            raise ValueError(
+                f"Превышено максимальное количество товаров в корзине ({self.MAX_ITEMS} у.е.)."
+            )
 
-        self._products[product.id].extend([product] * quantity)
+        if self._total_weight + weight > self.MAX_WEIGHT:
+            raise ValueError(
+                f"Превышен максимальный вес товаров в корзине ({self.MAX_WEIGHT} у.е.)."
+            )
 
-    def delete_product(self, product_id: int) -> None:
+    def _apply(self, product: Product, delta: int) -> None:
         """
-        Удаляет товар из корзины целиком.
+        Изменяет количество товара в корзине и обновляет накопленные итоги.
 
-        :param product_id: Идентификатор товара
+        Через этот метод проходят все изменения корзины, кроме пакетного
+        add_many, который обновляет строки и итоги за один проход через
+        _apply_lines.
+
+        :param product: Товар (в существующей строке остаётся прежний экземпляр)
+        :param delta: Изменение количества (отрицательное — уменьшение)
+        """
+        line = self._products.get(product.id)
+        if line is None:
+            quantity = delta
+        else:
+            product, quantity = line[0], line[1] + delta
+        if quantity > 0:
+            self._products[product.id] = (product, quantity)
+        else:
+            del self._products[product.id]
+
+        self._count += delta
+        self._total_price += product.price * delta
+        self._total_weight += product.weight * delta
+        self._version += 1
+
+        if self._verify:
+            self.verify_totals()
+
+    def _replace(self, product: Product, quantity: int) -> None:
+        """
+        Заменяет товар и количество строки корзины и обновляет накопленные итоги.
+
+        Лимиты не проверяются: их проверяет вызывающий метод.
+
+        :param product: Новая версия товара с идентификатором товара строки
+        :param quantity: Новое количество товара
         """
-        self._products.pop(product_id, None)
+        old, current = self._products[product.id]
+        self._products[product.id] = (product, quantity)
+        self._count += quantity - current
+        self._total_price += product.price * quantity - old.price * current
+        self._total_weight += product.weight * quantity - old.weight * current
+        self._version += 1
+
+        if self._verify:
+            self.verify_totals()
+
+    def _apply_lines(
+        self, lines: dict[int, tuple[Product, int]], count: int, price: int, weight: int
+    ) -> None:
+        """
+        Добавляет в корзину проверенные строки и обновляет итоги за один проход.
+
+        :param lines: Добавляемые строки по идентификатору товара
+        :param count: Добавляемое количество единиц товара
+        :param price: Добавляемая стоимость
+        :param weight: Добавляемый вес
+        """
+        products = self._products
+        for product_id, (product, quantity) in lines.items():
+            current = products.get(product_id)
+            if current is not None:
+                product, quantity = current[0], current[1] + quantity
+            products[product_id] = (product, quantity)
+
+        self._count += count
+        self._total_price += price
+        self._total_weight += weight
+        self._version += 1
+
+        if self._verify:
+            self.verify_totals()
+
+    def verify_totals(self) -> None:
+        """
+        Сверяет накопленные итоги корзины с полным пересчётом.
+
+        :raises AssertionError: если накопленные итоги расходятся с пересчётом
+        """
+        products = self.list_products
+        expected = (
+            len(products),
+            sum(product.price for product in products),
+            sum(product.weight for product in products),
+        )
+        actual = (self._count, self._total_price, self._total_weight)
+        if actual != expected:
+            raise AssertionError(
+                f"Накопленные итоги корзины {actual} не совпадают с пересчётом {expected}"
+            )
+
+    def iter_products(self) -> "BasketView":
+        """Возвращает представление товаров корзины без копирования (только для чтения)."""
+        return BasketView(self)
 
     @property
     def list_products(self) -> list[Product]:
-        """Возвращает список всех товаров в корзине."""
-        return [item for sublist in self._products.values() for item in sublist]
+        """Возвращает копию списка всех товаров в корзине."""
+        return list(
+            itertools.chain.from_iterable(
+                itertools.repeat(product, quantity)
+                for product, quantity in self._products.values()
+            )
+        )
+
+    @property
+    def total_items(self) -> int:
+        """Возвращает общее количество единиц товара в корзине."""
+        return self._count
 
     @property
     def total_price(self) -> int:
         """Возвращает общую стоимость товаров в корзине."""
-        return sum(product.price for product in self.list_products)
+        return self._total_price
 
     @property
     def total_weight(self) -> int:
         """Возвращает общий вес товаров в корзине."""
-        return sum(product.weight for product in self.list_products)
+        return self._total_weight
+
+    @property
+    def shipping_policy(self) -> ShippingPolicy:
+        """Возвращает тарифы доставки корзины."""
+        return self._shipping_policy
+
+    @property
+    def version(self) -> int:
+        """
+        Возвращает номер версии содержимого корзины.
+
+        Увеличивается при каждом изменении корзины, поэтому может служить
+        ключом внешних кэшей (отрисованной страницы, расчёта налогов).
+        """
+        return self._version
+
+    def _refresh_prices(self) -> tuple[int, int, int]:
+        """Пересчитывает стоимость доставки и итоговую стоимость для текущей версии."""
+        self._cache_misses += 1
+        # Версия читается до итогов: значения, посчитанные во время
+        # параллельного изменения, сохраняются под уже устаревшей версией
+        version = self._version
+        total_price = self._total_price
+        shipping_cost = self._shipping_policy.cost(total_price)
+        self._price_cache = (version, shipping_cost, total_price + shipping_cost)
+        return self._price_cache
+
+    def cache_info(self) -> CacheInfo:
+        """Возвращает количество попаданий и промахов кэша стоимости корзины."""
+        return CacheInfo(self._cache_hits, self._cache_misses)
 
     @property
     def get_shipping_cost(self) -> int:
         """Возвращает стоимость доставки в зависимости от общей стоимости товаров."""
-        if self.total_price == 0:
-            return 0
-        if self.total_price < 500:
-            return 250
-        elif 500 <= self.total_price < 1000:
-            return 100
-        return 0
+        cache = self._price_cache
+        if cache[0] != self._version:
+            cache = self._refresh_prices()
+        else:
+            self._cache_hits += 1
+        return cache[1]
 
     @property
     def get_price(self) -> int:
         """Возвращает итоговую стоимость корзины с учетом доставки."""
-        return self.total_price + self.get_shipping_cost
+        cache = self._price_cache
+        if cache[0] != self._version:
+            cache = self._refresh_prices()
+        else:
+            self._cache_hits += 1
+        return cache[2]
+
+    def price_with(self, promotions: "PromotionPlan") -> int:
+        """
+        Возвращает итоговую стоимость корзины с учётом акций и доставки.
+
+        Скидки применяются до расчёта доставки; подробный расчёт возвращает
+        PromotionPlan.evaluate.
+
+        :param promotions: Скомпилированный набор акций
+        :return: Стоимость товаров со скидками и доставка
+        """
+        return promotions.evaluate(self).price
+
+
+class BasketView:
+    """
+    Представление товаров корзины только для чтения.
+
+    Не копирует содержимое корзины: итерация разворачивает строки корзины
+    на лету. Как и представления словаря, выбрасывает RuntimeError, если
+    корзина изменилась во время итерации.
+    """
+
+    __slots__ = ("_basket",)
+
+    def __init__(self, basket: Basket) -> None:
+        """
+        Инициализация представления.
+
+        :param basket: Корзина, товары которой отображает представление
+        """
+        self._basket = basket
+
+    def __len__(self) -> int:
+        """Возвращает общее количество единиц товара в корзине."""
+        return self._basket._count
+
+    def __iter__(self) -> Iterator[Product]:
+        """
+        Перебирает единицы товара в корзине.
+
+        :raises RuntimeError: если корзина изменилась во время итерации
+        """
+        basket = self._basket
+        version = basket._version
+        for product, quantity in basket._products.values():
+            for _ in itertools.repeat(None, quantity):
+                yield product
+                if basket._version != version:
+                    raise RuntimeError("Корзина изменилась во время итерации")
+
+    def __contains__(self, product: object) -> bool:
+        """Проверяет, лежит ли товар в корзине."""
+        if not isinstance(product, Product):
+            return False
+        line = self._basket._products.get(product.id)
+        return line is not None and line[0] is product
+
+    def __repr__(self) -> str:
+        """Возвращает строковое представление для отладки."""
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,190 @@
+import operator
+from array import array
+from functools import partial
+from itertools import compress
+from typing import Iterable
+
+from product_basket import Product
+
+
+class ProductCatalog:
+    """
+    Колоночный каталог товаров.
+
+    Идентификаторы, цены и веса хранятся в непрерывных массивах ``array('q')``,
+    названия — в отдельном списке. Массовые запросы выполняются по колонкам
+    без создания объектов Product; экземпляры Product создаются только
+    по запросу через ``product()``.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого каталога."""
+        self._ids = array("q")
+        self._prices = array("q")
+        self._weights = array("q")
+        self._names: list[str] = []
+        self._rows: dict[int, int] = {}  # Идентификатор товара -> номер строки
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductCatalog":
+        """
+        Создаёт каталог из существующих товаров с сохранением их идентификаторов.
+
+        :param products: Товары
+        :return: Каталог
+        """
+        catalog = cls()
+        for product in products:
+            catalog._append(product.id, product.name, product.price, product.weight)
+        return catalog
+
+    def add(self, name: str, price: int, weight: int) -> int:
+        """
+        Добавляет товар в каталог.
+
+        Идентификатор выдаётся тем же генератором, что и для Product,
+        поэтому он не пересекается с идентификаторами других товаров.
+
+        :param name: Название товара
+        :param price: Цена товара (натуральное число)
+        :param weight: Вес товара (натуральное число)
+        :return: Идентификатор товара
+        :raises ValueError: если цена или вес меньше 1
+        """
+        if price < 1:
+            raise ValueError("Цена товара должна быть не меньше 1 у.е.")
+        if weight < 1:
+            raise ValueError("Вес товара должен быть не меньше 1 у.е.")
+
+        product_id = next(Product._id_counter)
+        self._append(product_id, name, price, weight)
+        return product_id
+
+    def _append(self, product_id: int, name: str, price: int, weight: int) -> None:
+        """
+        Добавляет строку каталога без проверок.
+
+        :param product_id: Идентификатор товара
+        :param name: Название товара
+        :param price: Цена товара
+        :param weight: Вес товара
+        :raises ValueError: если товар с таким идентификатором уже есть в каталоге
+        """
+        if product_id in self._rows:
+            raise ValueError(
+                f"Товар с идентификатором {product_id} уже есть в каталоге"
+            )
+
+        self._rows[product_id] = len(self._ids)
+        self._ids.append(product_id)
+        self._prices.append(price)
+        self._weights.append(weight)
+        self._names.append(name)
+
+    def __len__(self) -> int:
+        """Возвращает количество товаров в каталоге."""
+        return len(self._ids)
+
+    def __contains__(self, product_id: object) -> bool:
+        """Проверяет, есть ли товар с заданным идентификатором в каталоге."""
+        return product_id in self._rows
+
+    def columns(self) -> tuple[memoryview, memoryview, memoryview]:
+        """
+        Возвращает колонки идентификаторов, цен и весов без копирования.
+
+        Пока представления не освобождены, добавлять товары в каталог нельзя
+        (массив с экспортированным буфером не может менять размер).
+
+        :return: Представления только для чтения над массивами каталога
+        """
+        return (
+            memoryview(self._ids).toreadonly(),
+            memoryview(self._prices).toreadonly(),
+            memoryview(self._weights).toreadonly(),
+        )
+
+    def product(self, product_id: int) -> Product:
+        """
+        Возвращает товар каталога в виде экземпляра Product.
+
+        :param product_id: Идентификатор товара
+        :return: Экземпляр Product с идентификатором из каталога
+        :raises KeyError: если товара нет в каталоге
+        """
+        row = self._rows[product_id]
+        return Product._from_trusted(
+            product_id, self._names[row], self._prices[row], self._weights[row]
+        )
+
+    def price_of(self, product_id: int) -> int:
+        """
+        Возвращает цену товара.
+
+        :param product_id: Идентификатор товара
+        :raises KeyError: если товара нет в каталоге
+        """
+        return self._prices[self._rows[product_id]]
+
+    def weight_of(self, product_id: int) -> int:
+        """
+        Возвращает вес товара.
+
+        :param product_id: Идентификатор товара
+        :raises KeyError: если товара нет в каталоге
+        """
+        return self._weights[self._rows[product_id]]
+
+    def prices_for(self, product_ids: Iterable[int]) -> array:
+        """
+        Возвращает цены товаров в порядке переданных идентификаторов.
+
+        :param product_ids: Идентификаторы товаров
+        :raises KeyError: если какого-либо товара нет в каталоге
+        """
+        rows = map(self._rows.__getitem__, product_ids)
+        return array("q", map(self._prices.__getitem__, rows))
+
+    def weights_for(self, product_ids: Iterable[int]) -> array:
+        """
+        Возвращает веса товаров в порядке переданных идентификаторов.
+
+        :param product_ids: Идентификаторы товаров
+        :raises KeyError: если какого-либо товара нет в каталоге
+        """
+        rows = map(self._rows.__getitem__, product_ids)
+        return array("q", map(self._weights.__getitem__, rows))
+
+    def filter_price(self, min_price: int, max_price: int) -> array:
+        """
+        Возвращает идентификаторы товаров с ценой в диапазоне [min_price, max_price].
+
+        :param min_price: Минимальная цена (включительно)
+        :param max_price: Максимальная цена (включительно)
+        """
+        prices = self._prices
+        mask = map(
+            operator.and_,
+            map(partial(operator.le, min_price), prices),
+            map(partial(operator.ge, max_price), prices),
+        )
+        return array("q", compress(self._ids, mask))
+
+    def sum_prices(self, product_ids: Iterable[int]) -> int:
+        """
+        Возвращает сумму цен товаров (идентификаторы могут повторяться).
+
+        :param product_ids: Идентификаторы товаров
+        :raises KeyError: если какого-либо товара нет в каталоге
+        """
+        rows = map(self._rows.__getitem__, product_ids)
+        return sum(map(self._prices.__getitem__, rows))
+
+    def fits_weight(self, budget: int) -> array:
+        """
+        Возвращает идентификаторы товаров, вес которых не превышает оставшийся запас.
+
+        :param budget: Оставшийся допустимый вес
+        """
+        mask = map(partial(operator.ge, budget), self._weights)
+        return array("q", compress(self._ids, mask))
@@ -0,0 +1,157 @@
+import multiprocessing
+import threading
+from functools import partial
+from itertools import chain
+from typing import Iterator, Protocol
+
+
+class IdSource(Protocol):
+    """Источник идентификаторов, выдающий их диапазонами."""
+
+    def reserve(self, count: int) -> range:
+        """Резервирует ``count`` идентификаторов и возвращает их диапазон."""
+        ...
+
+
+class LocalIdSource:
+    """Источник последовательных идентификаторов в пределах одного процесса."""
+
+    def __init__(self, start: int = 1) -> None:
+        """
+        Инициализация источника.
+
+        :param start: Первый выдаваемый идентификатор
+        """
+        self._next = start
+        self._lock = threading.Lock()
+
+    def reserve(self, count: int) -> range:
+        """
+        Резервирует непрерывный диапазон идентификаторов.
+
+        :param count: Количество идентификаторов
+        :return: Диапазон зарезервированных идентификаторов
+        """
+        with self._lock:
+            start = self._next
+            self._next = start + count
+        return range(start, start + count)
+
+
+class SharedIdSource:
+    """
+    Источник последовательных идентификаторов, общий для нескольких процессов.
+
+    Счётчик хранится в разделяемой памяти (multiprocessing.Value). Источник
+    передаётся дочерним процессам при их создании, например через
+    ``initargs`` ProcessPoolExecutor; блокировка берётся только при
+    резервировании очередного диапазона.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        """
+        Инициализация источника.
+
+        :param start: Первый выдаваемый идентификатор
+        """
+        self._next = multiprocessing.Value("q", start)
+
+    def reserve(self, count: int) -> range:
+        """
+        Резервирует непрерывный диапазон идентификаторов.
+
+        :param count: Количество идентификаторов
+        :return: Диапазон зарезервированных идентификаторов
+        """
+        with self._next.get_lock():
+            start = self._next.value
+            self._next.value = start + count
+        return range(start, start + count)
+
+
+class SnowflakeIdSource:
+    """
+    Источник идентификаторов вида (номер последовательности, номер узла).
+
+    Идентификатор равен ``sequence << node_bits | node_id``, поэтому узлы
+    с разными номерами (например, воркеры gunicorn) выдают непересекающиеся
+    идентификаторы без какой-либо координации между процессами.
+    """
+
+    def __init__(self, node_id: int, node_bits: int = 10) -> None:
+        """
+        Инициализация источника.
+
+        :param node_id: Номер узла (от 0 до 2**node_bits - 1)
+        :param node_bits: Количество младших битов идентификатора под номер узла
+        :raises ValueError: если номер узла не помещается в node_bits битов
+        """
+        if not 0 <= node_id < 1 << node_bits:
+            raise ValueError(
+                f"Номер узла должен быть от 0 до {(1 << node_bits) - 1}, "
+                f"но получен {node_id}"
+            )
+
+        self._node_id = node_id
+        self._step = 1 << node_bits
+        self._sequence = LocalIdSource(start=1)
+
+    def reserve(self, count: int) -> range:
+        """
+        Резервирует диапазон идентификаторов узла (с шагом 2**node_bits).
+
+        :param count: Количество идентификаторов
+        :return: Диапазон зарезервированных идентификаторов
+        """
+        sequence = self._sequence.reserve(count)
+        step = self._step
+        return range(
+            sequence.start * step + self._node_id,
+            sequence.stop * step + self._node_id,
+            step,
+        )
+
+
+class IdAllocator:
+    """
+    Распределитель идентификаторов товаров.
+
+    Берёт у источника блоки по ``block_size`` идентификаторов и выдаёт их
+    локально, поэтому блокировка источника (в том числе межпроцессная)
+    затрагивается один раз на блок, а не на каждый товар.
+    """
+
+    def __init__(self, source: IdSource, block_size: int = 4096) -> None:
+        """
+        Инициализация распределителя.
+
+        :param source: Источник идентификаторов
+        :param block_size: Размер блока, резервируемого у источника за раз
+        :raises ValueError: если размер блока меньше 1
+        """
+        if block_size < 1:
+            raise ValueError("Размер блока идентификаторов должен быть не меньше 1")
+
+        self._source = source
+        self._block_size = block_size
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Возвращает бесконечный итератор идентификаторов.
+
+        Выдача идентификатора внутри блока не выполняет Python-кода;
+        разные итераторы одного распределителя не пересекаются. Блоки
+        резервируются через ``iter(callable, sentinel)``, а не генератором,
+        чтобы итератор можно было безопасно использовать из нескольких потоков.
+        """
+        blocks = iter(partial(self._source.reserve, self._block_size), None)
+        return chain.from_iterable(blocks)
+
+    def reserve(self, count: int) -> range:
+        """
+        Резервирует диапазон идентификаторов у источника в обход текущего блока.
+
+        :param count: Количество идентификаторов
+        :return: Диапазон зарезервированных идентификаторов
+        """
+        return self._source.reserve(count)
@@ -0,0 +1,266 @@
+from bisect import bisect_right
+from typing import Callable, Iterable, Mapping, NamedTuple, Sequence
+
+from product_basket import Basket
+
+# Цель правила: идентификатор товара (int) или название категории (str)
+Target = int | str
+
+
+class PercentOff(NamedTuple):
+    """Скидка в процентах на строки товаров."""
+
+    percent: int  # Размер скидки, от 1 до 100 %
+    targets: tuple[Target, ...]  # Товары и категории, на которые действует скидка
+
+
+class BundleDeal(NamedTuple):
+    """Комплект «buy по цене pay» («3 по цене 2») на каждый товар отдельно."""
+
+    buy: int  # Количество единиц в комплекте
+    pay: int  # Сколько единиц комплекта оплачивается
+    targets: tuple[Target, ...]  # Товары и категории, на которые действует акция
+
+
+class ThresholdDiscount(NamedTuple):
+    """Скидка на корзину при стоимости товаров не меньше порога."""
+
+    min_total: int  # Порог стоимости товаров после скидок на строки
+    amount: int = 0  # Фиксированная скидка, у.е.
+    percent: int = 0  # Скидка в процентах от стоимости товаров
+
+
+Rule = PercentOff | BundleDeal | ThresholdDiscount
+# Скидка на строку: (цена, количество) -> скидка в у.е.
+LineDiscount = Callable[[int, int], int]
+
+
+class PromotionQuote(NamedTuple):
+    """Стоимость корзины с учётом акций."""
+
+    total_price: int  # Стоимость товаров без скидок
+    discount: int  # Сумма скидок
+    shipping_cost: int  # Стоимость доставки по стоимости товаров после скидок
+    price: int  # Итоговая стоимость: товары со скидками и доставка
+
+
+def _percent_off(percent: int) -> LineDiscount:
+    """Возвращает скидку на строку в процентах."""
+
+    def discount(price: int, quantity: int) -> int:
+        return price * quantity * percent // 100
+
+    return discount
+
+
+def _bundle(buy: int, pay: int) -> LineDiscount:
+    """Возвращает скидку на строку по комплектам «buy по цене pay»."""
+    free = buy - pay
+
+    def discount(price: int, quantity: int) -> int:
+        return quantity // buy * free * price
+
+    return discount
+
+
+def _best_of(discounts: Sequence[LineDiscount]) -> LineDiscount:
+    """Возвращает наибольшую из скидок на строку: акции не суммируются."""
+
+    def discount(price: int, quantity: int) -> int:
+        return max(line(price, quantity) for line in discounts)
+
+    return discount
+
+
+def _check_percent(percent: int, low: int) -> None:
+    """Проверяет размер скидки в процентах."""
+    if not isinstance(percent, int) or not low <= percent <= 100:
+        raise ValueError(
+            f"Скидка в процентах должна быть целым числом от {low} до 100, "
+            f"но получено {percent!r}"
+        )
+
+
+def _shipping_basis(total_price: int, subtotal: int) -> int:
+    """
+    Возвращает стоимость товаров, по которой выбирается тариф доставки.
+
+    Скидки, покрывшие всю стоимость непустой корзины, не переводят её в тариф
+    пустой корзины: тариф выбирается не ниже чем для стоимости 1 у.е.
+
+    :param total_price: Стоимость товаров без скидок (0 — корзина пуста)
+    :param subtotal: Стоимость товаров после скидок
+    """
+    return max(subtotal, min(total_price, 1))
+
+
+class PromotionPlan:
+    """
+    Набор акций, скомпилированный в индекс по идентификаторам товаров.
+
+    Правила компилируются один раз: скидки на строки (PercentOff, BundleDeal)
+    раскладываются по идентификаторам товаров (категории раскрываются при
+    компиляции), пороговые скидки (ThresholdDiscount) сортируются по порогу.
+    Расчёт корзины выполняет один поиск в индексе на строку корзины и один
+    двоичный поиск порога, то есть занимает время, пропорциональное числу
+    различных товаров, а не числу правил или единиц товара.
+
+    Порядок применения: скидки на строки, затем пороговая скидка по стоимости
+    после скидок на строки, затем доставка по итоговой стоимости товаров.
+    Непустая корзина не получает доставку пустой корзины, даже если скидки
+    покрыли всю стоимость товаров: доставка считается не меньше чем для
+    стоимости 1 у.е. (см. _shipping_basis).
+    Если на товар действует несколько акций, применяется наибольшая скидка;
+    из пороговых скидок применяется скидка наибольшего достигнутого порога.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Rule],
+        categories: Mapping[str, Iterable[int]] | None = None,
+    ) -> None:
+        """
+        Компилирует набор акций.
+
+        :param rules: Правила акций
+        :param categories: Состав категорий: название -> идентификаторы товаров
+        :raises ValueError: если правило некорректно, ссылается на неизвестную
+            категорию или пороги пороговых скидок повторяются
+        """
+        categories = categories or {}
+        by_product: dict[int, list[LineDiscount]] = {}
+        thresholds: dict[int, tuple[int, int]] = {}
+        for rule in rules:
+            if isinstance(rule, ThresholdDiscount):
+                if not isinstance(rule.min_total, int) or rule.min_total < 1:
+                    raise ValueError("Порог скидки должен быть не меньше 1 у.е.")
+                if not isinstance(rule.amount, int) or rule.amount < 0:
+                    raise ValueError("Фиксированная скидка не может быть отрицательной")
+                _check_percent(rule.percent, 0)
+                if not rule.amount and not rule.percent:
+                    raise ValueError("Пороговая скидка должна быть больше 0")
+                if rule.min_total in thresholds:
+                    raise ValueError(
+                        f"Порог скидки {rule.min_total} у.е. задан несколько раз"
+                    )
+                thresholds[rule.min_total] = (rule.amount, rule.percent)
+                continue
+
+            if isinstance(rule, PercentOff):
+                _check_percent(rule.percent, 1)
+                line = _percent_off(rule.percent)
+            elif isinstance(rule, BundleDeal):
+                if not (
+                    isinstance(rule.buy, int)
+                    and isinstance(rule.pay, int)
+                    and 1 <= rule.pay < rule.buy
+                ):
+                    raise ValueError(
+                        f"Комплект должен оплачиваться частично (1 <= pay < buy), "
+                        f"но получено buy={rule.buy!r}, pay={rule.pay!r}"
+                    )
+                line = _bundle(rule.buy, rule.pay)
+            else:
+                raise TypeError(
+                    f"Ожидалось правило акции, но получен {type(rule).__name__}"
+                )
+            for product_id in self._resolve(rule.targets, categories):
+                by_product.setdefault(product_id, []).append(line)
+
+        self._by_product: dict[int, LineDiscount] = {
+            product_id: lines[0] if len(lines) == 1 else _best_of(lines)
+            for product_id, lines in by_product.items()
+        }
+        self._thresholds = sorted(thresholds)
+        self._threshold_rules = [thresholds[bound] for bound in self._thresholds]
+
+    @staticmethod
+    def _resolve(
+        targets: Iterable[Target], categories: Mapping[str, Iterable[int]]
+    ) -> set[int]:
+        """
+        Раскрывает цели правила в идентификаторы товаров.
+
+        :param targets: Идентификаторы товаров и названия категорий
+        :param categories: Состав категорий
+        :raises ValueError: если категория неизвестна
+        """
+        product_ids: set[int] = set()
+        for target in targets:
+            if isinstance(target, str):
+                if target not in categories:
+                    raise ValueError(f"Неизвестная категория товаров {target!r}")
+                product_ids.update(categories[target])
+            else:
+                product_ids.add(target)
+        return product_ids
+
+    def line_discount(self, product_id: int, price: int, quantity: int) -> int:
+        """
+        Возвращает скидку на строку корзины.
+
+        :param product_id: Идентификатор товара
+        :param price: Цена товара
+        :param quantity: Количество товара
+        :return: Скидка в у.е. (0, если на товар нет акций)
+        """
+        line = self._by_product.get(product_id)
+        return 0 if line is None else line(price, quantity)
+
+    def line_discounts(
+        self,
+        product_ids: Iterable[int],
+        prices: Iterable[int],
+        quantities: Iterable[int],
+    ) -> list[int]:
+        """
+        Возвращает скидки на строки, заданные колонками.
+
+        :param product_ids: Идентификаторы товаров строк
+        :param prices: Цены товаров строк
+        :param quantities: Количества товаров строк
+        :return: Скидка на каждую строку
+        """
+        lines = map(self._by_product.get, product_ids)
+        return [
+            0 if line is None else line(price, quantity)
+            for line, price, quantity in zip(lines, prices, quantities)
+        ]
+
+    def threshold_discount(self, subtotal: int) -> int:
+        """
+        Возвращает пороговую скидку на корзину.
+
+        :param subtotal: Стоимость товаров после скидок на строки
+        :return: Скидка наибольшего достигнутого порога, не больше ``subtotal``
+        """
+        index = bisect_right(self._thresholds, subtotal) - 1
+        if index < 0:
+            return 0
+        amount, percent = self._threshold_rules[index]
+        return min(subtotal, amount + subtotal * percent // 100)
+
+    def evaluate(self, basket: Basket) -> PromotionQuote:
+        """
+        Считает стоимость корзины с учётом акций.
+
+        :param basket: Корзина
+        :return: Стоимость товаров, скидка, доставка и итоговая стоимость
+        """
+        by_product = self._by_product
+        discount = 0
+        for product, quantity in basket.lines():
+            line = by_product.get(product.id)
+            if line is not None:
+                discount += line(product.price, quantity)
+
+        total_price = basket.total_price
+        subtotal = total_price - discount
+        discount += self.threshold_discount(subtotal)
+        subtotal = total_price - discount
+        shipping_cost = basket.shipping_policy.cost(
+            _shipping_basis(total_price, subtotal)
+        )
+        return PromotionQuote(
+            total_price, discount, shipping_cost, subtotal + shipping_cost
+        )
@@ -0,0 +1,399 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+
+from product_basket import Basket, Product, ShippingPolicy
+
+ARENA_FORMAT_MAGIC = int.from_bytes(b"PBSKARNA", "little")
+ARENA_FORMAT_VERSION = 1
+
+# Память арены — массив 64-битных ячеек (выравнивание по 8 байт).
+# Заголовок: сигнатура, версия формата, количество слотов, строк в слоте.
+_HEADER_CELLS = 4
+# Слот корзины: счётчик версии (seqlock, нечётный во время изменения),
+# количество единиц товара, общая стоимость, общий вес, количество строк,
+# затем строки по _LINE_CELLS ячеек
+_SEQ, _COUNT, _PRICE, _WEIGHT, _SIZE = range(5)
+_SLOT_HEADER_CELLS = 5
+# Строка: идентификатор товара, количество, цена и вес единицы товара
+_LINE_CELLS = 4
+# Сколько секунд чтение без блокировки ждёт завершения изменения слота;
+# нечётный счётчик версии дольше этого срока означает, что писатель завершился
+# во время изменения
+READ_TIMEOUT = 1.0
+
+
+def _map_cells(shm: shared_memory.SharedMemory) -> memoryview:
+    """
+    Возвращает память сегмента как массив 64-битных ячеек.
+
+    :param shm: Открытый сегмент разделяемой памяти
+    :raises ValueError: если сегмент закрыт
+    """
+    buf = shm.buf
+    if buf is None:
+        raise ValueError(f"Сегмент разделяемой памяти {shm.name!r} закрыт")
+    return buf.cast("q")
+
+
+class SharedBasketArena:
+    """
+    Корзины в разделяемой памяти (multiprocessing.shared_memory).
+
+    Арена состоит из ``capacity`` слотов фиксированного размера; слот хранит
+    строки корзины (идентификатор товара, количество, цена и вес единицы) и
+    накопленные итоги. Любой процесс читает итоги слота (get_price,
+    get_shipping_cost и т.д.) прямо из разделяемой памяти, без блокировки и
+    десериализации: чтение защищено счётчиком версии слота (seqlock) и
+    повторяется, если во время чтения слот изменялся, но не дольше
+    READ_TIMEOUT секунд. Изменения выполняются
+    под блокировкой полосы слотов (``slot % stripes``), поэтому проверка
+    MAX_ITEMS и MAX_WEIGHT и изменение слота атомарны для всех процессов.
+
+    Арену создаёт главный процесс до запуска воркеров (в gunicorn — при
+    ``preload_app`` или в хуке ``on_starting``); воркеры получают её при
+    ``fork`` или аргументом multiprocessing.Process. Разделяемую память
+    удаляет процесс, создавший арену (unlink или выход из блока ``with``).
+
+    Чтение без блокировки рассчитывает на атомарную запись выровненных
+    64-битных ячеек и сохранение порядка записей (x86-64).
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        stripes: int = 64,
+        basket_cls: type[Basket] = Basket,
+        shipping_policy: ShippingPolicy | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """
+        Создаёт арену в новом сегменте разделяемой памяти.
+
+        :param capacity: Количество слотов (корзин)
+        :param stripes: Количество блокировок, между которыми распределены слоты
+        :param basket_cls: Класс корзины, задающий лимиты и тарифы доставки
+        :param shipping_policy: Тарифы доставки; по умолчанию SHIPPING_POLICY
+            класса ``basket_cls``
+        :param mp_context: Контекст multiprocessing, которым запускаются
+            процессы-воркеры (блокировки создаются в нём); по умолчанию
+            контекст по умолчанию
+        :raises ValueError: если количество слотов или блокировок меньше 1
+        """
+        if capacity < 1:
+            raise ValueError("Количество слотов арены должно быть не меньше 1")
+        if stripes < 1:
+            raise ValueError("Количество блокировок арены должно быть не меньше 1")
+
+        self._max_items = basket_cls.MAX_ITEMS
+        self._max_weight = basket_cls.MAX_WEIGHT
+        self._shipping_policy = shipping_policy or basket_cls.SHIPPING_POLICY
+        self._capacity = capacity
+        # Каждая строка содержит хотя бы одну единицу товара
+        self._stride = _SLOT_HEADER_CELLS + self._max_items * _LINE_CELLS
+        context = mp_context or multiprocessing.get_context()
+        self._locks = [context.Lock() for _ in range(stripes)]
+        size = (_HEADER_CELLS + capacity * self._stride) * 8
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._owner_pid = os.getpid()
+        self._cells = _map_cells(self._shm)
+        self._cells[0] = ARENA_FORMAT_MAGIC
+        self._cells[1] = ARENA_FORMAT_VERSION
+        self._cells[2] = capacity
+        self._cells[3] = self._max_items
+
+    def __getstate__(self) -> dict:
+        """Передаёт дочернему процессу имя сегмента памяти и блокировки."""
+        state = self.__dict__.copy()
+        state["_shm"] = self._shm.name
+        del state["_cells"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Подключается к сегменту памяти арены в дочернем процессе."""
+        self.__dict__.update(state)
+        self._shm = shared_memory.SharedMemory(state["_shm"])
+        self._cells = _map_cells(self._shm)
+        if (self._cells[0], self._cells[1]) != (
+            ARENA_FORMAT_MAGIC,
+            ARENA_FORMAT_VERSION,
+        ):
+            raise ValueError("Неизвестный формат разделяемой памяти арены")
+
+    @property
+    def name(self) -> str:
+        """Возвращает имя сегмента разделяемой памяти."""
+        return self._shm.name
+
+    def __len__(self) -> int:
+        """Возвращает количество слотов арены."""
+        return self._capacity
+
+    def _base(self, slot: int) -> int:
+        """
+        Возвращает номер первой ячейки слота.
+
+        :param slot: Номер слота
+        :raises IndexError: если слота нет в арене
+        """
+        if not 0 <= slot < self._capacity:
+            raise IndexError(f"Слот {slot} вне арены из {self._capacity} слотов")
+        return _HEADER_CELLS + slot * self._stride
+
+    def _read(self, slot: int, start: int, stop: int) -> list[int]:
+        """
+        Читает согласованные значения ячеек слота без блокировки (seqlock).
+
+        :param slot: Номер слота
+        :param start: Первая ячейка относительно начала слота
+        :param stop: Ячейка после последней относительно начала слота
+        :return: Значения ячеек
+        :raises TimeoutError: если слот изменяется дольше READ_TIMEOUT секунд
+            (писатель завершился, не закончив изменение)
+        """
+        base = self._base(slot)
+        cells = self._cells
+        deadline = None
+        while True:
+            version = cells[base + _SEQ]
+            if not version & 1:
+                values = cells[base + start : base + stop].tolist()
+                if cells[base + _SEQ] == version:
+                    return values
+            # Срок ожидания отсчитывается с первого повтора: быстрый путь без часов
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + READ_TIMEOUT
+            elif now > deadline:
+                raise TimeoutError(
+                    f"Слот {slot} изменяется дольше {READ_TIMEOUT} с: процесс, "
+                    f"изменявший его, вероятно, завершился во время изменения"
+                )
+            time.sleep(0)  # Слот изменяется: уступаем процессор писателю
+
+    def _find(self, base: int, product_id: int) -> int | None:
+        """
+        Ищет строку товара в слоте (вызывается под блокировкой слота).
+
+        :param base: Номер первой ячейки слота
+        :param product_id: Идентификатор товара
+        :return: Номер первой ячейки строки или None
+        """
+        cells = self._cells
+        start = base + _SLOT_HEADER_CELLS
+        stop = start + cells[base + _SIZE] * _LINE_CELLS
+        for line in range(start, stop, _LINE_CELLS):
+            if cells[line] == product_id:
+                return line
+        return None
+
+    def add_product(self, slot: int, product: Product, quantity: int = 1) -> None:
+        """
+        Добавляет товар в корзину слота.
+
+        :param slot: Номер слота
+        :param product: Экземпляр класса Product
+        :param quantity: Количество товара (по умолчанию 1)
+        :raises IndexError: если слота нет в арене
+        :raises TypeError: если переданы данные некорректного типа
+        :raises ValueError: если добавление товара превышает лимиты корзины или
+            товар с тем же идентификатором лежит в корзине с другой ценой или весом
+        """
+        Basket._check_line(product, quantity)
+        base = self._base(slot)
+        cells = self._cells
+        with self._locks[slot % len(self._locks)]:
+            line = self._find(base, product.id)
+            if line is not None and (cells[line + 2], cells[line + 3]) != (
+                product.price,
+                product.weight,
+            ):
+                raise ValueError(
+                    f"Товар с идентификатором {product.id} уже лежит в корзине "
+                    f"с ценой {cells[line + 2]} у.е. и весом {cells[line + 3]} у.е., "
+                    f"а добавляется с ценой {product.price} у.е. "
+                    f"и весом {product.weight} у.е."
+                )
+            if cells[base + _COUNT] + quantity > self._max_items:
+                raise ValueError(
+                    f"Превышено максимальное количество товаров в корзине "
+                    f"({self._max_items} у.е.)."
+                )
+            if cells[base + _WEIGHT] + product.weight * quantity > self._max_weight:
+                raise ValueError(
+                    f"Превышен максимальный вес товаров в корзине "
+                    f"({self._max_weight} у.е.)."
+                )
+
+            cells[base + _SEQ] += 1
+            try:
+                if line is None:
+                    size = cells[base + _SIZE]
+                    line = base + _SLOT_HEADER_CELLS + size * _LINE_CELLS
+                    cells[line] = product.id
+                    cells[line + 1] = quantity
+                    cells[line + 2] = product.price
+                    cells[line + 3] = product.weight
+                    cells[base + _SIZE] = size + 1
+                else:
+                    cells[line + 1] += quantity
+                cells[base + _COUNT] += quantity
+                cells[base + _PRICE] += cells[line + 2] * quantity
+                cells[base + _WEIGHT] += cells[line + 3] * quantity
+            finally:
+                cells[base + _SEQ] += 1
+
+    def decrement(self, slot: int, product_id: int, quantity: int = 1) -> None:
+        """
+        Уменьшает количество товара в корзине слота.
+
+        Если количество товара становится равным нулю, строка удаляется.
+
+        :param slot: Номер слота
+        :param product_id: Идентификатор товара
+        :param quantity: На сколько единиц уменьшить количество (по умолчанию 1)
+        :raises IndexError: если слота нет в арене
+        :raises KeyError: если товара нет в корзине
+        :raises TypeError: если количество не является положительным целым числом
+        :raises ValueError: если в корзине меньше единиц товара, чем требуется убрать
+        """
+        if not isinstance(quantity, int) or quantity < 1:
+            raise TypeError(
+                f"Ожидалось положительное целое число, но получено {type(quantity).__name__}"
+            )
+        base = self._base(slot)
+        with self._locks[slot % len(self._locks)]:
+            line = self._find(base, product_id)
+            if line is None:
+                raise KeyError(
+                    f"Товар с идентификатором {product_id} отсутствует в корзине"
+                )
+            current = self._cells[line + 1]
+            if quantity > current:
+                raise ValueError(
+                    f"В корзине {current} ед. товара, нельзя убрать {quantity} ед."
+                )
+            self._remove(base, line, quantity)
+
+    def delete_product(self, slot: int, product_id: int) -> None:
+        """
+        Удаляет товар из корзины слота целиком.
+
+        :param slot: Номер слота
+        :param product_id: Идентификатор товара
+        :raises IndexError: если слота нет в арене
+        """
+        base = self._base(slot)
+        with self._locks[slot % len(self._locks)]:
+            line = self._find(base, product_id)
+            if line is not None:
+                self._remove(base, line, self._cells[line + 1])
+
+    def _remove(self, base: int, line: int, quantity: int) -> None:
+        """
+        Убирает единицы товара из строки (вызывается под блокировкой слота).
+
+        Опустевшая строка заменяется последней строкой слота.
+
+        :param base: Номер первой ячейки слота
+        :param line: Номер первой ячейки строки
+        :param quantity: Количество убираемых единиц
+        """
+        cells = self._cells
+        cells[base + _SEQ] += 1
+        try:
+            cells[base + _COUNT] -= quantity
+            cells[base + _PRICE] -= cells[line + 2] * quantity
+            cells[base + _WEIGHT] -= cells[line + 3] * quantity
+            if cells[line + 1] > quantity:
+                cells[line + 1] -= quantity
+            else:
+                size = cells[base + _SIZE] - 1
+                last = base + _SLOT_HEADER_CELLS + size * _LINE_CELLS
+                if line != last:
+                    cells[line : line + _LINE_CELLS] = cells[last : last + _LINE_CELLS]
+                cells[base + _SIZE] = size
+        finally:
+            cells[base + _SEQ] += 1
+
+    def clear(self, slot: int) -> None:
+        """
+        Очищает корзину слота.
+
+        :param slot: Номер слота
+        :raises IndexError: если слота нет в арене
+        """
+        base = self._base(slot)
+        cells = self._cells
+        with self._locks[slot % len(self._locks)]:
+            cells[base + _SEQ] += 1
+            for field in (_COUNT, _PRICE, _WEIGHT, _SIZE):
+                cells[base + field] = 0
+            cells[base + _SEQ] += 1
+
+    def totals(self, slot: int) -> tuple[int, int, int]:
+        """
+        Возвращает согласованные итоги корзины слота.
+
+        :param slot: Номер слота
+        :return: Количество единиц товара, общая стоимость и общий вес
+        :raises IndexError: если слота нет в арене
+        """
+        count, price, weight = self._read(slot, _COUNT, _SIZE)
+        return count, price, weight
+
+    def total_price(self, slot: int) -> int:
+        """Возвращает общую стоимость товаров корзины слота."""
+        return self._read(slot, _PRICE, _PRICE + 1)[0]
+
+    def get_shipping_cost(self, slot: int) -> int:
+        """Возвращает стоимость доставки корзины слота."""
+        return self._shipping_policy.cost(self.total_price(slot))
+
+    def get_price(self, slot: int) -> int:
+        """Возвращает итоговую стоимость корзины слота с учётом доставки."""
+        total_price = self.total_price(slot)
+        return total_price + self._shipping_policy.cost(total_price)
+
+    def lines(self, slot: int) -> list[tuple[int, int]]:
+        """
+        Возвращает согласованный снимок строк корзины слота.
+
+        :param slot: Номер слота
+        :return: Пары (идентификатор товара, количество)
+        :raises IndexError: если слота нет в арене
+        """
+        values = self._read(slot, _SIZE, self._stride)
+        stop = 1 + values[0] * _LINE_CELLS
+        return list(zip(values[1:stop:_LINE_CELLS], values[2:stop:_LINE_CELLS]))
+
+    def quantity_of(self, slot: int, product_id: int) -> int:
+        """
+        Возвращает количество единиц товара в корзине слота.
+
+        :param slot: Номер слота
+        :param product_id: Идентификатор товара
+        :return: Количество товара или 0, если товара нет в корзине
+        """
+        return dict(self.lines(slot)).get(product_id, 0)
+
+    def close(self) -> None:
+        """Отключает процесс от разделяемой памяти арены."""
+        self._cells.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Удаляет сегмент разделяемой памяти (вызывает создавший арену процесс)."""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedBasketArena":
+        """Возвращает арену для работы в блоке ``with``."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Отключается от арены; создавший её процесс удаляет сегмент памяти."""
+        self.close()
+        if self._owner_pid == os.getpid():
+            self.unlink()
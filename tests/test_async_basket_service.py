@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+from async_basket_service import (
+    AsyncBasketService,
+    ConnectionPool,
+    FakeBackend,
+    ProductLoader,
+)
+from product_basket import Product
+
+
+@pytest.fixture
+def products():
+    """Фикстура набора товаров бэкенда."""
+    return [Product(f"Товар {i}", 100 * (i + 1), i + 1) for i in range(10)]
+
+
+def make_service(
+    backend: FakeBackend, pool_size: int = 4, max_batch_size: int = 100
+) -> AsyncBasketService:
+    """Создаёт сервис поверх бэкенда (вызывается внутри цикла событий)."""
+    loader = ProductLoader(ConnectionPool(backend, pool_size), max_batch_size)
+    return AsyncBasketService(loader)
+
+
+# Позитивные тесты
+def test_concurrent_lookups_are_batched_and_coalesced(products):
+    """Тест объединения одновременных запросов разных корзин в один запрос к бэкенду."""
+    backend = FakeBackend.from_products(products, latency=0.001)
+
+    async def scenario():
+        service = make_service(backend)
+        await asyncio.gather(
+            *(
+                service.add_product(cart_id, products[cart_id % 5].id)
+                for cart_id in range(50)
+            )
+        )
+        return service
+
+    service = asyncio.run(scenario())
+
+    assert (
+        backend.requests == 1
+    ), f"Ожидался 1 запрос к бэкенду, но выполнено {backend.requests}"
+    assert (
+        service.basket(7).lines()[0][0].id == products[2].id
+    ), "В корзину должен попасть запрошенный товар"
+    assert (
+        service.basket(7).total_price == products[2].price
+    ), "Цена товара должна браться из бэкенда"
+
+
+def test_batches_respect_max_batch_size_and_pool(products):
+    """Тест разбиения на пачки и ограничения одновременных запросов размером пула."""
+    backend = FakeBackend.from_products(products, latency=0.001)
+
+    async def scenario():
+        service = make_service(backend, pool_size=2, max_batch_size=2)
+        await asyncio.gather(
+            *(service.add_product(i, product.id) for i, product in enumerate(products))
+        )
+
+    asyncio.run(scenario())
+
+    assert (
+        backend.requests == 5
+    ), f"10 товаров пачками по 2 — 5 запросов, но выполнено {backend.requests}"
+    assert (
+        backend.max_active <= 2
+    ), f"Одновременных запросов не должно быть больше 2, но было {backend.max_active}"
+
+
+def test_sequential_adds_to_one_cart(products):
+    """Тест последовательных добавлений в одну корзину через сервис."""
+    backend = FakeBackend.from_products(products, latency=0)
+
+    async def scenario():
+        service = make_service(backend)
+        await service.add_product("cart", products[0].id, 2)
+        return await service.add_product("cart", products[1].id)
+
+    basket = asyncio.run(scenario())
+
+    assert (
+        basket.total_price == 100 * 2 + 200
+    ), f"Общая стоимость должна быть 400 у.е., но стала {basket.total_price}"
+
+
+def test_price_change_reprices_line(products):
+    """Тест изменения цены и веса в бэкенде между добавлениями товара."""
+    backend = FakeBackend.from_products(products, latency=0)
+    record = backend._records[products[0].id]
+
+    async def scenario():
+        service = make_service(backend)
+        await service.add_product("cart", products[0].id, 2)
+        basket = await service.add_product("cart", products[1].id)
+        version = basket.version
+        backend._records[products[0].id] = record._replace(price=150, weight=2)
+        await service.add_product("cart", products[0].id)
+        return basket, basket.version - version
+
+    basket, versions = asyncio.run(scenario())
+
+    assert [(product.id, quantity) for product, quantity in basket.lines()] == [
+        (products[0].id, 3),
+        (products[1].id, 1),
+    ], "Строка должна остаться на своём месте со всеми единицами товара"
+    assert versions == 1, f"Пересчёт строки — одно изменение, а не {versions}"
+    assert (basket.total_price, basket.total_weight) == (
+        3 * 150 + 200,
+        3 * 2 + 2,
+    ), f"Строка должна пересчитаться по новой цене: {basket.total_price}"
+    basket.verify_totals()
+
+
+# Негативные тесты
+def test_unknown_product(products):
+    """Тест добавления товара, которого нет в бэкенде."""
+    backend = FakeBackend.from_products(products, latency=0)
+
+    async def scenario():
+        await make_service(backend).add_product("cart", -1)
+
+    with pytest.raises(KeyError, match="не найден"):
+        asyncio.run(scenario())
+
+
+def test_out_of_stock(products):
+    """Тест добавления большего количества товара, чем есть на складе."""
+    backend = FakeBackend.from_products(products, stock=3, latency=0)
+
+    async def scenario():
+        service = make_service(backend)
+        await service.add_product("cart", products[0].id, 2)
+        try:
+            await service.add_product("cart", products[0].id, 2)
+        finally:
+            assert (
+                service.basket("cart").total_items == 2
+            ), "Корзина не должна измениться после отказа"
+
+    with pytest.raises(ValueError, match="Недостаточно товара на складе"):
+        asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "quantity, error_type, match",
+    [
+        (31, ValueError, "Превышено максимальное количество товаров в корзине"),
+        ("два", TypeError, "Ожидалось положительное целое число"),
+    ],
+)
+def test_basket_validation_applies(products, quantity, error_type: type, match: str):
+    """Тест, проверяющий, что добавления проходят обычную проверку Basket."""
+    backend = FakeBackend.from_products(products, latency=0)
+
+    async def scenario():
+        await make_service(backend).add_product("cart", products[0].id, quantity)
+
+    with pytest.raises(error_type, match=match):
+        asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "change, match",
+    [
+        ({"price": 0}, "Цена товара .* не меньше 1 у.е., но получено 0"),
+        ({"weight": -1}, "Вес товара .* не меньше 1 у.е., но получено -1"),
+        ({"price": 1.5}, "Цена товара .* целым числом"),
+        ({"name": None}, "Название товара .* строкой"),
+    ],
+)
+def test_invalid_backend_record(products, change: dict, match: str):
+    """Тест отклонения записи бэкенда с некорректными названием, ценой или весом."""
+    backend = FakeBackend.from_products(products, latency=0)
+    record = backend._records[products[0].id]
+    backend._records[products[0].id] = record._replace(**change)
+
+    async def scenario():
+        service = make_service(backend)
+        try:
+            await service.add_product("cart", products[0].id)
+        finally:
+            assert service.basket("cart").total_items == 0, "Корзина не меняется"
+
+    with pytest.raises(ValueError, match=match):
+        asyncio.run(scenario())
+
+
+def test_failed_reprice_keeps_line(products):
+    """Тест: если пересчёт по новому весу превышает лимит, строка не меняется."""
+    backend = FakeBackend.from_products(products, latency=0)
+    record = backend._records[products[0].id]
+
+    async def scenario():
+        service = make_service(backend)
+        await service.add_product("cart", products[0].id, 10)
+        backend._records[products[0].id] = record._replace(weight=20)
+        try:
+            await service.add_product("cart", products[0].id)
+        finally:
+            basket = service.basket("cart")
+            assert (basket.total_items, basket.total_weight) == (
+                10,
+                10,
+            ), f"Строка должна остаться прежней: {basket.lines()}"
+            assert basket.lines()[0][0].weight == 1, "В строке должен остаться вес 1"
+
+    with pytest.raises(ValueError, match="Превышен максимальный вес"):
+        asyncio.run(scenario())
@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from basket_batch import (
+    VIOLATION_MAX_ITEMS,
+    VIOLATION_MAX_WEIGHT,
+    VIOLATION_QUANTITY,
+    BasketBatch,
+)
+from product_basket import Basket, Product, ShippingPolicy
+from product_catalog import ProductCatalog
+
+# Цены около границ тарифов доставки
+PRICES = [1, 99, 250, 499, 500, 999, 1000]
+
+
+def random_baskets(seed: int, count: int) -> list[Basket]:
+    """Строит корзины случайными операциями добавления и удаления через Basket."""
+    rng = random.Random(seed)
+    products = [
+        Product(f"Товар {i}", rng.choice(PRICES), rng.randint(1, 40)) for i in range(20)
+    ]
+    baskets = []
+    for _ in range(count):
+        basket = Basket()
+        for _ in range(rng.randint(0, 12)):
+            product = rng.choice(products)
+            if rng.random() < 0.2:
+                basket.delete_product(product.id)
+                continue
+            try:
+                basket.add_product(product, rng.randint(1, 5))
+            except ValueError:
+                pass
+        baskets.append(basket)
+    return baskets
+
+
+# Позитивные тесты
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar_basket(seed: int):
+    """Тест паритета: результаты пакета совпадают со свойствами каждой корзины."""
+    baskets = random_baskets(seed, 200)
+
+    result = BasketBatch.from_baskets(baskets).evaluate()
+
+    for i, basket in enumerate(baskets):
+        expected = (
+            basket.total_items,
+            basket.total_price,
+            basket.total_weight,
+            basket.get_shipping_cost,
+            basket.get_price,
+            0,
+        )
+        actual = (
+            result.items[i],
+            result.total_price[i],
+            result.total_weight[i],
+            result.shipping_cost[i],
+            result.price[i],
+            result.violations[i],
+        )
+        assert (
+            actual == expected
+        ), f"Корзина №{i}: ожидалось {expected}, получено {actual}"
+
+
+def test_batch_with_regional_shipping_policy():
+    """Тест паритета пакета и корзин с региональной таблицей тарифов доставки."""
+    regional = ShippingPolicy([(1, 400), (300, 150), (900, 0)])
+    baskets = []
+    for basket in random_baskets(7, 100):
+        regional_basket = Basket(shipping_policy=regional)
+        regional_basket.add_many(basket.lines())
+        baskets.append(regional_basket)
+
+    result = BasketBatch.from_baskets(baskets).evaluate(shipping_policy=regional)
+
+    assert result.price == [
+        basket.get_price for basket in baskets
+    ], "Итоги пакета должны совпадать с корзинами с региональными тарифами"
+
+
+def test_batch_empty_baskets():
+    """Тест пакета с пустыми корзинами и пакета без корзин."""
+    result = BasketBatch.from_baskets([Basket(), Basket()]).evaluate()
+
+    assert result.price == [
+        0,
+        0,
+    ], f"Итог пустых корзин должен быть 0, но стал {result.price}"
+    assert (
+        len(BasketBatch([0], [], [], ProductCatalog())) == 0
+    ), "Пакет без корзин должен иметь длину 0"
+
+
+# Граничные тесты
+def test_batch_flags_violations():
+    """Тест флагов нарушений MAX_ITEMS, MAX_WEIGHT и некорректного количества."""
+    catalog = ProductCatalog()
+    light = catalog.add("Флешка", 100, 1)
+    heavy = catalog.add("Гиря", 100, 60)
+
+    batch = BasketBatch(
+        offsets=[0, 1, 2, 3, 5, 6],
+        product_ids=[light, light, heavy, heavy, light, light],
+        quantities=[30, 31, 1, 1, 41, 0],
+        catalog=catalog,
+    )
+    result = batch.evaluate()
+
+    assert result.violations == [
+        0,
+        VIOLATION_MAX_ITEMS,
+        0,
+        VIOLATION_MAX_ITEMS | VIOLATION_MAX_WEIGHT,
+        VIOLATION_QUANTITY,
+    ], f"Неверные флаги нарушений: {result.violations}"
+
+
+# Негативные тесты
+@pytest.mark.parametrize(
+    "offsets, product_ids, quantities",
+    [
+        ([0, 2], [1], [1]),
+        ([1, 1], [1], [1]),
+        ([0, 2, 1], [1], [1]),
+        ([], [], []),
+        ([0, 1], [1], [1, 2]),
+    ],
+)
+def test_batch_rejects_inconsistent_offsets(offsets, product_ids, quantities):
+    """Тест отклонения несогласованных границ корзин и массивов строк."""
+    with pytest.raises(ValueError):
+        BasketBatch(offsets, product_ids, quantities, ProductCatalog())
+
+
+def test_batch_unknown_product():
+    """Тест расчёта пакета с товаром, которого нет в каталоге."""
+    batch = BasketBatch([0, 1], [-1], [1], ProductCatalog())
+
+    with pytest.raises(KeyError):
+        batch.evaluate()
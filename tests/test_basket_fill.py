@@ -0,0 +1,162 @@
+import itertools
+import random
+
+import pytest
+
+from basket_fill import OBJECTIVE_MAX_PRICE, OBJECTIVE_NEXT_TIER
+from product_basket import Basket, Product, ShippingPolicy
+from product_catalog import ProductCatalog
+
+
+class SmallBasket(Basket):
+    """Корзина с маленькими лимитами для полного перебора добавок."""
+
+    MAX_ITEMS = 4
+    MAX_WEIGHT = 12
+
+
+class WholesaleBasket(Basket):
+    """Оптовая корзина: набор из тысяч единиц товара."""
+
+    MAX_ITEMS = 5000
+    MAX_WEIGHT = 10**6
+
+
+def brute_force(basket: Basket, catalog: ProductCatalog, objective: str) -> int | None:
+    """Возвращает стоимость лучшей добавки полным перебором (None — добавки нет)."""
+    ids = list(catalog.filter_price(1, 10**9))
+    need = 0
+    if objective == OBJECTIVE_NEXT_TIER:
+        threshold = basket.shipping_policy.next_cheaper_threshold(basket.total_price)
+        assert threshold is not None, "Тест ожидает более дешёвый тариф доставки"
+        need = threshold - basket.total_price
+    items_left = basket.MAX_ITEMS - basket.total_items
+    weight_left = basket.MAX_WEIGHT - basket.total_weight
+    best = None
+    for units in range(1, items_left + 1):
+        for combo in itertools.combinations_with_replacement(ids, units):
+            price = catalog.sum_prices(combo)
+            weight = sum(catalog.weights_for(combo))
+            if weight > weight_left:
+                continue
+            if objective == OBJECTIVE_NEXT_TIER:
+                if price >= need and (best is None or price < best):
+                    best = price
+            elif best is None or price > best:
+                best = price
+    return best
+
+
+# Позитивные тесты
+@pytest.mark.parametrize("objective", [OBJECTIVE_NEXT_TIER, OBJECTIVE_MAX_PRICE])
+@pytest.mark.parametrize("seed", range(10))
+def test_suggest_fill_matches_brute_force(objective: str, seed: int):
+    """Тест подбора добавки против полного перебора на случайных каталогах."""
+    rng = random.Random(seed)
+    catalog = ProductCatalog()
+    for i in range(7):
+        catalog.add(f"Товар {i}", rng.randint(1, 60), rng.randint(1, 6))
+    basket = SmallBasket(shipping_policy=ShippingPolicy([(1, 50), (100, 0)]))
+    basket.add_product(Product("Основной товар", rng.randint(1, 40), 2))
+
+    suggestion = basket.suggest_fill(catalog, objective)
+
+    expected = brute_force(basket, catalog, objective)
+    assert suggestion.optimal, "Без бюджета времени решение должно быть точным"
+    assert (suggestion.added_price or None) == expected, (
+        f"Стоимость добавки {suggestion.added_price} не совпадает "
+        f"с полным перебором {expected}"
+    )
+    for product, quantity in suggestion.lines:
+        basket.add_product(product, quantity)
+    assert (
+        basket.get_price == suggestion.price
+    ), "Итоговая стоимость после добавки должна совпадать с подсказкой"
+
+
+def test_next_tier_reaches_cheaper_shipping(basket):
+    """Тест подбора минимальной добавки до бесплатной доставки."""
+    catalog = ProductCatalog()
+    catalog.add("Флешка", 100, 1)
+    catalog.add("Кабель", 30, 1)
+    catalog.add("Телевизор", 800, 20)
+    basket.add_product(Product("Чайник", 340, 3))
+
+    suggestion = basket.suggest_fill(catalog)
+
+    assert (
+        suggestion.added_price == 160
+    ), f"Минимальная добавка до 500 у.е. — 160 у.е., но подобрано {suggestion.added_price}"
+    assert (
+        suggestion.price == 600
+    ), f"Итоговая стоимость должна быть 600 у.е., а не {suggestion.price}"
+
+
+# Граничные тесты
+def test_next_tier_deep_search_in_wholesale_basket():
+    """Тест подбора добавки из тысяч дешёвых единиц товара.
+
+    Глубина перебора равна числу единиц в наборе и превышает предел рекурсии.
+    """
+    catalog = ProductCatalog()
+    catalog.add("Скрепка", 2, 1)
+    catalog.add("Кнопка", 3, 2)
+    basket = WholesaleBasket(shipping_policy=ShippingPolicy([(1, 500), (3000, 0)]))
+    basket.add_product(Product("Степлер", 1, 1))
+
+    suggestion = basket.suggest_fill(catalog)
+
+    assert (suggestion.optimal, suggestion.added_price) == (
+        True,
+        2999,
+    ), f"Добавка до 3000 у.е. — 2999 у.е., но подобрано {suggestion.added_price}"
+    assert (
+        sum(quantity for _, quantity in suggestion.lines) < WholesaleBasket.MAX_ITEMS
+    ), "Добавка должна помещаться в лимит количества"
+    assert suggestion.price == 3000, f"Доставка должна стать бесплатной: {suggestion}"
+
+
+def test_no_suggestion_when_shipping_is_cheapest(basket):
+    """Тест подбора, когда доставка уже бесплатная или лимиты исчерпаны."""
+    catalog = ProductCatalog()
+    catalog.add("Флешка", 100, 1)
+    basket.add_product(Product("Телевизор", 1000, 20))
+
+    assert basket.suggest_fill(catalog).lines == [], "Доставка уже бесплатная"
+
+    full = Basket()
+    full.add_product(Product("Гиря", 10, 100))
+    assert (
+        full.suggest_fill(catalog, OBJECTIVE_MAX_PRICE).lines == []
+    ), "Без запаса веса добавка невозможна"
+
+
+def test_time_budget_returns_best_found(basket):
+    """Тест режима с бюджетом времени: возвращается лучшая найденная добавка.
+
+    Сумма 499 у.е. достижима только с тяжёлым товаром за 1 у.е., который
+    не оставляет запаса веса, поэтому доказательство оптимальности требует
+    долгого перебора.
+    """
+    catalog = ProductCatalog()
+    for price in range(2, 400, 2):
+        catalog.add(f"Товар {price}", price, 3)
+    catalog.add("Тяжёлый товар", 1, 97)
+    basket.add_product(Product("Чайник", 1, 1))
+
+    anytime = basket.suggest_fill(catalog, time_budget=0)
+    exact = basket.suggest_fill(catalog)
+
+    assert not anytime.optimal, "Решение к исходу бюджета не должно считаться точным"
+    assert anytime.added_price >= 499, "Добавка должна достигать порога 500 у.е."
+    assert (exact.optimal, exact.added_price) == (
+        True,
+        500,
+    ), f"Точная добавка — 500 у.е., но подобрано {exact.added_price}"
+
+
+# Негативные тесты
+def test_unknown_objective(basket):
+    """Тест подбора с неизвестной целью."""
+    with pytest.raises(ValueError, match="Неизвестная цель подбора"):
+        basket.suggest_fill(ProductCatalog(), "min_weight")
@@ -0,0 +1,121 @@
+import random
+from typing import Callable
+
+import pytest
+
+from basket_batch import BasketBatch
+from basket_fuzz import ReferenceBasket, fuzz, random_ops, run_ops
+from basket_index import BasketIndex
+from basket_metrics import InMemorySink, InstrumentedBasket
+from concurrent_basket import ConcurrentBasket
+from persistent_basket import PersistentBasket
+from product_basket import Basket, Product
+
+ENGINES: dict[str, Callable[[], Basket]] = {
+    "Basket": Basket,
+    "Basket(verify=True)": lambda: Basket(verify=True),
+    "ConcurrentBasket": ConcurrentBasket,
+    "PersistentBasket": PersistentBasket,
+    "IndexedBasket": lambda: BasketIndex().create(1),
+    "InstrumentedBasket": lambda: InstrumentedBasket(sink=InMemorySink()),
+}
+
+
+class OffByOneBasket(Basket):
+    """Корзина с ошибкой на границе: отклоняет вес, равный MAX_WEIGHT."""
+
+    def _check_limits(self, quantity: int, weight: int) -> None:
+        """Проверяет лимиты с ошибкой сравнения веса."""
+        if self._total_weight + weight >= self.MAX_WEIGHT:
+            raise ValueError("Превышен максимальный вес товаров в корзине")
+        super()._check_limits(quantity, weight)
+
+
+# Позитивные тесты
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_matches_reference(engine: str):
+    """Тест реализации корзины против эталона на случайных последовательностях."""
+    failure = fuzz(ENGINES[engine], sequences=300)
+
+    assert failure is None, f"{engine} расходится с эталоном:\n{failure.repro()}"
+
+
+def test_batch_matches_reference():
+    """Тест пакетного расчёта BasketBatch против эталона."""
+    baskets = []
+    references = []
+    for seed in range(100):
+        basket = Basket()
+        reference = ReferenceBasket()
+        products = [Product(f"Товар {i}", 100 * i + 1, i + 1) for i in range(6)]
+        rng = random.Random(seed)
+        for _ in range(15):
+            product, quantity = rng.choice(products), rng.randint(1, 8)
+            for target in (basket, reference):
+                try:
+                    target.add_product(product, quantity)
+                except ValueError:
+                    pass
+        baskets.append(basket)
+        references.append(reference.state([])[4])
+
+    result = BasketBatch.from_baskets(baskets).evaluate()
+
+    assert result.price == references, "Итоговые стоимости пакета расходятся с эталоном"
+
+
+def test_finds_missing_conflict_check():
+    """Тест: fuzz находит корзину, принимающую товар с той же id и другой ценой."""
+
+    class NoConflictBasket(Basket):
+        @staticmethod
+        def _check_same(known: Product, product: Product) -> None:
+            """Пропускает проверку совпадения цены и веса."""
+
+    failure = fuzz(NoConflictBasket, sequences=300)
+
+    assert failure is not None, "Отсутствие проверки должно быть найдено"
+    assert failure.message.endswith(
+        "кандидат — ok, эталон — ValueError"
+    ), f"Неверное расхождение:\n{failure.repro()}"
+
+
+# Граничные тесты
+def test_shrinks_to_minimal_repro():
+    """Тест минимизации расхождения до одной операции на границе веса."""
+    failure = fuzz(OffByOneBasket, sequences=300, seed=100)
+
+    assert failure is not None, "Ошибка на границе веса должна быть найдена"
+    assert (
+        len(failure.ops) == 1
+    ), f"Воспроизведение должно состоять из одной операции:\n{failure.repro()}"
+    assert run_ops(OffByOneBasket, failure.ops), "Минимальная последовательность падает"
+    assert "add_product(products[5], 1)" in failure.repro(), failure.repro()
+
+
+def test_random_ops_are_reproducible():
+    """Тест воспроизводимости последовательностей по зерну."""
+    assert random_ops(random.Random(7), 50) == random_ops(
+        random.Random(7), 50
+    ), "Одно зерно должно давать одну последовательность"
+
+
+# Негативные тесты
+def test_reference_rejects_like_basket():
+    """Тест типов исключений эталона на некорректных операциях."""
+    reference = ReferenceBasket()
+    product = Product("Гиря", 10, 100)
+
+    with pytest.raises(TypeError):
+        reference.add_product(product, 0)
+    with pytest.raises(TypeError):
+        reference.add_many([product])
+    with pytest.raises(KeyError, match="отсутствует в корзине"):
+        reference.set_quantity(product.id, 1)
+    with pytest.raises(TypeError):
+        reference.delete_product([product.id])
+    reference.add_product(product)
+    with pytest.raises(ValueError):
+        reference.add_product(Product("Флешка", 1, 1))
+    with pytest.raises(ValueError, match="другой ценой"):
+        reference.add_product(Product._from_trusted(product.id, "Гиря", 11, 100))
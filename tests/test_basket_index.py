@@ -0,0 +1,189 @@
+import random
+
+import pytest
+
+from basket_index import BasketIndex, IndexedBasket
+from product_basket import Basket, Product
+
+
+def expected_holders(index: BasketIndex) -> dict[int, set[int]]:
+    """Строит обратный индекс полным сканированием корзин."""
+    holders: dict[int, set[int]] = {}
+    for basket_id in index:
+        for product, _ in index.get(basket_id).lines():
+            holders.setdefault(product.id, set()).add(basket_id)
+    return holders
+
+
+# Позитивные тесты
+def test_index_tracks_basket_changes():
+    """Тест обратного индекса на случайных изменениях против сканирования корзин."""
+    rng = random.Random(0)
+    products = [Product(f"Товар {i}", 10 * (i + 1), 1 + i % 4) for i in range(15)]
+    index = BasketIndex()
+    for basket_id in range(30):
+        index.create(basket_id, verify=True)
+
+    for _ in range(2000):
+        basket = index.get(rng.randrange(30))
+        product = rng.choice(products)
+        action = rng.random()
+        try:
+            if action < 0.4:
+                basket.add_product(product, rng.randint(1, 3))
+            elif action < 0.6:
+                basket.add_many([(product, 1), (rng.choice(products), 2)])
+            elif action < 0.75:
+                basket.delete_product(product.id)
+            elif action < 0.8:
+                index.reprice(product.id, rng.randint(1, 100))
+            else:
+                basket.set_quantity(product.id, rng.randint(0, 2))
+        except (KeyError, ValueError):
+            pass
+
+    holders = expected_holders(index)
+    for product in products:
+        assert index.baskets_with(product.id) == holders.get(
+            product.id, set()
+        ), f"Индекс корзин с товаром {product.name} расходится со сканированием"
+
+
+def test_reprice_updates_only_holders():
+    """Тест изменения цены товара в корзинах, где он лежит."""
+    kettle = Product("Чайник", 300, 3)
+    toaster = Product("Тостер", 400, 4)
+    index = BasketIndex()
+    first = index.create(1, verify=True)
+    second = index.create(2, verify=True)
+    first.add_product(kettle, 2)
+    first.add_product(toaster)
+    second.add_product(toaster)
+    version = second.version
+
+    assert index.reprice(kettle.id, 550) == 1, "Обновлена должна быть одна корзина"
+
+    assert (
+        first.total_price == 2 * 550 + 400
+    ), f"Неверная общая стоимость: {first.total_price}"
+    assert first.get_price == 1500, f"Неверная итоговая стоимость: {first.get_price}"
+    assert second.version == version, "Корзина без товара не должна изменяться"
+
+
+def test_reweigh_reports_overweight_baskets():
+    """Тест изменения веса товара с перепроверкой максимального веса."""
+    dumbbell = Product("Гантель", 100, 10)
+    index = BasketIndex()
+    light = index.create(1)
+    heavy = index.create(2)
+    light.add_product(dumbbell)
+    heavy.add_product(dumbbell, 5)
+
+    overweight = index.reweigh(dumbbell.id, 30)
+
+    assert overweight == [2], f"Превышение веса только во 2-й корзине: {overweight}"
+    assert (light.total_weight, heavy.total_weight) == (
+        30,
+        150,
+    ), "Вес корзин должен быть пересчитан"
+
+
+def test_stale_product_gets_current_version():
+    """Тест добавления устаревшего экземпляра товара после изменения цены."""
+    lamp = Product("Лампа", 200, 1)
+    index = BasketIndex()
+    index.create(1).add_product(lamp)
+    index.reprice(lamp.id, 250)
+
+    basket = index.create(2, verify=True)
+    basket.add_product(lamp)
+    basket.add_many([(lamp, 2)])
+
+    assert basket.total_price == 750, "Должна применяться актуальная цена товара"
+    assert index.baskets_with(lamp.id) == {1, 2}, "Обе корзины содержат товар"
+
+
+def test_restore_registers_basket():
+    """Тест восстановления корзины из данных to_bytes с регистрацией в индексе."""
+    kettle, lamp = Product("Чайник", 100, 2), Product("Лампа", 200, 1)
+    source = Basket()
+    source.add_many([(kettle, 2), (lamp, 1)])
+    index = BasketIndex()
+    index.reprice(lamp.id, 250)
+
+    basket = index.restore(1, source.to_bytes(), verify=True)
+
+    assert index.get(1) is basket, "Корзина должна быть зарегистрирована"
+    assert index.baskets_with(kettle.id) == {1}, "Товары корзины попадают в индекс"
+    assert basket.total_price == 450, "Должна применяться актуальная цена товара"
+    assert index.reprice(kettle.id, 150) == 1, "Корзина получает новые цены"
+    assert basket.total_price == 550, f"Неверная стоимость: {basket.total_price}"
+
+
+# Граничные тесты
+def test_change_without_holders_applies_on_add():
+    """Тест изменения цены и веса товара, которого нет ни в одной корзине."""
+    kettle, lamp = Product("Чайник", 100, 2), Product("Лампа", 200, 1)
+    index = BasketIndex()
+
+    assert index.reprice(kettle.id, 500) == 0, "Корзин с товаром нет"
+    assert index.reweigh(kettle.id, 3) == [], "Корзин с товаром нет"
+    assert index.reprice(lamp.id, 250) == 0, "Корзин с товаром нет"
+    basket = index.create(1, verify=True)
+    basket.add_product(kettle)
+    basket.add_many([(kettle, 1), (lamp, 2)])
+
+    assert (basket.total_price, basket.total_weight) == (
+        1500,
+        8,
+    ), "Изменения без корзин должны применяться при добавлении товара"
+    assert index.baskets_with(kettle.id) == {1}, "Корзина должна быть в индексе"
+
+
+def test_removed_basket_leaves_index():
+    """Тест удаления корзины из индекса."""
+    phone = Product("Айфон", 700, 2)
+    index = BasketIndex()
+    basket = index.create(7)
+    basket.add_product(phone)
+
+    index.remove(7)
+    basket.add_product(Product("Чехол", 50, 1))
+
+    assert 7 not in index and len(index) == 0, "Корзина должна быть удалена"
+    assert index.baskets_with(phone.id) == set(), "Индекс не должен ссылаться на неё"
+    assert index.reprice(phone.id, 800) == 0, "Изменять больше нечего"
+    assert basket.total_price == 750, "Удалённая корзина не получает новых цен"
+
+
+# Негативные тесты
+def test_index_invalid_operations():
+    """Тест некорректных операций с индексом."""
+    index = BasketIndex()
+    index.create(1)
+
+    with pytest.raises(ValueError, match="уже зарегистрирована"):
+        index.create(1)
+    with pytest.raises(KeyError, match="отсутствует в индексе"):
+        index.get(2)
+    with pytest.raises(KeyError, match="отсутствует в индексе"):
+        index.remove(2)
+    with pytest.raises(ValueError, match="Цена товара"):
+        index.reprice(1, 0)
+    with pytest.raises(ValueError, match="Вес товара"):
+        index.reweigh(1, 0)
+    with pytest.raises(TypeError, match="BasketIndex.restore"):
+        IndexedBasket.from_buffer(Basket().to_bytes())
+    with pytest.raises(ValueError, match="уже зарегистрирована"):
+        index.restore(1, Basket().to_bytes())
+
+
+def test_rejected_add_does_not_link():
+    """Тест, проверяющий, что отклонённое добавление не попадает в индекс."""
+    weight = Product("Гиря", 10, Basket.MAX_WEIGHT + 1)
+    index = BasketIndex()
+
+    with pytest.raises(ValueError, match="Превышен максимальный вес"):
+        index.create(1).add_product(weight)
+
+    assert index.baskets_with(weight.id) == set(), "Товара нет ни в одной корзине"
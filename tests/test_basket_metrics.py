@@ -0,0 +1,206 @@
+import pickle
+
+import pytest
+
+from basket_metrics import (
+    OUTCOME_OK,
+    REASON_ERROR,
+    REASON_INVALID,
+    REASON_MAX_ITEMS,
+    REASON_MAX_WEIGHT,
+    REASON_NOT_FOUND,
+    REASON_TYPE_ERROR,
+    CallbackSink,
+    Histogram,
+    InMemorySink,
+    InstrumentedBasket,
+    PrometheusSink,
+)
+from product_basket import Basket, Product
+
+
+# Позитивные тесты
+def test_counts_operations_and_rejections():
+    """Тест счётчиков операций по результату и причине отказа."""
+    sink = InMemorySink()
+    basket = InstrumentedBasket(sink=sink)
+    phone = Product("Айфон", 700, 2)
+    basket.add_product(phone, 2)
+    basket.add_many([(Product("Чехол", 50, 1), 1)])
+
+    rejected = [
+        (basket.add_product, (Product("Гиря", 10, 100),), ValueError),
+        (basket.add_product, (phone, Basket.MAX_ITEMS), ValueError),
+        (basket.add_product, ("Айфон",), TypeError),
+        (basket.add_many, ([(phone, 1), (Product("Гиря", 10, 100), 1)],), ValueError),
+        (basket.set_quantity, (-1, 1), KeyError),
+        (basket.decrement, (phone.id, 5), ValueError),
+    ]
+    for method, args, error in rejected:
+        with pytest.raises(error):
+            method(*args)
+
+    expected = {
+        ("add_product", OUTCOME_OK): 1,
+        ("add_product", REASON_MAX_WEIGHT): 1,
+        ("add_product", REASON_MAX_ITEMS): 1,
+        ("add_product", REASON_TYPE_ERROR): 1,
+        ("add_many", OUTCOME_OK): 1,
+        ("add_many", REASON_MAX_WEIGHT): 1,
+        ("set_quantity", REASON_NOT_FOUND): 1,
+        ("decrement", REASON_INVALID): 1,
+    }
+    for (operation, outcome), count in expected.items():
+        actual = sink.count(operation, outcome)
+        assert (
+            actual == count
+        ), f"Неверное количество {operation}/{outcome}: {actual} вместо {count}"
+    assert sink.count("add_product") == 4, "Всего должно быть 4 вызова add_product"
+
+
+def test_pricing_latency_histogram():
+    """Тест гистограммы задержек расчёта стоимости."""
+    sink = InMemorySink()
+    basket = InstrumentedBasket(sink=sink)
+    basket.add_product(Product("Чайник", 300, 3))
+
+    prices = [basket.get_price for _ in range(10)]
+    basket.get_shipping_cost
+
+    histogram = sink.histogram("get_price")
+    assert prices == [550] * 10, f"Неверная итоговая стоимость: {prices[0]}"
+    assert histogram.count == 10, "Должно быть 10 измерений get_price"
+    assert histogram.cumulative()[-1] == (
+        float("inf"),
+        10,
+    ), "Корзина +Inf содержит все наблюдения"
+    assert sink.count("get_shipping_cost") == 1, "Доставка измерена один раз"
+
+
+def test_prometheus_exposition():
+    """Тест выгрузки метрик в текстовом формате Prometheus."""
+    sink = PrometheusSink(namespace="shop", buckets=(0.5, 1.0))
+    sink.record("add_product", OUTCOME_OK, 0.1)
+    sink.record("add_product", OUTCOME_OK, 0.7)
+    sink.record("add_product", REASON_MAX_ITEMS, 2.0)
+
+    lines = sink.exposition().splitlines()
+
+    ok = 'operation="add_product",outcome="ok"'
+    for line in (
+        "# TYPE shop_operations_total counter",
+        'shop_operations_total{operation="add_product",outcome="ok"} 2',
+        'shop_operations_total{operation="add_product",outcome="max_items"} 1',
+        "# TYPE shop_operation_seconds histogram",
+        f'shop_operation_seconds_bucket{{{ok},le="0.5"}} 1',
+        f'shop_operation_seconds_bucket{{{ok},le="1.0"}} 2',
+        f'shop_operation_seconds_bucket{{{ok},le="+Inf"}} 2',
+        'shop_operation_seconds_count{operation="add_product",outcome="max_items"} 1',
+    ):
+        assert line in lines, f"Нет строки {line!r} в выгрузке"
+
+
+def test_callback_sink():
+    """Тест передачи измерений в пользовательскую функцию."""
+    events = []
+    basket = InstrumentedBasket(sink=CallbackSink(lambda *event: events.append(event)))
+
+    basket.add_product(Product("Лампа", 200, 1))
+    basket.delete_product(-1)
+
+    assert [event[:2] for event in events] == [
+        ("add_product", OUTCOME_OK),
+        ("delete_product", OUTCOME_OK),
+    ], f"Неверные события: {events}"
+    assert all(event[2] >= 0 for event in events), "Длительность неотрицательна"
+
+
+# Граничные тесты
+def test_disabled_instrumentation():
+    """Тест корзины без приёмника и подключения приёмника во время работы."""
+    basket = InstrumentedBasket(verify=True)
+    basket.add_product(Product("Тостер", 400, 4), 2)
+    assert basket.get_price == 900, f"Неверная итоговая стоимость: {basket.get_price}"
+
+    sink = InMemorySink()
+    basket.sink = sink
+    basket.decrement(basket.lines()[0][0].id)
+    basket.sink = None
+    basket.get_price
+
+    assert sink.count("decrement") == 1, "Измерена только операция с приёмником"
+    assert sink.count("get_price") == 0, "После отключения измерений нет"
+
+
+def test_subclass_keeps_limits_when_measured():
+    """Тест подкласса InstrumentedBasket: лимиты и методы сохраняются при измерениях."""
+
+    class WholesaleBasket(InstrumentedBasket):
+        MAX_ITEMS = 3000
+        MAX_WEIGHT = 10_000
+
+    sink = InMemorySink()
+    basket = WholesaleBasket(sink=sink)
+    basket.add_product(Product("Скрепка", 1, 1), 2500)
+    basket.sink = None
+    basket.add_product(Product("Кнопка", 1, 1), 400)
+    basket.sink = sink
+    with pytest.raises(ValueError, match="максимальное количество"):
+        basket.add_product(Product("Булавка", 1, 1), 101)
+
+    assert type(basket) is WholesaleBasket, "Класс корзины не должен меняться"
+    assert basket.MAX_ITEMS == 3000, "Лимит подкласса не должен теряться"
+    assert basket.total_items == 2900, f"Неверное количество: {basket.total_items}"
+    assert (
+        sink.count("add_product", OUTCOME_OK),
+        sink.count("add_product", REASON_MAX_ITEMS),
+    ) == (1, 1), "Измеряются только операции с приёмником"
+
+
+def test_measured_basket_pickles():
+    """Тест сериализации измеряемой корзины вместе с приёмником."""
+    basket = InstrumentedBasket(sink=InMemorySink())
+    basket.add_product(Product("Айфон", 700, 2), 2)
+    copy = pickle.loads(pickle.dumps(basket))
+    copy.add_product(Product("Чехол", 50, 1))
+
+    assert type(copy) is InstrumentedBasket, "Класс корзины не должен меняться"
+    assert copy.total_price == 1450, f"Неверная стоимость: {copy.total_price}"
+    assert (
+        copy.sink is not None and copy.sink.count("add_product") == 2
+    ), "Приёмник копии продолжает счёт"
+
+
+def test_histogram_bucket_bounds():
+    """Тест попадания значений на границе в корзину гистограммы."""
+    histogram = Histogram((1.0, 2.0))
+    for value in (1.0, 1.5, 2.0, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [
+        (1.0, 1),
+        (2.0, 3),
+        (float("inf"), 4),
+    ], "Границы корзин включаются в корзину (le)"
+
+
+# Негативные тесты
+def test_unexpected_errors_are_recorded():
+    """Тест: исключения кроме TypeError, ValueError и KeyError тоже измеряются."""
+    sink = InMemorySink()
+    basket = InstrumentedBasket(verify=True, sink=sink)
+    basket.add_product(Product("Чайник", 300, 3))
+    basket._total_price += 1  # Искажение накопленных итогов
+
+    with pytest.raises(AssertionError, match="не совпадают с пересчётом"):
+        basket.add_product(Product("Лампа", 100, 1))
+
+    assert sink.count("add_product", REASON_ERROR) == 1, "Отказ должен быть измерен"
+    assert basket.total_price == 401, f"Неверная стоимость: {basket.total_price}"
+    assert sink.count("total_price") == 1, "Чтение total_price должно измеряться"
+
+
+def test_unknown_histogram():
+    """Тест запроса гистограммы неизмерявшейся операции."""
+    with pytest.raises(KeyError, match="Нет измерений операции"):
+        InMemorySink().histogram("add_product")
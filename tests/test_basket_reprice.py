@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from basket_reprice import decode_chunk, encode_chunk, reprice_all
+from product_basket import Basket, Product, ShippingPolicy
+from product_catalog import ProductCatalog
+
+
+def make_baskets(
+    count: int, seed: int = 0
+) -> tuple[ProductCatalog, list[Product], list[Basket]]:
+    """Создаёт каталог и корзины из его товаров со случайным составом."""
+    rng = random.Random(seed)
+    catalog = ProductCatalog()
+    for i in range(40):
+        catalog.add(f"Товар {i}", rng.randint(1, 300), rng.randint(1, 5))
+    products = [catalog.product(product_id) for product_id in catalog.columns()[0]]
+    baskets = []
+    for _ in range(count):
+        basket = Basket()
+        for product in rng.sample(products, rng.randint(0, 5)):
+            basket.add_product(product, rng.randint(1, 3))
+        baskets.append(basket)
+    return catalog, products, baskets
+
+
+def expected_prices(baskets: list[Basket], catalog: ProductCatalog) -> list[int]:
+    """Пересчитывает корзины последовательно через Basket по ценам каталога."""
+    prices = []
+    for basket in baskets:
+        fresh = Basket()
+        fresh.add_many(
+            (catalog.product(product.id), quantity)
+            for product, quantity in basket.lines()
+        )
+        prices.append(fresh.get_price)
+    return prices
+
+
+# Позитивные тесты
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprice_all_matches_sequential(workers: int):
+    """Тест пересчёта по новым ценам каталога против последовательного расчёта."""
+    _, products, baskets = make_baskets(500)
+    catalog = ProductCatalog.from_products(
+        Product._from_trusted(p.id, p.name, p.price * 2, p.weight) for p in products
+    )
+
+    prices = list(reprice_all(baskets, catalog, workers=workers, chunk_size=37))
+
+    assert prices == expected_prices(
+        baskets, catalog
+    ), "Результаты пересчёта должны совпадать с Basket и идти в порядке корзин"
+
+
+def test_reprice_all_uses_shipping_policy():
+    """Тест пересчёта с заданными тарифами доставки."""
+    catalog, _, baskets = make_baskets(50, seed=1)
+    policy = ShippingPolicy([(0, 7)])
+
+    prices = list(
+        reprice_all(baskets, catalog, workers=2, chunk_size=8, shipping_policy=policy)
+    )
+
+    assert prices == [
+        basket.total_price + 7 for basket in baskets
+    ], "Доставка должна считаться по переданным тарифам"
+
+
+def test_encode_chunk_roundtrip():
+    """Тест компактного кодирования пачки корзин."""
+    _, _, baskets = make_baskets(20, seed=2)
+
+    offsets, product_ids, quantities = decode_chunk(encode_chunk(baskets))
+
+    assert len(offsets) == len(baskets) + 1, "Границ должно быть на одну больше"
+    for i, basket in enumerate(baskets):
+        start, stop = offsets[i], offsets[i + 1]
+        assert list(zip(product_ids[start:stop], quantities[start:stop])) == [
+            (product.id, quantity) for product, quantity in basket.lines()
+        ], f"Строки корзины {i} не совпадают"
+
+
+# Граничные тесты
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprice_all_empty(workers: int):
+    """Тест пересчёта пустого набора корзин и пустых корзин."""
+    catalog = ProductCatalog()
+
+    assert list(reprice_all([], catalog, workers=workers)) == [], "Корзин нет"
+    assert list(reprice_all([Basket()], catalog, workers=workers)) == [
+        Basket().get_price
+    ], "Пустая корзина стоит только доставку"
+
+
+# Негативные тесты
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprice_all_unknown_product(workers: int):
+    """Тест пересчёта корзины с товаром, которого нет в каталоге."""
+    catalog, _, baskets = make_baskets(10, seed=3)
+    baskets[-1].add_product(Product("Снятый с продажи товар", 100, 1))
+
+    with pytest.raises(KeyError):
+        list(reprice_all(baskets, catalog, workers=workers, chunk_size=3))
+
+
+@pytest.mark.parametrize(
+    "kwargs, match",
+    [
+        ({"workers": 0}, "процессов"),
+        ({"workers": -1}, "процессов"),
+        ({"chunk_size": 0}, "Размер пачки"),
+    ],
+)
+def test_reprice_all_invalid_arguments(kwargs: dict, match: str):
+    """Тест пересчёта с некорректными параметрами."""
+    with pytest.raises(ValueError, match=match):
+        reprice_all([], ProductCatalog(), **kwargs)
@@ -0,0 +1,194 @@
+import pytest
+
+from basket_store import BasketStore, StoredBasket
+from product_basket import Basket, Product, ShippingPolicy
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Фикстура пустого хранилища корзин во временном файле."""
+    with BasketStore(tmp_path / "baskets.bin") as store:
+        yield store
+
+
+def make_basket(*lines: tuple[Product, int]) -> Basket:
+    """Создаёт корзину с заданными строками."""
+    basket = Basket()
+    basket.add_many(lines)
+    return basket
+
+
+# Позитивные тесты
+def test_get_returns_lazily_hydrated_basket(store):
+    """Тест загрузки корзины: итоги доступны сразу, строки разбираются по требованию."""
+    kettle = Product("Чайник", 300, 3)
+    store.put(1, make_basket((kettle, 2)))
+
+    basket = store.get(1)
+
+    assert not basket.is_hydrated, "Строки не должны разбираться до обращения к ним"
+    assert (
+        basket.get_price == 600 + 100
+    ), f"Итоговая стоимость должна быть 700 у.е., но стала {basket.get_price}"
+    assert not basket.is_hydrated, "Итоги должны читаться без разбора строк"
+    assert [
+        (product.id, product.name, quantity) for product, quantity in basket.lines()
+    ] == [(kettle.id, "Чайник", 2)], f"Неверные строки корзины: {basket.lines()}"
+    basket.add_product(kettle)
+    basket.verify_totals()
+
+
+def test_put_overwrite_delete_and_reopen(tmp_path):
+    """Тест перезаписи и удаления корзин с восстановлением индекса после открытия."""
+    path = tmp_path / "baskets.bin"
+    phone = Product("Айфон", 700, 2)
+    with BasketStore(path, compact_ratio=1) as store:
+        store.put(1, make_basket((phone, 1)))
+        store.put(2, make_basket((phone, 2)))
+        store.put(1, make_basket((phone, 3)))
+        store.delete(2)
+        store.put(3, Basket())
+
+    with BasketStore(path) as store:
+        assert sorted(store) == [
+            1,
+            3,
+        ], f"Ожидались корзины 1 и 3, но есть {list(store)}"
+        assert (
+            store.get(1).total_items == 3
+        ), "Должна загружаться последняя версия корзины"
+        assert store.get(3).lines() == [], "Пустая корзина должна сохраняться"
+        assert 2 not in store, "Удалённая корзина не должна восстанавливаться"
+        assert (
+            store.garbage_ratio > 0
+        ), "Перезаписанные и удалённые записи должны учитываться как мусор"
+
+
+def test_compaction_keeps_live_records(tmp_path):
+    """Тест уплотнения: файл уменьшается, актуальные корзины сохраняются."""
+    path = tmp_path / "baskets.bin"
+    flash_drive = Product("Флешка", 100, 1)
+    with BasketStore(path, compact_ratio=1) as store:
+        for quantity in range(1, 11):
+            store.put(7, make_basket((flash_drive, quantity)))
+        size_before = path.stat().st_size
+
+        store.compact()
+
+        assert (
+            path.stat().st_size < size_before
+        ), "Уплотнение должно уменьшить размер файла"
+        assert store.garbage_ratio == 0, "После уплотнения мусора быть не должно"
+        assert store.get(7).total_items == 10, "Должна сохраниться последняя версия"
+        store.put(8, make_basket((flash_drive, 1)))
+        assert store.get(8).total_price == 100, "Запись после уплотнения"
+
+
+def test_automatic_compaction_bounds_garbage(tmp_path):
+    """Тест периодического уплотнения при превышении доли мусора."""
+    with BasketStore(tmp_path / "baskets.bin", compact_ratio=0.5) as store:
+        basket = make_basket((Product("Вентилятор", 150, 5), 1))
+        for _ in range(100):
+            store.put(1, basket)
+            assert store.garbage_ratio <= 0.5, "Доля мусора не должна превышать 0.5"
+
+        assert len(store) == 1, f"В хранилище должна быть 1 корзина, а не {len(store)}"
+
+
+def test_iter_prices_streams_totals(tmp_path):
+    """Тест потокового расчёта итоговых стоимостей по всему хранилищу."""
+    policy = ShippingPolicy([(1, 50)])
+    lamp = Product("Лампа", 200, 1)
+    with BasketStore(tmp_path / "baskets.bin", shipping_policy=policy) as store:
+        for cart_id in range(1, 6):
+            store.put(cart_id, make_basket((lamp, cart_id)))
+        store.delete(3)
+        store.put(4, make_basket((lamp, 1)))
+
+        prices = dict(store.iter_prices())
+
+        assert prices == {
+            1: 250,
+            2: 450,
+            4: 250,
+            5: 1050,
+        }, f"Неверные итоговые стоимости: {prices}"
+        assert store.sum_prices() == sum(prices.values()), "Неверная сумма стоимостей"
+        assert (
+            store.get(5).get_price == 1050
+        ), "Тарифы хранилища должны применяться к загруженной корзине"
+
+
+def test_stored_basket_from_buffer():
+    """Тест восстановления StoredBasket из данных to_bytes."""
+    kettle = Product("Чайник", 300, 3)
+    policy = ShippingPolicy([(1, 50)])
+
+    basket = StoredBasket.from_buffer(
+        make_basket((kettle, 2)).to_bytes(), verify=True, shipping_policy=policy
+    )
+    basket.add_product(kettle)
+
+    assert basket.is_hydrated, "Строки должны быть разобраны сразу"
+    assert (
+        basket.get_price == 900 + 50
+    ), f"Итоговая стоимость должна быть 950 у.е., но стала {basket.get_price}"
+    assert [
+        (product.id, product.name, quantity) for product, quantity in basket.lines()
+    ] == [(kettle.id, "Чайник", 3)], f"Неверные строки корзины: {basket.lines()}"
+
+
+# Граничные тесты
+def test_truncated_tail_is_discarded(tmp_path):
+    """Тест открытия файла с обрезанной последней записью (сбой во время записи)."""
+    path = tmp_path / "baskets.bin"
+    with BasketStore(path) as store:
+        store.put(1, make_basket((Product("Мышь", 50, 1), 1)))
+        store.put(2, make_basket((Product("Коврик", 20, 1), 1)))
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with BasketStore(path) as store:
+        assert list(store) == [
+            1
+        ], f"Должна остаться только корзина 1, а не {list(store)}"
+        store.put(3, make_basket((Product("Кабель", 10, 1), 1)))
+        assert store.get(3).total_price == 10, "Запись после обрезанного хвоста"
+
+
+# Негативные тесты
+def test_missing_cart(store):
+    """Тест загрузки и удаления корзины, которой нет в хранилище."""
+    with pytest.raises(KeyError, match="отсутствует в хранилище"):
+        store.get(404)
+    with pytest.raises(KeyError, match="отсутствует в хранилище"):
+        store.delete(404)
+
+
+def test_iter_prices_detects_compaction(store):
+    """Тест перебора стоимостей, во время которого хранилище уплотнилось."""
+    basket = make_basket((Product("Стул", 500, 5), 1))
+    store.put(1, basket)
+    store.put(2, basket)
+    prices = store.iter_prices()
+    next(prices)
+
+    store.compact()
+
+    with pytest.raises(RuntimeError, match="уплотнилось во время перебора"):
+        next(prices)
+
+
+@pytest.mark.parametrize("content", [b"NOTASTORE", b"PB"])
+def test_unknown_file_format(tmp_path, content: bytes):
+    """Тест открытия файла, который не является хранилищем корзин."""
+    path = tmp_path / "baskets.bin"
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError, match="Неизвестный формат файла"):
+        BasketStore(path)
+
+
+def test_invalid_compact_ratio(tmp_path):
+    """Тест создания хранилища с некорректной долей мусора для уплотнения."""
+    with pytest.raises(ValueError, match="в диапазоне"):
+        BasketStore(tmp_path / "baskets.bin", compact_ratio=0)
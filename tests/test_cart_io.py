@@ -0,0 +1,203 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from cart_io import (
+    CART_FIELDS,
+    CartSummary,
+    PipelineStats,
+    RejectedLine,
+    RejectionLog,
+    read_carts,
+    run_pipeline,
+    summarize,
+    write_summaries,
+)
+from product_basket import Basket, BatchLineError, Product
+
+
+class UnnumberedBatchBasket(Basket):
+    """Корзина, чей add_many не сообщает номер отказавшей строки пакета."""
+
+    def add_many(self, lines) -> None:
+        """Добавляет пакет строк; ошибка строки — ValueError без failed_line."""
+        try:
+            super().add_many(lines)
+        except BatchLineError as error:
+            raise ValueError(*error.args) from None
+
+
+ROWS = [
+    ("1", 10, "Чайник", 300, 3, 2),
+    ("1", 11, "Гиря", 10, 100, 1),  # Превышает MAX_WEIGHT
+    ("1", 12, "Лампа", 200, 1, 1),
+    ("2", 10, "Чайник", 0, 3, 1),  # Нулевая цена
+    ("3", 13, "Фен", 500, 2, "x"),  # Некорректное количество
+    ("3", 14, "Тостер", 400, 4, 1),
+]
+
+
+def write_csv(path: Path, rows: list[tuple]) -> Path:
+    """Записывает выгрузку заказов в формате CSV."""
+    lines = [",".join(CART_FIELDS)] + [",".join(map(str, row)) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def write_jsonl(path: Path, rows: list[tuple]) -> Path:
+    """Записывает выгрузку заказов в формате JSONL."""
+    lines = [
+        json.dumps(dict(zip(CART_FIELDS, row)), ensure_ascii=False) for row in rows
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+# Позитивные тесты
+@pytest.mark.parametrize("writer", [write_csv, write_jsonl])
+def test_pipeline_summaries_and_rejections(tmp_path: Path, writer):
+    """Тест итогов корзин и отклонённых строк для CSV и JSONL."""
+    suffix = ".csv" if writer is write_csv else ".jsonl"
+    header = 1 if writer is write_csv else 0  # Строка заголовка CSV
+    source = writer(tmp_path / f"orders{suffix}", ROWS)
+    rejected: list[RejectedLine] = []
+
+    stats = run_pipeline(source, tmp_path / "summaries.jsonl", rejected.append)
+
+    expected = Basket()
+    expected.add_many([(Product("Чайник", 300, 3), 2), (Product("Лампа", 200, 1), 1)])
+    summaries = [
+        json.loads(line)
+        for line in (tmp_path / "summaries.jsonl").read_text("utf-8").splitlines()
+    ]
+    assert [s["cart_id"] for s in summaries] == ["1", "3"], f"Корзины: {summaries}"
+    assert summaries[0]["price"] == expected.get_price, "Итог корзины 1 неверен"
+    assert summaries[1]["total_weight"] == 4, "В корзине 3 должен остаться тостер"
+    assert sorted(line.line_number - header for line in rejected) == [
+        2,
+        4,
+        5,
+    ], f"Отклонены не те строки: {rejected}"
+    assert (stats.rows, stats.carts, stats.rejected) == (
+        6,
+        2,
+        3,
+    ), f"Неверные счётчики: {stats}"
+    assert stats.rows_per_second > 0, "Скорость обработки должна быть посчитана"
+
+
+def test_read_carts_is_lazy(tmp_path: Path):
+    """Тест потокового чтения: корзина отдаётся до чтения следующих строк."""
+    rows = [(str(cart), cart, "Товар", 10, 1, 1) for cart in range(1000)]
+    stats = PipelineStats()
+
+    carts = read_carts(write_csv(tmp_path / "orders.csv", rows), stats=stats)
+    cart_id, basket = next(carts)
+
+    assert (cart_id, basket.total_price) == ("0", 10), "Первая корзина неверна"
+    assert stats.rows == 2, f"Прочитано {stats.rows} строк вместо 2"
+    assert sum(1 for _ in carts) == 999, "Остальные корзины должны быть прочитаны"
+
+
+def test_write_summaries_csv_and_rejection_log(tmp_path: Path):
+    """Тест записи итогов в CSV и журнала отклонённых строк."""
+    source = write_jsonl(tmp_path / "orders.jsonl", ROWS)
+
+    with RejectionLog(tmp_path / "rejected.jsonl") as log:
+        count = write_summaries(
+            tmp_path / "summaries.csv", summarize(read_carts(source, log))
+        )
+
+    lines = (tmp_path / "summaries.csv").read_text("utf-8").splitlines()
+    log_lines = (tmp_path / "rejected.jsonl").read_text("utf-8").splitlines()
+    assert count == 2, f"Записано {count} корзин вместо 2"
+    assert lines[0] == ",".join(CartSummary._fields), "Неверный заголовок CSV"
+    assert lines[2] == "3,1,400,4,250,650", f"Неверная строка итогов: {lines[2]}"
+    assert json.loads(log_lines[0])["line_number"] == 4, "Неверный журнал отказов"
+
+
+# Граничные тесты
+@pytest.mark.parametrize("basket_cls", [Basket, UnnumberedBatchBasket])
+def test_conflicting_product_rows_are_rejected(tmp_path: Path, basket_cls):
+    """Тест: позиция с product_id товара корзины, но другой ценой, отклоняется."""
+    rows = [
+        ("1", 10, "Чайник", 300, 3, 1),
+        ("1", 10, "Чайник", 350, 3, 1),  # Другая цена того же товара
+        ("1", 11, "Гиря", 10, 100, 1),  # Превышает MAX_WEIGHT
+        ("1", 10, "Чайник", 300, 3, 2),
+    ]
+    rejected: list[RejectedLine] = []
+
+    carts = list(
+        read_carts(
+            write_csv(tmp_path / "orders.csv", rows),
+            rejected.append,
+            basket_cls=basket_cls,
+        )
+    )
+
+    basket = carts[0][1]
+    assert (basket.total_items, basket.total_price) == (
+        3,
+        900,
+    ), f"В корзине должны остаться 3 чайника по 300 у.е.: {basket.total_price}"
+    assert [line.line_number for line in rejected] == [
+        3,
+        4,
+    ], f"Отклонены не те строки: {rejected}"
+    assert "уже лежит в корзине" in rejected[0].reason, rejected[0].reason
+
+
+def test_empty_and_header_only_input(tmp_path: Path):
+    """Тест пустой выгрузки и выгрузки только с заголовком."""
+    (tmp_path / "empty.jsonl").write_text("\n", encoding="utf-8")
+    header_only = write_csv(tmp_path / "header.csv", [])
+
+    assert list(read_carts(tmp_path / "empty.jsonl")) == [], "Корзин быть не должно"
+    assert list(read_carts(header_only)) == [], "Корзин быть не должно"
+
+
+def test_repeated_cart_id_splits_carts(tmp_path: Path):
+    """Тест: строки корзины должны идти подряд, иначе корзина делится."""
+    rows = [("1", 1, "А", 10, 1, 1), ("2", 2, "Б", 10, 1, 1), ("1", 3, "В", 10, 1, 1)]
+
+    carts = [cart_id for cart_id, _ in read_carts(write_csv(tmp_path / "o.csv", rows))]
+
+    assert carts == ["1", "2", "1"], f"Ожидались три корзины, получены {carts}"
+
+
+# Негативные тесты
+def test_unknown_format(tmp_path: Path):
+    """Тест неизвестного расширения файла."""
+    with pytest.raises(ValueError, match="Неизвестный формат файла"):
+        list(read_carts(tmp_path / "orders.xml"))
+
+
+def test_csv_without_required_fields(tmp_path: Path):
+    """Тест CSV без обязательных полей в заголовке."""
+    source = tmp_path / "orders.csv"
+    source.write_text("cart_id,name\n1,Чайник\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="product_id, price, weight, quantity"):
+        list(read_carts(source))
+
+
+def test_malformed_lines_are_rejected(tmp_path: Path):
+    """Тест отклонения повреждённых строк JSONL и CSV."""
+    jsonl = tmp_path / "orders.jsonl"
+    jsonl.write_text('{"cart_id": 1\n[1, 2]\n{"cart_id": 1}\n', encoding="utf-8")
+    csv_file = tmp_path / "orders.csv"
+    csv_file.write_text(",".join(CART_FIELDS) + "\n1,2,3\n", encoding="utf-8")
+    rejected: list[RejectedLine] = []
+
+    assert list(read_carts(jsonl, rejected.append)) == [], "Корзин быть не должно"
+    assert list(read_carts(csv_file, rejected.append)) == [], "Корзин быть не должно"
+    assert [line.line_number for line in rejected] == [
+        1,
+        2,
+        3,
+        2,
+    ], f"Отклонены не те строки: {rejected}"
+    assert "Нет полей" in rejected[2].reason, rejected[2].reason
+    assert "Ожидалось 6 полей" in rejected[3].reason, rejected[3].reason
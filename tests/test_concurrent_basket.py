@@ -0,0 +1,134 @@
+import threading
+import time
+
+import pytest
+
+from concurrent_basket import ConcurrentBasket
+from product_basket import Basket, Product
+
+THREADS = 16
+
+
+class SlowBasket(Basket):
+    """Корзина, уступающая процессор между проверкой лимитов и изменением."""
+
+    def _check_limits(self, quantity: int, weight: int) -> None:
+        super()._check_limits(quantity, weight)
+        time.sleep(0.01)
+
+
+class SlowConcurrentBasket(ConcurrentBasket):
+    """Потокобезопасная корзина с той же задержкой между проверкой и изменением."""
+
+    def _check_limits(self, quantity: int, weight: int) -> None:
+        super()._check_limits(quantity, weight)
+        time.sleep(0.01)
+
+
+def add_concurrently(basket: Basket, product: Product, quantity: int) -> int:
+    """Добавляет товар из нескольких потоков одновременно и возвращает число отказов."""
+    barrier = threading.Barrier(THREADS)
+    rejected = []
+
+    def worker() -> None:
+        barrier.wait()
+        try:
+            basket.add_product(product, quantity)
+        except ValueError:
+            rejected.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(rejected)
+
+
+# Позитивные тесты
+def test_concurrent_basket_behaves_like_basket():
+    """Тест, проверяющий, что однопоточное поведение совпадает с Basket."""
+    basket = ConcurrentBasket(verify=True)
+    kettle = Product("Чайник", 300, 3)
+    toaster = Product("Тостер", 400, 4)
+
+    basket.add_many([(kettle, 2), (toaster, 1)])
+    basket.decrement(kettle.id)
+    basket.set_quantity(toaster.id, 3)
+    basket.delete_product(kettle.id)
+
+    assert basket.lines() == [
+        (toaster, 3)
+    ], f"Ожидалась строка (тостер, 3), но получены {basket.lines()}"
+    assert (
+        basket.get_price == 1200
+    ), f"Итоговая стоимость должна быть 1200 у.е., но стала {basket.get_price}"
+
+
+# Граничные тесты
+@pytest.mark.parametrize(
+    "product, quantity, accepted",
+    [
+        (Product("Клавиатура", 50, 1), 7, 4),
+        (Product("Обогреватель", 200, 10), 3, 3),
+    ],
+)
+def test_concurrent_adds_never_exceed_limits(
+    product: Product, quantity: int, accepted: int
+):
+    """Стресс-тест: одновременные добавления не превышают MAX_ITEMS и MAX_WEIGHT.
+
+    Между проверкой лимитов и изменением корзины поток уступает процессор,
+    поэтому без блокировки все потоки прошли бы проверку одновременно.
+    """
+    basket = SlowConcurrentBasket()
+
+    rejected = add_concurrently(basket, product, quantity)
+
+    assert (
+        THREADS - rejected == accepted
+    ), f"Должно быть принято {accepted} добавлений, но принято {THREADS - rejected}"
+    assert basket.total_items <= Basket.MAX_ITEMS, "Превышено MAX_ITEMS"
+    assert basket.total_weight <= Basket.MAX_WEIGHT, "Превышено MAX_WEIGHT"
+    basket.verify_totals()
+
+
+def test_plain_basket_overfills_under_contention():
+    """Тест, показывающий гонку проверки лимитов в Basket без блокировки."""
+    basket = SlowBasket()
+
+    add_concurrently(basket, Product("Клавиатура", 50, 1), 7)
+
+    assert (
+        basket.total_items > Basket.MAX_ITEMS
+    ), "Без блокировки одновременные добавления должны переполнить корзину"
+
+
+def test_concurrent_mixed_operations_keep_totals_consistent():
+    """Стресс-тест: смешанные операции из многих потоков сохраняют итоги."""
+    basket = ConcurrentBasket()
+    products = [Product(f"Товар {i}", 10 * (i + 1), 1) for i in range(5)]
+    observed_items = []
+
+    def worker(index: int) -> None:
+        product = products[index % len(products)]
+        for _ in range(200):
+            try:
+                basket.add_product(product, 2)
+            except ValueError:
+                pass
+            if basket.quantity_of(product.id):
+                try:
+                    basket.decrement(product.id)
+                except (KeyError, ValueError):
+                    pass
+            observed_items.append(basket.total_items)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(observed_items) <= Basket.MAX_ITEMS, "Превышено MAX_ITEMS"
+    basket.verify_totals()
@@ -0,0 +1,173 @@
+import random
+
+import pytest
+
+from persistent_basket import PersistentBasket, PersistentMap
+from product_basket import Basket, Product
+
+
+class CollidingKey:
+    """Ключ с заданным хэшем для проверки коллизий в PersistentMap."""
+
+    def __init__(self, name: str, hash_: int) -> None:
+        self.name = name
+        self.hash = hash_
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CollidingKey) and self.name == other.name
+
+    def __repr__(self) -> str:
+        return f"CollidingKey({self.name!r}, {self.hash})"
+
+
+# Позитивные тесты
+def test_persistent_map_matches_dict():
+    """Тест PersistentMap на случайных операциях против dict, включая коллизии."""
+    rng = random.Random(0)
+    keys = [rng.randrange(-(2**70), 2**70) for _ in range(300)]
+    keys += [CollidingKey(f"k{i}", i % 3) for i in range(20)]
+    expected: dict = {}
+    current = PersistentMap()
+    versions = [(current, dict(expected))]
+
+    for step in range(3000):
+        key = rng.choice(keys)
+        if rng.random() < 0.6:
+            current = current.set(key, step)
+            expected[key] = step
+        else:
+            current = current.delete(key)
+            expected.pop(key, None)
+        versions.append((current, dict(expected)))
+
+    for persistent, snapshot in versions[::100]:
+        assert len(persistent) == len(snapshot), "Размер отображения не совпадает"
+        assert dict(persistent.items()) == snapshot, "Содержимое не совпадает с dict"
+        assert all(
+            persistent.get(key, "нет") == snapshot.get(key, "нет") for key in keys
+        ), "get() не совпадает с dict"
+
+
+def test_persistent_basket_matches_basket():
+    """Тест, проверяющий, что PersistentBasket ведёт себя как Basket."""
+    products = [Product(f"Товар {i}", 10 * (i + 1), 1 + i % 3) for i in range(8)]
+    basket = Basket(verify=True)
+    persistent = PersistentBasket(verify=True)
+
+    for target in (basket, persistent):
+        target.add_product(products[0], 2)
+        target.add_many([(products[1], 1), (products[2], 3), (products[1], 1)])
+        target.set_quantity(products[2].id, 1)
+        target.decrement(products[0].id)
+        target.delete_product(products[1].id)
+        target.add_product(products[5])
+
+    assert sorted(
+        (product.id, quantity) for product, quantity in persistent.lines()
+    ) == sorted(
+        (product.id, quantity) for product, quantity in basket.lines()
+    ), "Строки корзин должны совпадать"
+    assert (
+        persistent.total_items,
+        persistent.total_price,
+        persistent.total_weight,
+        persistent.get_price,
+    ) == (
+        basket.total_items,
+        basket.total_price,
+        basket.total_weight,
+        basket.get_price,
+    ), "Итоги корзин должны совпадать"
+
+
+def test_snapshot_is_independent():
+    """Тест снимка корзины: изменения снимка и корзины не влияют друг на друга."""
+    kettle = Product("Чайник", 300, 3)
+    toaster = Product("Тостер", 400, 4)
+    basket = PersistentBasket()
+    basket.add_product(kettle)
+
+    preview = basket.snapshot()
+    preview.add_product(toaster, 2)
+    basket.delete_product(kettle.id)
+
+    assert preview.lines() and preview.total_price == 300 + 800, "Снимок изменён"
+    assert basket.lines() == [], "Корзина не должна видеть изменения снимка"
+
+    basket.restore(preview)
+    assert basket.total_price == 1100, "Корзина должна вернуться к снимку"
+    basket.undo()
+    assert basket.total_items == 0, "Восстановление снимка должно отменяться"
+
+
+def test_undo_redo():
+    """Тест отмены и повтора изменений корзины."""
+    phone = Product("Айфон", 700, 2)
+    basket = PersistentBasket(verify=True)
+    basket.add_product(phone)
+    basket.add_product(phone, 2)
+    basket.delete_product(phone.id)
+    version = basket.version
+
+    basket.undo()
+    assert basket.quantity_of(phone.id) == 3, "Отмена удаления должна вернуть товар"
+    assert basket.version > version, "Отмена должна менять версию корзины"
+    basket.undo()
+    basket.redo()
+    assert basket.get_price == 2100, f"Неверная стоимость: {basket.get_price}"
+
+    basket.add_product(phone)
+    assert not basket.can_redo, "Новое изменение должно сбросить историю повтора"
+
+
+# Граничные тесты
+def test_history_size_limits_undo():
+    """Тест ограничения глубины истории изменений."""
+    basket = PersistentBasket(history_size=2)
+    product = Product("Флешка", 100, 1)
+    for _ in range(5):
+        basket.add_product(product)
+
+    basket.undo()
+    basket.undo()
+
+    assert basket.total_items == 3, "Отменить можно только 2 последних изменения"
+    assert not basket.can_undo, "История должна быть исчерпана"
+
+
+def test_from_buffer_restores_persistent_basket():
+    """Тест восстановления PersistentBasket из двоичного формата корзины."""
+    source = Basket()
+    source.add_product(Product("Лампа", 200, 1), 3)
+
+    basket = PersistentBasket.from_buffer(source.to_bytes())
+    basket.decrement(source.lines()[0][0].id)
+
+    assert basket.total_items == 2, "Восстановленная корзина должна изменяться"
+    basket.undo()
+    assert basket.total_items == 3, "Изменение восстановленной корзины отменяется"
+
+
+# Негативные тесты
+@pytest.mark.parametrize("method, match", [("undo", "отмены"), ("redo", "повтора")])
+def test_empty_history(method: str, match: str):
+    """Тест отмены и повтора без истории изменений."""
+    with pytest.raises(IndexError, match=match):
+        getattr(PersistentBasket(), method)()
+
+
+def test_rejected_change_is_not_recorded():
+    """Тест, проверяющий, что отклонённое изменение не попадает в историю."""
+    basket = PersistentBasket()
+    basket.add_product(Product("Гиря", 10, 60))
+
+    with pytest.raises(ValueError, match="Превышен максимальный вес"):
+        basket.add_product(Product("Гиря", 10, 50))
+    basket.undo()
+
+    assert (
+        basket.total_items == 0
+    ), "Отмена должна откатить последнее успешное изменение"
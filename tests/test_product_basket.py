@@ -1,8 +1,19 @@
+import gc
+import mmap
+import pickle
 from typing import Any, Hashable, Union
 
 import pytest
 
-from product_basket import Product
+from product_basket import (
+    BASKET_FORMAT_VERSION,
+    DEFAULT_SHIPPING_POLICY,
+    Basket,
+    BatchLineError,
+    Product,
+    ProductRegistry,
+    ShippingPolicy,
+)
 
 
 # Позитивные тесты
@@ -329,6 +340,333 @@ def test_sequential_operations_unique_ids(basket):
     ), f"Новый товар {product_c} не должен иметь идентификатор, равный удалённому ({id_a}), но получил {product_c.id}"
 
 
+def test_lines_store_one_entry_per_product(basket):
+    """Тест, проверяющий, что корзина хранит одну строку (товар, количество) на товар."""
+    keyboard = Product("Клавиатура", 50, 2)
+    mouse = Product("Мышь", 30, 1)
+
+    basket.add_product(keyboard, 10)
+    basket.add_product(mouse, 3)
+    basket.add_product(keyboard, 5)
+
+    assert basket.lines() == [
+        (keyboard, 15),
+        (mouse, 3),
+    ], f"Ожидались строки [(клавиатура, 15), (мышь, 3)], но получены {basket.lines()}"
+    assert (
+        basket.quantity_of(keyboard.id) == 15
+    ), f"Клавиатур должно быть 15, но стало {basket.quantity_of(keyboard.id)}"
+    assert (
+        basket.quantity_of(999) == 0
+    ), "Количество отсутствующего товара должно быть 0"
+    assert (
+        len(basket.list_products) == 18
+    ), f"Развёрнутый список должен содержать 18 товаров, но содержит {len(basket.list_products)}"
+
+
+@pytest.mark.parametrize(
+    "new_quantity, expected_count, expected_price",
+    [(5, 5, 500), (1, 1, 100), (0, 0, 0)],
+)
+def test_set_quantity(
+    basket, new_quantity: int, expected_count: int, expected_price: int
+):
+    """Тест изменения количества товара через `set_quantity`."""
+    product = Product("Фен", 100, 2)
+    basket.add_product(product, 3)
+
+    basket.set_quantity(product.id, new_quantity)
+
+    assert (
+        basket.quantity_of(product.id) == expected_count
+    ), f"Количество должно быть {expected_count}, но стало {basket.quantity_of(product.id)}"
+    assert (
+        basket.total_items == expected_count
+    ), f"Всего товаров должно быть {expected_count}, но стало {basket.total_items}"
+    assert (
+        basket.total_price == expected_price
+    ), f"Общая стоимость должна быть {expected_price} у.е., но стала {basket.total_price}"
+
+
+def test_decrement(basket):
+    """Тест уменьшения количества товара и удаления строки при достижении нуля."""
+    product = Product("Чайник", 300, 3)
+    basket.add_product(product, 3)
+
+    basket.decrement(product.id)
+    assert (
+        basket.quantity_of(product.id) == 2
+    ), f"После уменьшения должно остаться 2 чайника, но осталось {basket.quantity_of(product.id)}"
+
+    basket.decrement(product.id, 2)
+    assert basket.lines() == [], "После уменьшения до нуля строка должна удаляться"
+    assert (
+        basket.total_weight == 0
+    ), f"Общий вес должен быть 0 у.е., но стал {basket.total_weight}"
+
+
+def test_replace_product(basket):
+    """Тест замены товара строки новой версией на месте строки."""
+    kettle, lamp = Product("Чайник", 300, 3), Product("Лампа", 100, 1)
+    basket.add_product(kettle, 2)
+    basket.add_product(lamp)
+    version = basket.version
+    repriced = Product._from_trusted(kettle.id, "Чайник", 250, 4)
+
+    basket.replace_product(repriced, 3)
+
+    assert basket.lines() == [
+        (repriced, 3),
+        (lamp, 1),
+    ], f"Строка должна остаться на своём месте: {basket.lines()}"
+    assert (basket.total_items, basket.total_price, basket.total_weight) == (
+        4,
+        850,
+        13,
+    ), "Итоги должны пересчитаться по новой версии товара"
+    assert basket.version == version + 1, "Замена — одно изменение корзины"
+    basket.verify_totals()
+
+
+def test_iter_products_view(basket):
+    """Тест представления `iter_products()`: длина, итерация и проверка вхождения без копирования."""
+    tv = Product("Телевизор", 800, 20)
+    phone = Product("Айфон", 700, 2)
+    other = Product("Ноутбук", 1200, 5)
+    basket.add_product(tv, 1)
+    basket.add_product(phone, 2)
+
+    view = basket.iter_products()
+
+    assert len(view) == 3, f"Длина представления должна быть 3, но стала {len(view)}"
+    assert (
+        list(view) == basket.list_products
+    ), "Итерация по представлению должна совпадать со списком товаров"
+    assert phone in view, "Добавленный товар должен находиться в представлении"
+    assert other not in view, "Недобавленный товар не должен находиться в представлении"
+
+    basket.add_product(other)
+    assert (
+        len(view) == 4 and other in view
+    ), "Представление должно отражать изменения корзины без повторного вызова"
+
+
+def test_product_registry_interns_identical_products():
+    """Тест, проверяющий, что `ProductRegistry` переиспользует экземпляр для одинаковых товаров."""
+    registry = ProductRegistry()
+
+    first = registry.intern("Чайник", 300, 3)
+    second = registry.intern("Чайник", 300, 3)
+    other = registry.intern("Чайник", 350, 3)
+
+    assert first is second, "Для одинаковых товаров должен возвращаться один экземпляр"
+    assert first is not other, "Товары с разной ценой должны быть разными экземплярами"
+    assert (
+        len(registry) == 2
+    ), f"В таблице должно быть 2 товара, но стало {len(registry)}"
+
+
+def test_product_pickle_preserves_attributes():
+    """Тест, проверяющий, что товар сериализуется через pickle с сохранением идентификатора."""
+    product = Product("Фен", 300, 2)
+
+    restored = pickle.loads(pickle.dumps(product))
+
+    assert (restored.id, restored.name, restored.price, restored.weight) == (
+        product.id,
+        product.name,
+        product.price,
+        product.weight,
+    ), "Восстановленный товар должен совпадать с исходным"
+
+
+def test_product_bulk_construction():
+    """Тест пакетного создания товаров из строк и колонок."""
+    rows = [("Чайник", 300, 3), ("Тостер", 400, 4), ("Лампа", 200, 1)]
+
+    from_rows = Product.from_rows(rows)
+    from_columns = Product.from_columns(*zip(*rows))
+
+    for products in (from_rows, from_columns):
+        assert [
+            (p.name, p.price, p.weight) for p in products
+        ] == rows, "Товары должны совпадать со строками"
+        ids = [product.id for product in products]
+        assert ids == list(
+            range(ids[0], ids[0] + len(rows))
+        ), f"Идентификаторы должны идти подряд, но получены {ids}"
+    assert not {p.id for p in from_rows} & {
+        p.id for p in from_columns
+    }, "Идентификаторы разных пакетов не должны пересекаться"
+    assert gc.isenabled(), "Сборщик мусора должен быть снова включён"
+    with pytest.raises(AttributeError):
+        from_rows[0].price = 1  # type: ignore[misc]
+
+
+def test_add_many(basket):
+    """Тест пакетного добавления строк, в том числе повторяющихся товаров."""
+    tv = Product("Телевизор", 800, 20)
+    phone = Product("Айфон", 700, 2)
+
+    basket.add_many([(tv, 1), (phone, 2), (phone, 1)])
+
+    assert basket.lines() == [
+        (tv, 1),
+        (phone, 3),
+    ], f"Ожидались строки [(телевизор, 1), (айфон, 3)], но получены {basket.lines()}"
+    assert (
+        basket.total_price == 800 + 700 * 3
+    ), f"Общая стоимость должна быть {800 + 700 * 3} у.е., но стала {basket.total_price}"
+    assert (
+        basket.total_weight == 20 + 2 * 3
+    ), f"Общий вес должен быть {20 + 2 * 3} у.е., но стал {basket.total_weight}"
+
+
+def test_regional_shipping_policy():
+    """Тест корзины с внедрённой региональной таблицей тарифов доставки."""
+    regional = ShippingPolicy([(1, 400), (2000, 150), (5000, 0)])
+    basket = Basket(shipping_policy=regional)
+    basket.add_product(Product("Телевизор", 1500, 20))
+
+    assert (
+        basket.get_shipping_cost == 400
+    ), f"Региональная доставка должна быть 400 у.е., но стала {basket.get_shipping_cost}"
+    assert (
+        basket.get_price == 1900
+    ), f"Итоговая стоимость должна быть 1900 у.е., но стала {basket.get_price}"
+
+
+def test_shipping_policy_batch_costs():
+    """Тест пакетного расчёта стоимости доставки по массиву общих стоимостей."""
+    totals = [0, 1, 499, 500, 999, 1000, 10**9]
+
+    costs = DEFAULT_SHIPPING_POLICY.costs(totals)
+
+    assert costs == [
+        DEFAULT_SHIPPING_POLICY.cost(total) for total in totals
+    ], "Пакетный расчёт должен совпадать с поштучным"
+    assert costs == [0, 250, 250, 100, 100, 0, 0], f"Неверные тарифы доставки: {costs}"
+
+
+def test_basket_binary_roundtrip():
+    """Тест сериализации корзины в двоичный формат и восстановления из него."""
+    basket = Basket()
+    kettle = Product("Чайник", 300, 3)
+    phone = Product("Айфон ☎", 700, 2)
+    basket.add_many([(kettle, 2), (phone, 1)])
+
+    data = basket.to_bytes()
+    restored = Basket.from_buffer(memoryview(data), verify=True)
+
+    assert [
+        (product.id, product.name, product.price, product.weight, quantity)
+        for product, quantity in restored.lines()
+    ] == [
+        (kettle.id, "Чайник", 300, 3, 2),
+        (phone.id, "Айфон ☎", 700, 2, 1),
+    ], f"Строки восстановленной корзины не совпадают: {restored.lines()}"
+    assert (restored.total_items, restored.total_weight, restored.get_price) == (
+        basket.total_items,
+        basket.total_weight,
+        basket.get_price,
+    ), "Итоги восстановленной корзины должны совпадать с исходными"
+    assert len(data) < len(
+        pickle.dumps(basket.list_products)
+    ), "Двоичный формат должен быть компактнее списка товаров в pickle"
+
+
+def test_basket_from_mmap(tmp_path):
+    """Тест восстановления корзины из файла, отображённого в память через mmap."""
+    basket = Basket()
+    basket.add_product(Product("Флешка", 100, 1), 5)
+    path = tmp_path / "basket.bin"
+    path.write_bytes(basket.to_bytes())
+
+    with path.open("rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        restored = Basket.from_buffer(mapped)
+
+    assert (
+        restored.total_price == 500
+    ), f"Общая стоимость должна быть 500 у.е., но стала {restored.total_price}"
+    assert Basket.from_buffer(Basket().to_bytes()).lines() == [], "Пустая корзина"
+
+
+def test_version_and_price_cache(basket):
+    """Тест версии корзины и кэширования стоимости доставки и итоговой стоимости."""
+    tv = Product("Телевизор", 800, 20)
+    versions = [basket.version]
+
+    basket.add_product(tv)
+    versions.append(basket.version)
+    basket.delete_product(999)
+    with pytest.raises(ValueError):
+        basket.add_product(tv, 31)
+    versions.append(basket.version)
+
+    for _ in range(3):
+        assert (basket.get_shipping_cost, basket.get_price) == (
+            100,
+            900,
+        ), "Неверная стоимость доставки или итоговая стоимость"
+    assert basket.cache_info() == (
+        5,
+        1,
+    ), f"Ожидалось 5 попаданий и 1 промах кэша, но получено {basket.cache_info()}"
+
+    basket.add_product(tv)
+    versions.append(basket.version)
+
+    assert (
+        basket.get_price == 1600
+    ), f"Кэш должен сброситься, но цена {basket.get_price}"
+    assert basket.cache_info().misses == 2, "Изменение корзины должно сбросить кэш"
+    assert versions == [0, 1, 1, 2], f"Неверная последовательность версий: {versions}"
+
+
+def test_running_totals_match_full_recompute():
+    """Тест, проверяющий, что накопленные итоги совпадают с полным пересчётом.
+
+    Корзина создаётся в режиме сверки (`verify=True`), поэтому каждое изменение
+    дополнительно проверяется методом `verify_totals()`.
+    """
+    basket = Basket(verify=True)
+    tv = Product("Телевизор", 800, 20)
+    kettle = Product("Чайник", 300, 3)
+    flash_drive = Product("Флешка", 100, 1)
+
+    basket.add_product(tv, 1)
+    basket.add_product(kettle, 2)
+    basket.add_product(flash_drive, 5)
+    basket.delete_product(kettle.id)
+    basket.add_product(kettle, 1)
+    basket.add_many([(kettle, 1), (tv, 1)])
+    basket.delete_product(999)
+
+    products = basket.list_products
+    assert basket.total_items == len(
+        products
+    ), f"Количество товаров должно быть {len(products)}, но стало {basket.total_items}"
+    assert basket.total_price == sum(
+        p.price for p in products
+    ), f"Общая стоимость не совпадает с пересчётом: {basket.total_price}"
+    assert basket.total_weight == sum(
+        p.weight for p in products
+    ), f"Общий вес не совпадает с пересчётом: {basket.total_weight}"
+
+
+def test_verify_totals_detects_corruption(basket):
+    """Тест, проверяющий, что `verify_totals()` обнаруживает расхождение итогов."""
+    basket.add_product(Product("Пылесос", 100, 10), 2)
+    basket.verify_totals()
+
+    basket._total_price += 1
+
+    with pytest.raises(AssertionError, match="не совпадают с пересчётом"):
+        basket.verify_totals()
+
+
 # Граничные тесты
 def test_product_immutability():
     """Тест, подтверждающий, что свойства объекта Product доступны только для чтения."""
@@ -339,6 +677,11 @@ def test_product_immutability():
         product.weight = 10
     with pytest.raises(AttributeError):
         product.name = "Новый ноутбук"
+    with pytest.raises(AttributeError):
+        product.color = "серый"
+    with pytest.raises(AttributeError):
+        del product.price
+    assert not hasattr(product, "__dict__"), "У товара не должно быть __dict__"
 
 
 @pytest.mark.parametrize(
@@ -412,6 +755,22 @@ def test_extreme_values(basket):
     ), f"Итоговая стоимость должна равняться цене товара {extreme_price} у.е., но стала {basket.get_price}"
 
 
+def test_binary_format_int64_bounds(basket):
+    """Тест сериализации цены на границе 64-битного целого двоичного формата."""
+    largest = 2**63 - 1
+    basket.add_product(Product("Алмаз", largest, 1))
+    overflowing = Basket()
+    overflowing.add_product(Product("Алмаз", largest + 1, 1))
+
+    restored = Basket.from_buffer(basket.to_bytes())
+
+    assert (
+        restored.total_price == largest
+    ), f"Общая стоимость должна быть {largest} у.е., но стала {restored.total_price}"
+    with pytest.raises(ValueError, match="64-битное целое"):
+        overflowing.to_bytes()
+
+
 # Негативные тесты
 @pytest.mark.parametrize("price, weight", [(0, 1), (1, 0), (0, 0)])
 def test_invalid_product_creation(price: int, weight: int):
@@ -423,6 +782,21 @@ def test_invalid_product_creation(price: int, weight: int):
         Product("Бракованный товар", price, weight)
 
 
+@pytest.mark.parametrize(
+    "rows, message",
+    [
+        ([("Чайник", 300, 3), ("Брак", 0, 3)], r"Цена .* \(строка 1\)"),
+        ([("Брак", 300, 0), ("Чайник", 300, 3)], r"Вес .* \(строка 0\)"),
+        ([("Чайник", 300, 3), ("Брак", 300)], r"название, цену и вес \(строка 1\)"),
+    ],
+)
+def test_bulk_construction_reports_row(rows: list, message: str):
+    """Тест номера строки в ошибке пакетного создания товаров."""
+    with pytest.raises(ValueError, match=message):
+        Product.from_rows(rows)
+    assert gc.isenabled(), "Сборщик мусора должен остаться включённым"
+
+
 @pytest.mark.parametrize(
     "invalid_price, invalid_weight",
     [("1000", 5), (1000, "5"), (None, 10), (200, None), ([], 5), (100, {})],
@@ -533,3 +907,217 @@ def test_delete_product_invalid_unhashable_key(basket, invalid_key: Any):
         f"Корзина должна оставаться неизменной при попытке удаления с unhashable ключом, "
         f"но количество товаров изменилось с {count_before} до {len(basket.list_products)}"
     )
+
+
+@pytest.mark.parametrize("method", ["set_quantity", "decrement"])
+def test_line_methods_missing_product(basket, method: str):
+    """Тест изменения количества товара, которого нет в корзине."""
+    with pytest.raises(KeyError, match="отсутствует в корзине"):
+        getattr(basket, method)(999, 1)
+
+
+def test_set_quantity_respects_limits(basket):
+    """Тест, проверяющий, что `set_quantity` соблюдает лимиты и не меняет корзину при ошибке."""
+    product = Product("Обогреватель", 200, 10)
+    basket.add_product(product, 2)
+
+    with pytest.raises(ValueError, match="Превышен максимальный вес товаров в корзине"):
+        basket.set_quantity(product.id, 11)
+    with pytest.raises(TypeError, match="Ожидалось неотрицательное целое число"):
+        basket.set_quantity(product.id, -1)
+
+    assert (
+        basket.quantity_of(product.id) == 2
+    ), f"Количество должно остаться 2, но стало {basket.quantity_of(product.id)}"
+
+
+def test_replace_product_rejected(basket):
+    """Тест отказа замены товара: нет в корзине, лимиты, некорректные данные."""
+    product = Product("Обогреватель", 200, 10)
+    basket.add_product(product, 2)
+    heavier = Product._from_trusted(product.id, "Обогреватель", 200, 60)
+
+    with pytest.raises(KeyError, match="отсутствует в корзине"):
+        basket.replace_product(Product("Фен", 500, 2), 1)
+    with pytest.raises(ValueError, match="Превышен максимальный вес"):
+        basket.replace_product(heavier, 2)
+    with pytest.raises(TypeError, match="Ожидалось положительное целое число"):
+        basket.replace_product(product, 0)
+
+    assert basket.lines() == [
+        (product, 2)
+    ], f"Строка не должна измениться после отказа: {basket.lines()}"
+
+
+def test_decrement_more_than_present(basket):
+    """Тест уменьшения количества товара больше, чем лежит в корзине."""
+    product = Product("Тостер", 400, 4)
+    basket.add_product(product, 2)
+
+    with pytest.raises(ValueError, match="нельзя убрать 3 ед."):
+        basket.decrement(product.id, 3)
+
+    assert (
+        basket.quantity_of(product.id) == 2
+    ), f"Количество должно остаться 2, но стало {basket.quantity_of(product.id)}"
+
+
+def test_same_id_with_other_price_or_weight(basket):
+    """Тест добавления товара с тем же идентификатором, но другой ценой или весом.
+
+    В строке остаётся товар, добавленный первым, а итоги корзины не искажаются.
+    """
+    product = Product("Чайник", 300, 3)
+    cheaper = Product._from_trusted(product.id, "Чайник", 100, 3)
+    lighter = Product._from_trusted(product.id, "Чайник", 300, 1)
+    twin = Product._from_trusted(product.id, "Чайник (копия)", 300, 3)
+    basket.add_product(product, 2)
+
+    for other in (cheaper, lighter):
+        with pytest.raises(ValueError, match="уже лежит в корзине с ценой 300"):
+            basket.add_product(other)
+        with pytest.raises(ValueError, match="уже лежит в корзине") as error_info:
+            basket.add_many([(Product("Лампа", 100, 1), 1), (other, 1)])
+        assert (
+            error_info.value.failed_line.line_index == 1
+        ), "Ошибка должна указывать на строку с другой ценой или весом"
+    with pytest.raises(ValueError, match="уже лежит в корзине"):
+        Basket().add_many([(product, 1), (cheaper, 1)])
+
+    basket.add_product(twin)
+    basket.add_many([(twin, 1)])
+    assert basket.lines() == [
+        (product, 4)
+    ], f"В строке должен остаться первый товар: {basket.lines()}"
+    assert basket.lines()[0][0] is product, "Строка не должна заменять товар"
+    basket.delete_product(product.id)
+
+    assert (
+        basket.lines() == []
+    ), f"Корзина должна опустеть, но содержит {basket.lines()}"
+    assert (basket.total_price, basket.total_weight) == (
+        0,
+        0,
+    ), f"Итоги пустой корзины искажены: {basket.total_price}, {basket.total_weight}"
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda basket, product: basket.add_product(product),
+        lambda basket, product: basket.decrement(product.id),
+        lambda basket, product: basket.delete_product(product.id),
+    ],
+)
+def test_iter_products_detects_mutation(basket, mutate):
+    """Тест, проверяющий, что изменение корзины во время итерации вызывает RuntimeError."""
+    product = Product("Пылесос", 100, 10)
+    basket.add_product(product, 3)
+
+    iterator = iter(basket.iter_products())
+    next(iterator)
+    mutate(basket, product)
+
+    with pytest.raises(RuntimeError, match="Корзина изменилась во время итерации"):
+        next(iterator)
+
+
+@pytest.mark.parametrize(
+    "make_lines, error_type, match, failed_index",
+    [
+        (
+            lambda p: [(p, 1), ("Телевизор", 1)],
+            TypeError,
+            "Ожидался объект Product, но получен str",
+            1,
+        ),
+        (
+            lambda p: [(p, 0)],
+            TypeError,
+            "Ожидалось положительное целое число, но получено int",
+            0,
+        ),
+        (lambda p: [(p, 1), 5], TypeError, "Ожидалась пара", 1),
+        (
+            lambda p: [(p, 20), (p, 11)],
+            ValueError,
+            "Превышено максимальное количество товаров в корзине",
+            1,
+        ),
+        (
+            lambda p: [(p, 10), (Product("Гиря", 100, 95), 1)],
+            ValueError,
+            "Превышен максимальный вес товаров в корзине",
+            1,
+        ),
+    ],
+)
+def test_add_many_is_atomic(
+    basket, make_lines, error_type: type, match: str, failed_index: int
+):
+    """Тест, проверяющий, что ошибка в любой строке пакета оставляет корзину неизменной.
+
+    Исключение — подкласс исключения `add_product` с тем же текстом, а атрибут
+    `failed_line` указывает на номер ошибочной строки.
+    """
+    existing = Product("Флешка", 100, 1)
+    basket.add_product(existing, 1)
+    product = Product("Чайник", 300, 1)
+
+    with pytest.raises(BatchLineError, match=match) as error_info:
+        basket.add_many(make_lines(product))
+
+    assert isinstance(
+        error_info.value, error_type
+    ), f"Ожидалось исключение {error_type.__name__}, но получено {error_info.value!r}"
+    assert (
+        error_info.value.failed_line.line_index == failed_index
+    ), f"Ошибка должна указывать на строку {failed_index}, но указывает на {error_info.value.failed_line.line_index}"
+    assert basket.lines() == [
+        (existing, 1)
+    ], f"Корзина не должна измениться после ошибки, но содержит {basket.lines()}"
+
+
+@pytest.mark.parametrize(
+    "tiers, base_cost, match",
+    [
+        ([(1, 250), (1, 100)], 0, "не должны повторяться"),
+        ([(1, -1)], 0, "не может быть отрицательной"),
+        ([(1, 250)], -5, "не может быть отрицательной"),
+    ],
+)
+def test_invalid_shipping_policy(tiers: list, base_cost: int, match: str):
+    """Тест создания таблицы тарифов с повторяющимися порогами или отрицательной стоимостью."""
+    with pytest.raises(ValueError, match=match):
+        ShippingPolicy(tiers, base_cost)
+
+
+def _basket_bytes(quantity: int = 1) -> bytes:
+    """Возвращает данные корзины с одним товаром в заданном количестве."""
+    basket = Basket()
+    basket.MAX_ITEMS = basket.MAX_WEIGHT = 1000
+    basket.add_product(Product("Гиря", 1, 1), quantity)
+    return basket.to_bytes()
+
+
+@pytest.mark.parametrize(
+    "data, match",
+    [
+        (b"", "нет заголовка"),
+        (b"JUNK" + _basket_bytes()[4:], "Неизвестный формат"),
+        (
+            _basket_bytes()[:4]
+            + (BASKET_FORMAT_VERSION + 1).to_bytes(2, "little")
+            + _basket_bytes()[6:],
+            "Неподдерживаемая версия",
+        ),
+        (_basket_bytes()[:20], "таблицы обрезаны"),
+        (_basket_bytes()[:-1], "некорректная строка"),
+        (_basket_bytes() + b"\0", "лишние байты"),
+        (_basket_bytes(31), "Превышено максимальное количество товаров"),
+    ],
+)
+def test_from_buffer_rejects_invalid_data(data: bytes, match: str):
+    """Тест восстановления корзины из повреждённых данных или данных сверх лимитов."""
+    with pytest.raises(ValueError, match=match):
+        Basket.from_buffer(data)
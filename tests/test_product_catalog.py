@@ -0,0 +1,132 @@
+import pytest
+
+from product_basket import Product
+from product_catalog import ProductCatalog
+
+
+@pytest.fixture
+def catalog():
+    """Фикстура каталога из четырёх товаров."""
+    catalog = ProductCatalog()
+    catalog.add("Флешка", 100, 1)
+    catalog.add("Чайник", 300, 3)
+    catalog.add("Телевизор", 800, 20)
+    catalog.add("Холодильник", 1500, 50)
+    return catalog
+
+
+# Позитивные тесты
+def test_catalog_product_proxy(catalog):
+    """Тест получения товара каталога в виде экземпляра Product."""
+    product_id = catalog.filter_price(300, 300)[0]
+
+    product = catalog.product(product_id)
+
+    assert isinstance(product, Product), "Каталог должен возвращать экземпляр Product"
+    assert (product.id, product.name, product.price, product.weight) == (
+        product_id,
+        "Чайник",
+        300,
+        3,
+    ), "Характеристики товара должны совпадать с данными каталога"
+
+
+def test_catalog_products_can_be_added_to_basket(catalog, basket):
+    """Тест добавления товаров каталога в корзину."""
+    for product_id in catalog.filter_price(100, 300):
+        basket.add_product(catalog.product(product_id), 2)
+
+    assert (
+        basket.total_price == 800
+    ), f"Общая стоимость должна быть 800 у.е., но стала {basket.total_price}"
+
+
+@pytest.mark.parametrize(
+    "min_price, max_price, expected_names",
+    [
+        (100, 800, ["Флешка", "Чайник", "Телевизор"]),
+        (101, 799, ["Чайник"]),
+        (2000, 3000, []),
+    ],
+)
+def test_filter_price(catalog, min_price: int, max_price: int, expected_names: list):
+    """Тест фильтрации товаров по диапазону цен (границы включительно)."""
+    ids = catalog.filter_price(min_price, max_price)
+
+    names = [catalog.product(product_id).name for product_id in ids]
+    assert names == expected_names, f"Ожидались {expected_names}, но получены {names}"
+
+
+def test_sum_prices(catalog):
+    """Тест суммирования цен по списку идентификаторов с повторами."""
+    cheap, kettle = catalog.filter_price(100, 300)
+
+    total = catalog.sum_prices([cheap, kettle, kettle])
+
+    assert total == 700, f"Сумма цен должна быть 700 у.е., но стала {total}"
+
+
+@pytest.mark.parametrize("budget, expected_count", [(0, 0), (3, 2), (20, 3), (100, 4)])
+def test_fits_weight(catalog, budget: int, expected_count: int):
+    """Тест поиска товаров, помещающихся в оставшийся запас веса."""
+    ids = catalog.fits_weight(budget)
+
+    assert (
+        len(ids) == expected_count
+    ), f"Должно найтись {expected_count} товаров, но найдено {len(ids)}"
+    assert all(
+        catalog.weight_of(product_id) <= budget for product_id in ids
+    ), "Все найденные товары должны помещаться в запас веса"
+
+
+def test_catalog_ids_do_not_collide_with_products(catalog):
+    """Тест, проверяющий, что идентификаторы каталога не пересекаются с идентификаторами Product."""
+    product = Product("Фен", 300, 2)
+
+    assert (
+        product.id not in catalog
+    ), "Идентификатор нового товара не должен быть в каталоге"
+
+
+def test_catalog_from_products():
+    """Тест создания каталога из существующих товаров с сохранением идентификаторов."""
+    products = [Product("Фен", 300, 2), Product("Плойка", 200, 1)]
+
+    catalog = ProductCatalog.from_products(products)
+
+    assert (
+        len(catalog) == 2
+    ), f"В каталоге должно быть 2 товара, но стало {len(catalog)}"
+    assert [catalog.price_of(p.id) for p in products] == [
+        300,
+        200,
+    ], "Цены должны совпадать с ценами исходных товаров"
+
+
+# Негативные тесты
+@pytest.mark.parametrize("price, weight", [(0, 1), (1, 0)])
+def test_catalog_add_invalid_product(catalog, price: int, weight: int):
+    """Тест добавления в каталог товара с некорректными ценой или весом."""
+    with pytest.raises(
+        ValueError,
+        match="Цена товара должна быть не меньше 1 у.е.|Вес товара должен быть не меньше 1 у.е.",
+    ):
+        catalog.add("Бракованный товар", price, weight)
+
+    assert len(catalog) == 4, "Каталог не должен измениться после ошибки"
+
+
+def test_catalog_unknown_product(catalog):
+    """Тест обращения к товару, которого нет в каталоге."""
+    with pytest.raises(KeyError):
+        catalog.product(-1)
+    with pytest.raises(KeyError):
+        catalog.sum_prices([-1])
+
+
+def test_catalog_duplicate_product():
+    """Тест повторного добавления в каталог товара с тем же идентификатором."""
+    product = Product("Фен", 300, 2)
+
+    with pytest.raises(ValueError, match="уже есть в каталоге"):
+        ProductCatalog.from_products([product, product])
@@ -0,0 +1,131 @@
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from product_basket import Product
+from product_ids import IdAllocator, LocalIdSource, SharedIdSource, SnowflakeIdSource
+
+WORKERS = 8
+PRODUCTS_PER_WORKER = 125_000  # 8 x 125 000 = 1 000 000 товаров
+
+
+@pytest.fixture
+def restore_id_allocator():
+    """Фикстура, восстанавливающая распределитель идентификаторов Product."""
+    allocator = Product._id_allocator
+    counter = Product._id_counter
+    yield
+    Product._id_allocator = allocator
+    Product._id_counter = counter
+
+
+def install_allocator(allocator: IdAllocator) -> None:
+    """Инициализатор процесса-воркера: устанавливает распределитель идентификаторов."""
+    Product.use_id_allocator(allocator)
+
+
+def install_snowflake(node_ids) -> None:
+    """Инициализатор процесса-воркера: берёт свободный номер узла из общей очереди."""
+    Product.use_id_allocator(IdAllocator(SnowflakeIdSource(node_ids.get())))
+
+
+def create_products(count: int) -> bytes:
+    """Создаёт товары в процессе-воркере и возвращает их идентификаторы."""
+    return array("q", (Product("Товар", 1, 1).id for _ in range(count))).tobytes()
+
+
+def collect_ids(chunks) -> array:
+    """Собирает идентификаторы из результатов воркеров."""
+    ids = array("q")
+    for chunk in chunks:
+        ids.frombytes(chunk)
+    return ids
+
+
+# Позитивные тесты
+def test_allocator_reserves_blocks_from_source():
+    """Тест выдачи идентификаторов блоками и резервирования диапазона в обход блока."""
+    allocator = IdAllocator(LocalIdSource(start=100), block_size=3)
+    ids = iter(allocator)
+
+    first = [next(ids) for _ in range(4)]
+    reserved = allocator.reserve(2)
+    second = [next(ids) for _ in range(3)]
+
+    assert first == [100, 101, 102, 103], f"Неверные первые идентификаторы: {first}"
+    assert reserved == range(106, 108), f"Неверный резервированный диапазон: {reserved}"
+    assert second == [104, 105, 108], f"Неверные последующие идентификаторы: {second}"
+
+
+def test_snowflake_ids_do_not_collide_between_nodes():
+    """Тест, проверяющий, что разные узлы выдают непересекающиеся идентификаторы."""
+    node_a = iter(IdAllocator(SnowflakeIdSource(1, node_bits=4), block_size=10))
+    node_b = iter(IdAllocator(SnowflakeIdSource(2, node_bits=4), block_size=10))
+
+    ids_a = {next(node_a) for _ in range(1000)}
+    ids_b = {next(node_b) for _ in range(1000)}
+
+    assert len(ids_a) == len(ids_b) == 1000, "Идентификаторы узла должны быть уникальны"
+    assert not ids_a & ids_b, "Идентификаторы разных узлов не должны пересекаться"
+    assert all(i % 16 == 1 for i in ids_a), "Младшие биты должны хранить номер узла"
+
+
+def test_use_id_allocator(restore_id_allocator):
+    """Тест установки распределителя идентификаторов для новых товаров."""
+    Product.use_id_allocator(IdAllocator(LocalIdSource(start=10**12)))
+
+    product = Product("Фен", 300, 2)
+
+    assert (
+        product.id == 10**12
+    ), f"Идентификатор должен быть 10**12, но стал {product.id}"
+
+
+# Граничные тесты
+def test_shared_source_unique_across_processes():
+    """Стресс-тест: 8 процессов с общим источником создают миллион товаров без повторов."""
+    allocator = IdAllocator(SharedIdSource(), block_size=1000)
+
+    with ProcessPoolExecutor(
+        WORKERS, initializer=install_allocator, initargs=(allocator,)
+    ) as pool:
+        ids = collect_ids(pool.map(create_products, [PRODUCTS_PER_WORKER] * WORKERS))
+
+    assert (
+        len(ids) == WORKERS * PRODUCTS_PER_WORKER
+    ), "Должны вернуться все идентификаторы"
+    assert len(set(ids)) == len(
+        ids
+    ), "Идентификаторы товаров разных процессов совпадают"
+
+
+def test_snowflake_unique_across_processes():
+    """Стресс-тест: 8 процессов с разными узлами создают миллион товаров без повторов."""
+    with multiprocessing.Manager() as manager:
+        node_ids = manager.Queue()
+        for node_id in range(WORKERS):
+            node_ids.put(node_id)
+
+        with ProcessPoolExecutor(
+            WORKERS, initializer=install_snowflake, initargs=(node_ids,)
+        ) as pool:
+            chunks = pool.map(create_products, [PRODUCTS_PER_WORKER] * WORKERS)
+            ids = collect_ids(chunks)
+
+    assert len(set(ids)) == len(ids), "Идентификаторы товаров разных узлов совпадают"
+
+
+# Негативные тесты
+@pytest.mark.parametrize("node_id, node_bits", [(-1, 4), (16, 4)])
+def test_snowflake_invalid_node(node_id: int, node_bits: int):
+    """Тест создания источника с номером узла, не помещающимся в отведённые биты."""
+    with pytest.raises(ValueError, match="Номер узла должен быть от 0 до 15"):
+        SnowflakeIdSource(node_id, node_bits)
+
+
+def test_allocator_invalid_block_size():
+    """Тест создания распределителя с размером блока меньше 1."""
+    with pytest.raises(ValueError, match="Размер блока"):
+        IdAllocator(LocalIdSource(), block_size=0)
@@ -0,0 +1,216 @@
+import random
+
+import pytest
+
+from basket_batch import BasketBatch
+from product_basket import Basket, Product
+from promotions import (
+    BundleDeal,
+    PercentOff,
+    PromotionPlan,
+    PromotionQuote,
+    ThresholdDiscount,
+)
+
+PRICES = [1, 99, 250, 499, 500, 999]
+
+
+def naive_price(basket: Basket, line_rules: list[tuple], thresholds: list) -> int:
+    """Эталон: перебор правил по каждой единице товара в list_products."""
+    units: dict[int, list[Product]] = {}
+    for product in basket.list_products:
+        units.setdefault(product.id, []).append(product)
+    discount = 0
+    for product_id, same in units.items():
+        best = 0
+        for kind, value, targets in line_rules:
+            if product_id not in targets:
+                continue
+            if kind == "percent":
+                line = sum(p.price for p in same) * value // 100
+            else:
+                # Бесплатны последние buy - pay единиц каждого полного комплекта
+                buy, pay = value
+                complete = len(same) // buy * buy
+                line = sum(
+                    p.price
+                    for i, p in enumerate(same)
+                    if i < complete and i % buy >= pay
+                )
+            best = max(best, line)
+        discount += best
+    subtotal = basket.total_price - discount
+    reached = [rule for rule in thresholds if rule.min_total <= subtotal]
+    if reached:
+        rule = max(reached, key=lambda rule: rule.min_total)
+        subtotal -= min(subtotal, rule.amount + subtotal * rule.percent // 100)
+    # Непустая корзина со скидкой на всю стоимость платит доставку как за 1 у.е.
+    basis = 1 if basket.total_price and not subtotal else subtotal
+    return subtotal + basket.shipping_policy.cost(basis)
+
+
+# Позитивные тесты
+def test_percent_bundle_and_threshold():
+    """Тест скидок на строки, пороговой скидки и доставки после скидок."""
+    kettle = Product("Чайник", 300, 3)
+    lamp = Product("Лампа", 100, 1)
+    plan = PromotionPlan(
+        [
+            PercentOff(10, (kettle.id,)),
+            BundleDeal(3, 2, ("свет",)),
+            ThresholdDiscount(500, amount=50),
+        ],
+        categories={"свет": [lamp.id]},
+    )
+    basket = Basket()
+    basket.add_product(kettle, 2)
+    basket.add_product(lamp, 4)
+
+    quote = plan.evaluate(basket)
+
+    # 600 - 60 (10 %) + 400 - 100 (4 лампы по цене 3) = 840; порог 500: -50 = 790;
+    # доставка считается по 790 у.е.
+    assert quote == PromotionQuote(
+        1000, 210, 100, 890
+    ), f"Неверный расчёт со скидками: {quote}"
+    assert basket.price_with(plan) == 890, "price_with должна совпадать с evaluate"
+    assert basket.get_price == 1000, "get_price не учитывает акции"
+
+
+def test_best_line_discount_applies():
+    """Тест: из нескольких акций на товар применяется наибольшая скидка."""
+    tv = Product("Телевизор", 800, 20)
+    plan = PromotionPlan(
+        [PercentOff(5, ("техника",)), PercentOff(25, (tv.id,)), BundleDeal(2, 1, ())],
+        categories={"техника": [tv.id]},
+    )
+
+    assert plan.line_discount(tv.id, 800, 1) == 200, "Должна примениться скидка 25 %"
+    assert plan.line_discount(-1, 800, 1) == 0, "Товар без акций без скидки"
+
+
+def test_batch_matches_basket_and_naive_reference():
+    """Тест пакетного расчёта с акциями против корзин и эталонного перебора."""
+    rng = random.Random(3)
+    products = [
+        Product(f"Товар {i}", rng.choice(PRICES), rng.randint(1, 10)) for i in range(12)
+    ]
+    ids = [product.id for product in products]
+    line_rules = [
+        ("percent", 15, set(ids[:6])),
+        ("percent", 40, {ids[2]}),
+        ("bundle", (3, 2), set(ids[4:9])),
+        ("bundle", (2, 1), {ids[10]}),
+    ]
+    thresholds = [
+        ThresholdDiscount(300, amount=20),
+        ThresholdDiscount(1000, percent=5),
+        ThresholdDiscount(2000, amount=100, percent=3),
+    ]
+    plan = PromotionPlan(
+        [PercentOff(15, ("первая половина",)), PercentOff(40, (ids[2],))]
+        + [BundleDeal(3, 2, tuple(ids[4:9])), BundleDeal(2, 1, (ids[10],))]
+        + thresholds,
+        categories={"первая половина": ids[:6]},
+    )
+    baskets = []
+    for _ in range(200):
+        basket = Basket()
+        for _ in range(rng.randint(0, 8)):
+            try:
+                basket.add_product(rng.choice(products), rng.randint(1, 6))
+            except ValueError:
+                pass
+        baskets.append(basket)
+
+    result = BasketBatch.from_baskets(baskets).evaluate(promotions=plan)
+
+    expected = [naive_price(basket, line_rules, thresholds) for basket in baskets]
+    assert [
+        basket.price_with(plan) for basket in baskets
+    ] == expected, "Расчёт корзины расходится с эталоном"
+    assert result.price == expected, "Пакетный расчёт расходится с эталоном"
+    assert result.discount == [
+        plan.evaluate(basket).discount for basket in baskets
+    ], "Скидки пакета должны совпадать с расчётом по корзинам"
+
+
+# Граничные тесты
+def test_threshold_and_bundle_bounds():
+    """Тест порога на границе, наибольшего порога и неполного комплекта."""
+    plan = PromotionPlan(
+        [
+            ThresholdDiscount(500, amount=100),
+            ThresholdDiscount(1000, percent=100),
+            BundleDeal(3, 2, (1,)),
+        ]
+    )
+
+    assert plan.threshold_discount(499) == 0, "До порога скидки нет"
+    assert plan.threshold_discount(500) == 100, "Порог включается в скидку"
+    assert plan.threshold_discount(1500) == 1500, "Скидка не больше стоимости"
+    assert plan.line_discount(1, 100, 2) == 0, "Неполный комплект без скидки"
+    assert plan.line_discount(1, 100, 7) == 200, "Два полных комплекта из 7 единиц"
+
+
+@pytest.mark.parametrize(
+    "rule", [PercentOff(100, ("все",)), ThresholdDiscount(100, percent=100)]
+)
+def test_full_discount_keeps_paid_shipping(rule):
+    """Тест: скидка на всю стоимость не делает доставку бесплатной."""
+    kettle = Product("Чайник", 300, 3)
+    plan = PromotionPlan([rule], categories={"все": [kettle.id]})
+    basket = Basket()
+    basket.add_product(kettle)
+
+    quote = plan.evaluate(basket)
+    result = BasketBatch.from_baskets([basket, Basket()]).evaluate(promotions=plan)
+
+    assert quote == PromotionQuote(
+        300, 300, 250, 250
+    ), f"Доставка непустой корзины по первому платному тарифу: {quote}"
+    assert (result.shipping_cost, result.price) == (
+        [250, 0],
+        [250, 0],
+    ), "Пакетный расчёт должен совпадать с evaluate, пустая корзина без доставки"
+
+
+def test_empty_plan_keeps_prices():
+    """Тест пустого набора акций: стоимость совпадает с get_price."""
+    basket = Basket()
+    basket.add_product(Product("Фен", 499, 2))
+
+    assert (
+        basket.price_with(PromotionPlan([])) == basket.get_price
+    ), "Без акций стоимость не меняется"
+    assert BasketBatch.from_baskets([basket]).evaluate().discount == [
+        0
+    ], "Без акций скидка пакета равна 0"
+
+
+# Негативные тесты
+@pytest.mark.parametrize(
+    "rule, message",
+    [
+        (PercentOff(0, (1,)), "от 1 до 100"),
+        (PercentOff(101, (1,)), "от 1 до 100"),
+        (BundleDeal(2, 2, (1,)), "pay < buy"),
+        (BundleDeal(3, 0, (1,)), "pay < buy"),
+        (ThresholdDiscount(0, amount=10), "Порог скидки"),
+        (ThresholdDiscount(100), "больше 0"),
+        (ThresholdDiscount(100, amount=-1), "отрицательной"),
+        (PercentOff(10, ("нет такой",)), "Неизвестная категория"),
+    ],
+)
+def test_invalid_rules(rule, message: str):
+    """Тест отклонения некорректных правил при компиляции."""
+    with pytest.raises(ValueError, match=message):
+        PromotionPlan([rule])
+
+
+def test_duplicate_threshold_and_unknown_rule():
+    """Тест повторяющегося порога и объекта, не являющегося правилом."""
+    with pytest.raises(ValueError, match="задан несколько раз"):
+        PromotionPlan([ThresholdDiscount(100, 5), ThresholdDiscount(100, 10)])
+    with pytest.raises(TypeError, match="Ожидалось правило акции"):
+        PromotionPlan(["скидка 10 %"])  # type: ignore[list-item]
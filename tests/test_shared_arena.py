@@ -0,0 +1,181 @@
+import multiprocessing
+import random
+
+import pytest
+
+import shared_arena
+from product_basket import Basket, Product
+from shared_arena import SharedBasketArena
+
+# Цена каждого товара в 10 раз больше веса: согласованные итоги слота
+# всегда удовлетворяют total_price == 10 * total_weight
+PRODUCTS = [Product(f"Товар {i}", 10 * (i % 7 + 1), i % 7 + 1) for i in range(12)]
+FORK = multiprocessing.get_context("fork")
+
+
+@pytest.fixture
+def arena():
+    """Арена из 4 слотов с двумя блокировками."""
+    with SharedBasketArena(4, stripes=2) as arena:
+        yield arena
+
+
+def mutate(arena: SharedBasketArena, seed: int, operations: int) -> None:
+    """Случайные изменения слотов арены в процессе-воркере."""
+    rng = random.Random(seed)
+    for _ in range(operations):
+        slot = rng.randrange(len(arena))
+        product = rng.choice(PRODUCTS)
+        try:
+            if rng.random() < 0.7:
+                arena.add_product(slot, product, rng.randint(1, 3))
+            else:
+                arena.decrement(slot, product.id)
+        except (KeyError, ValueError):
+            pass
+
+
+def read_consistently(arena: SharedBasketArena, reads: int) -> None:
+    """Читает итоги без блокировки; код выхода 1 — несогласованное чтение."""
+    for i in range(reads):
+        count, price, weight = arena.totals(i % len(arena))
+        if price != 10 * weight or count > Basket.MAX_ITEMS:
+            raise SystemExit(1)
+
+
+def add_in_child(arena: SharedBasketArena, product: Product) -> None:
+    """Добавляет товар в слот 0 из процесса, подключившегося к арене."""
+    arena.add_product(0, product, 2)
+    arena.close()
+
+
+# Позитивные тесты
+def test_slot_matches_basket(arena):
+    """Тест итогов и строк слота против Basket с теми же операциями."""
+    basket = Basket()
+    kettle, lamp = Product("Чайник", 300, 3), Product("Лампа", 100, 1)
+    for target, call in ((arena, (2,)), (basket, ())):
+        target.add_product(*call, kettle, 2)
+        target.add_product(*call, lamp)
+        target.add_product(*call, kettle)
+        target.decrement(*call, kettle.id, 2)
+
+    assert arena.lines(2) == [
+        (kettle.id, 1),
+        (lamp.id, 1),
+    ], f"Неверные строки слота: {arena.lines(2)}"
+    assert arena.totals(2) == (
+        basket.total_items,
+        basket.total_price,
+        basket.total_weight,
+    ), f"Итоги слота расходятся с корзиной: {arena.totals(2)}"
+    assert (arena.get_price(2), arena.get_shipping_cost(2)) == (
+        basket.get_price,
+        basket.get_shipping_cost,
+    ), "Стоимость слота расходится с корзиной"
+    assert arena.totals(1) == (0, 0, 0), "Соседний слот должен остаться пустым"
+
+    arena.delete_product(2, kettle.id)
+    assert arena.lines(2) == [(lamp.id, 1)], "Удалённая строка заменяется последней"
+
+
+def test_concurrent_processes_respect_limits(arena):
+    """Тест параллельных изменений из нескольких процессов и чтения без блокировки."""
+    writers = [
+        FORK.Process(target=mutate, args=(arena, seed, 2000)) for seed in range(4)
+    ]
+    reader = FORK.Process(target=read_consistently, args=(arena, 20_000))
+    for process in writers + [reader]:
+        process.start()
+    for process in writers + [reader]:
+        process.join()
+
+    assert [process.exitcode for process in writers] == [0] * 4, "Воркеры упали"
+    assert reader.exitcode == 0, "Чтение без блокировки вернуло несогласованные итоги"
+    by_id = {product.id: product for product in PRODUCTS}
+    for slot in range(len(arena)):
+        lines = arena.lines(slot)
+        count, price, weight = arena.totals(slot)
+        assert count <= Basket.MAX_ITEMS, f"Слот {slot}: превышен MAX_ITEMS"
+        assert weight <= Basket.MAX_WEIGHT, f"Слот {slot}: превышен MAX_WEIGHT"
+        assert (count, price, weight) == (
+            sum(quantity for _, quantity in lines),
+            sum(by_id[pid].price * quantity for pid, quantity in lines),
+            sum(by_id[pid].weight * quantity for pid, quantity in lines),
+        ), f"Слот {slot}: итоги расходятся со строками"
+
+
+def test_spawned_process_attaches_by_name():
+    """Тест подключения к арене процесса, запущенного через spawn."""
+    spawn = multiprocessing.get_context("spawn")
+    with SharedBasketArena(1, mp_context=spawn) as arena:
+        process = spawn.Process(target=add_in_child, args=(arena, PRODUCTS[3]))
+        process.start()
+        process.join()
+
+        assert process.exitcode == 0, "Процесс не смог изменить арену"
+        assert arena.lines(0) == [(PRODUCTS[3].id, 2)], "Изменение не видно в арене"
+
+
+# Граничные тесты
+def test_limits_and_rejected_changes(arena):
+    """Тест заполнения слота до лимитов и отклонённых изменений."""
+    feather, weight = Product("Перо", 1, 1), Product("Гиря", 10, 71)
+    arena.add_product(0, feather, Basket.MAX_ITEMS - 1)
+    with pytest.raises(ValueError, match="максимальное количество"):
+        arena.add_product(0, feather, 2)
+    arena.add_product(0, weight)
+    with pytest.raises(ValueError, match="максимальный вес"):
+        arena.add_product(1, weight, 2)
+
+    assert arena.totals(0) == (
+        Basket.MAX_ITEMS,
+        Basket.MAX_ITEMS - 1 + 10,
+        Basket.MAX_WEIGHT,
+    ), f"Слот заполнен не до лимитов: {arena.totals(0)}"
+    assert arena.totals(1) == (0, 0, 0), "Отклонённое добавление не меняет слот"
+    arena.clear(0)
+    assert arena.lines(0) == [] and arena.get_price(0) == 0, "Слот не очищен"
+
+
+# Негативные тесты
+def test_invalid_slots_and_operations(arena):
+    """Тест обращения к несуществующему слоту и некорректных операций."""
+    product = Product("Фен", 500, 2)
+    with pytest.raises(IndexError, match="вне арены"):
+        arena.get_price(4)
+    with pytest.raises(IndexError, match="вне арены"):
+        arena.add_product(-1, product)
+    with pytest.raises(TypeError, match="Ожидался объект Product"):
+        arena.add_product(0, "Фен")  # type: ignore[arg-type]
+    with pytest.raises(KeyError, match="отсутствует в корзине"):
+        arena.decrement(0, product.id)
+    arena.add_product(0, product)
+    with pytest.raises(ValueError, match="нельзя убрать 2 ед."):
+        arena.decrement(0, product.id, 2)
+    with pytest.raises(ValueError, match="уже лежит в корзине с ценой 500 у.е."):
+        arena.add_product(0, Product._from_trusted(product.id, "Фен", 400, 2))
+    with pytest.raises(ValueError, match="добавляется с ценой 500 у.е. и весом 3"):
+        arena.add_product(0, Product._from_trusted(product.id, "Фен", 500, 3))
+    assert arena.totals(0) == (1, 500, 2), "Отклонённое добавление не меняет слот"
+
+
+def test_read_of_abandoned_slot_times_out(arena, monkeypatch):
+    """Тест чтения слота, писатель которого завершился во время изменения."""
+    monkeypatch.setattr(shared_arena, "READ_TIMEOUT", 0.01)
+    arena.add_product(1, Product("Фен", 500, 2))
+    seq = arena._base(1) + shared_arena._SEQ
+    arena._cells[seq] += 1  # Писатель начал изменение и не закончил его
+
+    with pytest.raises(TimeoutError, match="Слот 1 изменяется дольше"):
+        arena.get_price(1)
+    assert arena.totals(0) == (0, 0, 0), "Соседний слот читается без ожидания"
+    arena._cells[seq] += 1
+    assert arena.total_price(1) == 500, "Завершённое изменение снова читается"
+
+
+@pytest.mark.parametrize("capacity, stripes", [(0, 1), (1, 0)])
+def test_invalid_arena_size(capacity: int, stripes: int):
+    """Тест создания арены без слотов или без блокировок."""
+    with pytest.raises(ValueError, match="не меньше 1"):
+        SharedBasketArena(capacity, stripes)